@@ -0,0 +1,130 @@
+"""Benchmark apply-candidate selection on a large final_ml_jobs.csv.
+
+    python benchmarks/bench_candidates.py [--rows 300000] [--sample 100]
+
+Writes a synthetic CSV (long descriptions, mixed statuses) to a temp dir and
+compares the old path (read everything, filter, ``.sample``) with the CSV
+store's streaming reservoir sample. Each step runs in a fresh subprocess so
+its peak RSS is its own. It then patches a few statuses and checks the
+rewritten file.
+"""
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from job_store import CSV_COLUMNS, CsvJobStore  # noqa: E402
+
+STATUSES = ["Applied"] * 6 + ["Failed"] * 1 + ["Pending"] * 3
+APPLY_TEXTS = ["Easy Apply", "Easy Apply", "Apply Now", " easy apply "]
+WORDS = ("design build deploy scalable machine learning systems aws gcp azure python pytorch tensorflow "
+         "kubernetes docker spark airflow sql pipelines models inference latency retrieval llm rag agents "
+         "mlops monitoring experiments stakeholders cross-functional team years experience required preferred "
+         "contract remote hybrid w2 c2c visa benefits").split()
+
+
+def synthetic_csv(path: Path, rows: int, seed: int = 7):
+    rng = random.Random(seed)
+    chunk = 50_000
+    for start in range(0, rows, chunk):
+        n = min(chunk, rows - start)
+        df = pd.DataFrame({
+            "title": [f"ML Engineer {start + i}" for i in range(n)],
+            "company": [f"Company {rng.randint(1, 500)}" for _ in range(n)],
+            "link": [f"https://www.dice.com/job-detail/{start + i:08x}-0000-4000-8000-000000000000" for i in range(n)],
+            "description": [" ".join(rng.choices(WORDS, k=150)) for _ in range(n)],
+            "location": "Remote",
+            "date_added": "2025-06-01",
+            "job_type": "Contract",
+            "salary": "USD 70.00 - 85.00 per hour",
+            "apply_text": [rng.choice(APPLY_TEXTS) for _ in range(n)],
+            "status": [rng.choice(STATUSES) for _ in range(n)],
+            "date_posted": "2025-05-30",
+            "job_id": [f"{start + i:08x}-0000-4000-8000-000000000000" for i in range(n)],
+        })[CSV_COLUMNS]
+        df.to_csv(path, index=False, header=start == 0, mode="w" if start == 0 else "a")
+
+
+def legacy_candidates(path: Path, sample: int) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    df["apply_text"] = df["apply_text"].str.strip().str.lower()
+    df["status"] = df["status"].str.strip().str.lower()
+    pending = df[(df["apply_text"] == "easy apply") & (df["status"] == "pending")].copy()
+    return pending.sample(n=min(sample, len(pending)))
+
+
+def run_step(step: str, path: Path, sample: int) -> dict:
+    """Run one step in this process and report its time, peak RSS and result."""
+    store = CsvJobStore({"filtered_jobs": str(path)})
+    start = time.perf_counter()
+    if step == "legacy":
+        df = legacy_candidates(path, sample)
+        out = {"rows": len(df)}
+    elif step == "stream":
+        df = store.apply_candidates(["pending"], sample=sample)
+        out = {"rows": len(df), "available": df.attrs["available"], "job_ids": df["job_id"].head(10).tolist()}
+    else:  # patch: ids come in on stdin
+        for job_id in json.load(sys.stdin):
+            store.update_status("filtered_jobs", job_id, "Applied")
+        store.flush()
+        out = {}
+    out["seconds"] = time.perf_counter() - start
+    out["peak_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return out
+
+
+def measure(step: str, path: Path, sample: int, stdin: str = "") -> dict:
+    proc = subprocess.run([sys.executable, __file__, "--step", step, "--csv", str(path), "--sample", str(sample)],
+                          input=stdin, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--sample", type=int, default=100)
+    parser.add_argument("--step", choices=["legacy", "stream", "patch"], help=argparse.SUPPRESS)
+    parser.add_argument("--csv", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.step:
+        print(json.dumps(run_step(args.step, args.csv, args.sample)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "final_ml_jobs.csv"
+        synthetic_csv(path, args.rows)
+        size = path.stat().st_size / 2**20
+
+        base = measure("stream", path, args.sample)  # warm the page cache
+        old = measure("legacy", path, args.sample)
+        new = measure("stream", path, args.sample)
+
+        print(f"[BENCH] {args.rows:,} rows, {size:.0f} MB CSV, sample {args.sample}")
+        print(f"[BENCH] full load + filter + sample: {old['seconds']:6.2f}s  peak RSS {old['peak_mb']:7.1f} MB")
+        print(f"[BENCH] streaming reservoir sample:  {new['seconds']:6.2f}s  peak RSS {new['peak_mb']:7.1f} MB  "
+              f"(available {new['available']:,})")
+        assert new["rows"] == old["rows"] == min(args.sample, base["available"])
+
+        # keyed status patch, streamed back into the file
+        ids = new["job_ids"]
+        patch = measure("patch", path, args.sample, stdin=json.dumps(ids))
+        check = pd.read_csv(path, usecols=["job_id", "status"])
+        assert (check.set_index("job_id").loc[ids, "status"] == "Applied").all()
+        assert len(check) == args.rows
+        print(f"[BENCH] patch {len(ids)} statuses + flush:  {patch['seconds']:6.2f}s  peak RSS {patch['peak_mb']:7.1f} MB")
+        print("[OK] patched statuses landed, row count unchanged")
+
+
+if __name__ == "__main__":
+    main()
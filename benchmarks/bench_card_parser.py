@@ -0,0 +1,67 @@
+"""Offline check + throughput benchmark for the page_source card parser.
+
+    python benchmarks/bench_card_parser.py [--cards 20] [--repeat 200]
+
+Verifies ``parse_job_cards`` against the committed fixture, then times it on a
+synthetic search page built from the fixture's first card.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "src"))
+
+from card_parser import parse_job_cards  # noqa: E402
+
+FIXTURES = HERE / "fixtures"
+PAGE_URL = "https://www.dice.com/jobs?q=Machine+Learning&page=1"
+
+
+def check_fixture() -> int:
+    html = (FIXTURES / "search_results.html").read_text(encoding="utf-8")
+    expected = json.loads((FIXTURES / "search_results.expected.json").read_text(encoding="utf-8"))
+    jobs = parse_job_cards(html, base_url=PAGE_URL)
+    for job in jobs:
+        job.pop("date_added")
+    if jobs != expected:
+        print(json.dumps(jobs, indent=2))
+        raise SystemExit("[FAIL] parsed cards differ from search_results.expected.json")
+    print(f"[OK] fixture: {len(jobs)} cards match expected schema")
+    return len(jobs)
+
+
+def synthetic_page(n_cards: int) -> str:
+    html = (FIXTURES / "search_results.html").read_text(encoding="utf-8")
+    start = html.index("<div data-job-guid")
+    end = html.index("<!-- relative link")
+    card = html[start:end]
+    cards = [card.replace("3f2b4c1e-8d7a-4b6f-9e2d", f"{i:08x}-8d7a-4b6f-9e2d") for i in range(n_cards)]
+    return f"<html><body><main>{''.join(cards)}</main></body></html>"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=20, help="cards per synthetic page")
+    parser.add_argument("--repeat", type=int, default=200, help="pages to parse")
+    args = parser.parse_args()
+
+    check_fixture()
+
+    page = synthetic_page(args.cards)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        parsed = parse_job_cards(page, base_url=PAGE_URL)
+    elapsed = time.perf_counter() - start
+    assert len(parsed) == args.cards
+
+    per_page_ms = elapsed / args.repeat * 1000
+    print(f"[BENCH] {args.repeat} pages x {args.cards} cards in {elapsed:.2f}s "
+          f"→ {per_page_ms:.1f} ms/page, {args.cards * args.repeat / elapsed:,.0f} cards/s")
+    print(f"[BENCH] WebDriver path at ~100 ms/card ≈ {args.cards * 100} ms/page")
+
+
+if __name__ == "__main__":
+    main()
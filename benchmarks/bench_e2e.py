@@ -0,0 +1,327 @@
+"""End-to-end benchmark suite: every scraper and apply mode against the mock job board.
+
+    python benchmarks/bench_e2e.py [--out e2e.json] [--compare previous.json] [--max-regression 0.3]
+                                   [--only scrape] [--latency 0] [--failure-rate 0] [--apply-failure-rate 0]
+                                   [--no-skip]
+
+Each mode runs the stage's real ``main()`` against a fresh ``fixture_server``
+with settings pointing at temp files:
+
+    scrape/stealth_scraper/<backend>     requests (one worker and --workers), selenium-html, selenium-webdriver
+    scrape/dice_scraper/<backend>        requests, selenium-html, selenium-webdriver
+    apply/apply_jobs                     one Selenium browser
+    apply/stealth_apply[-xN]             undetected-chromedriver, one worker and --workers
+
+Scrape modes report pages/s and cards/s over ``--queries`` queries of
+``--pages`` pages each. Apply modes report applications/min over
+``--apply-jobs`` seeded Easy Apply jobs (a tenth of them already on the
+account's applied list). Page delays and ``human_delay`` are deliberate,
+so their time is taken from the stage's metrics report and subtracted for
+the ``*_unpaced`` rates, which track the code rather than the pacing.
+Browser modes are skipped, with the reason recorded, where Chrome, its
+driver or the Selenium package is missing; with ``--no-skip`` (as in CI,
+which installs Chrome) a skipped mode fails the suite instead.
+
+Results are written to ``--out`` as JSON. With ``--compare``, a rate that
+fell by more than ``--max-regression`` against an earlier file (run with
+the same parameters) fails the suite, as does a mode that errors.
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "src"))
+
+import pandas as pd  # noqa: E402
+
+import apply_jobs  # noqa: E402
+import dice_scraper  # noqa: E402
+import stealth_apply  # noqa: E402
+import stealth_scraper  # noqa: E402
+from fixture_server import base_url, job_guid, site_url, start_server, wizard_breaks  # noqa: E402
+from job_store import open_store  # noqa: E402
+from settings import ApplySettings, PathSettings, PerfSettings, ScrapeSettings, Settings  # noqa: E402
+
+CHROME_BINARY = "/opt/chrome/chrome"  # where every stage's driver looks (the workflows install it there)
+DRIVER_PATH = ScrapeSettings().driver_path
+QUERIES = ["Machine Learning Engineer", "Data Scientist", "MLOps Engineer", "AI Engineer",
+           "Computer Vision Engineer", "NLP Engineer", "Data Engineer", "LLM Engineer"]
+RATE_KEYS = ("pages_per_sec", "cards_per_sec", "pages_per_sec_unpaced", "cards_per_sec_unpaced",
+             "apps_per_min", "apps_per_min_unpaced")
+
+
+def browser_missing(package: str, driver_path: Optional[str]) -> Optional[str]:
+    """Why a browser mode cannot run here, or None."""
+    if importlib.util.find_spec(package) is None:
+        return f"{package} is not installed"
+    if not os.path.exists(CHROME_BINARY):
+        return f"no Chrome at {CHROME_BINARY}"
+    if driver_path and not os.path.exists(driver_path):
+        return f"no chromedriver at {driver_path}"
+    return None
+
+
+def make_settings(work: Path, server, backend: str = "requests", extraction: str = "html",
+                  workers: int = 1, pages: int = 5) -> Settings:
+    return Settings(
+        paths=PathSettings(storage="sqlite", store_path=str(work / "jobs.db"), jobs_csv=str(work / "jobs.csv"),
+                           filtered_csv=str(work / "filtered.csv"), query_file=str(work / "queries.txt"),
+                           job_index_file=str(work / "job_index.json"),
+                           query_history_file=str(work / "query_history.json"),
+                           near_dup_index_file=str(work / "near_dup.db"),
+                           score_cache_file=str(work / "score_cache.npz"), log_dir=str(work / "logs"),
+                           metrics_dir=str(work / "metrics"), apply_journal_file=str(work / "journal.jsonl"),
+                           session_cache_file=str(work / ".session")),
+        # one page past the last, so pagination ends on an empty result page
+        scrape=ScrapeSettings(base_url=base_url(server), max_pages=pages + 1, delay=10, search_backend=backend,
+                              card_extraction=extraction, min_page_delay=0, max_page_delay=0),
+        apply=ApplySettings(email="bench@example.com", password="bench", site_url=site_url(server),
+                            one_per_cluster=False, rank_by_score=False),
+        perf=PerfSettings(scrape_workers=workers, max_requests_per_sec=0, http_timeout=10,
+                          apply_workers=workers, max_applies_per_min=0),
+    )
+
+
+def run_quietly(fn, **kwargs) -> tuple:
+    """Run a stage's ``main`` with its console output swallowed; returns (seconds, error or None)."""
+    start = time.perf_counter()
+    error = None
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            fn(**kwargs)
+    except SystemExit:
+        pass  # stealth_apply exits 1 when nothing was applied; the counts below tell
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    return time.perf_counter() - start, error
+
+
+def read_report(settings: Settings, stage: str) -> dict:
+    reports = sorted(Path(settings.paths.metrics_dir).glob(f"{stage}_*.json"))
+    return json.loads(reports[-1].read_text()) if reports else {}
+
+
+def phase_total(report: dict, name: str) -> float:
+    return report.get("phases", {}).get(name, {}).get("total", 0.0)
+
+
+def rate(n: float, seconds: float, per: float = 1.0) -> float:
+    return round(n / seconds * per, 2) if seconds > 0 else 0.0
+
+# ── Scrape modes ─────────────────────────────────────────────────
+
+def scrape_mode(args, work: Path, module, backend: str, extraction: str, workers: int) -> dict:
+    server = start_server(pages=args.pages, cards=args.cards, latency=args.latency, failure_rate=args.failure_rate)
+    try:
+        settings = make_settings(work, server, backend, extraction, workers, args.pages)
+        work.mkdir(parents=True)
+        Path(settings.paths.query_file).write_text("\n".join(QUERIES[:args.queries]) + "\n")
+        module.configure(settings)
+        if module is stealth_scraper:
+            seconds, error = run_quietly(module.main, workers=workers)
+        else:
+            seconds, error = run_quietly(module.main)
+        stats = dict(server.stats)
+    finally:
+        server.shutdown()
+
+    report = read_report(settings, "scrape")
+    queries = report.get("records", {}).get("queries", [])
+    pages = sum(q["pages_scanned"] for q in queries)
+    cards = sum(q["new_jobs"] for q in queries)
+    expected = args.queries * args.pages * args.cards
+    if error is None and not args.failure_rate and cards != expected:
+        error = f"found {cards} cards, expected {expected}"
+    # page delays run on every worker at once; take out one worker's share
+    unpaced = seconds - phase_total(report, "scrape.page_delay") / workers
+    return {
+        "status": "error" if error else "ok", "error": error, "workers": workers,
+        "seconds": round(seconds, 3), "pages": pages, "cards": cards,
+        "pages_per_sec": rate(pages, seconds), "cards_per_sec": rate(cards, seconds),
+        "pages_per_sec_unpaced": rate(pages, unpaced), "cards_per_sec_unpaced": rate(cards, unpaced),
+        "server": stats,
+    }
+
+# ── Apply modes ──────────────────────────────────────────────────
+
+def seed_apply_store(settings: Settings, host: str, guids: List[str]):
+    n = len(guids)
+    df = pd.DataFrame({
+        "job_id": guids,
+        "title": [f"ML Engineer {i}" for i in range(n)],
+        "company": "Staffing Firm",
+        "link": [f"{host}/job-detail/{g}" for g in guids],
+        "date_added": datetime.now().strftime("%m/%d/%Y"),
+        "date_posted": datetime.now().strftime("%Y-%m-%d"),
+        "apply_text": "Easy Apply",
+        "status": "Pending",
+    })
+    store = open_store("sqlite", settings.paths.store_path, {})
+    store.upsert("filtered_jobs", df)
+    store.close()
+
+
+def apply_mode(args, work: Path, module, workers: int) -> dict:
+    guids = [job_guid("apply", 1, i) for i in range(args.apply_jobs)]
+    already = guids[:args.apply_jobs // 10]
+    server = start_server(applied=already, latency=args.latency, failure_rate=args.failure_rate,
+                          apply_failure_rate=args.apply_failure_rate)
+    try:
+        settings = make_settings(work, server, workers=workers)
+        work.mkdir(parents=True)
+        seed_apply_store(settings, site_url(server), guids)
+        module.configure(settings)
+        budget = args.apply_budget
+        if module is stealth_apply:
+            seconds, error = run_quietly(module.main, workers=workers, time_budget=budget)
+        else:
+            seconds, error = run_quietly(module.main, time_budget=budget)
+        stats = dict(server.stats)
+    finally:
+        server.shutdown()
+
+    report = read_report(settings, "apply")
+    results = report.get("counters", {}).get("apply.result", {})
+    applied = stats["applications"]
+    store = open_store("sqlite", settings.paths.store_path, {})
+    statuses = store.read_frame("filtered_jobs", ["job_id", "status"])
+    store.close()
+    marked = set(statuses.loc[statuses["status"] == "Applied", "job_id"])
+    broken = sum(wizard_breaks(g, args.apply_failure_rate) for g in guids)
+    if error is None and not marked.issuperset(server.applied):
+        error = f"{len(set(server.applied) - marked)} submitted application(s) not marked Applied"
+    # time inside easy_apply, per worker: what is left once the pacing around it is gone
+    unpaced = phase_total(report, "apply.easy_apply") / workers
+    return {
+        "status": "error" if error else "ok", "error": error, "workers": workers,
+        "seconds": round(seconds, 3), "applied": applied, "already_applied": len(already),
+        "failed": results.get("Failed", 0), "broken_wizards": broken,
+        "pacing_seconds": round(phase_total(report, "apply.human_delay"), 3),
+        "apps_per_min": rate(applied, seconds, 60), "apps_per_min_unpaced": rate(applied, unpaced, 60),
+        "server": stats,
+    }
+
+# ── Suite ────────────────────────────────────────────────────────
+
+def modes(args) -> list:
+    """(name, runner, skip reason or None) for every mode."""
+    uc = browser_missing("undetected_chromedriver", DRIVER_PATH)
+    selenium = browser_missing("selenium", DRIVER_PATH)
+    out = []
+    for module, missing in ((stealth_scraper, uc), (dice_scraper, selenium)):
+        name = module.__name__
+        out.append((f"scrape/{name}/requests",
+                    lambda work, m=module: scrape_mode(args, work, m, "requests", "html", 1), None))
+        if module is stealth_scraper and args.workers > 1:
+            out.append((f"scrape/{name}/requests-x{args.workers}",
+                        lambda work, m=module: scrape_mode(args, work, m, "requests", "html", args.workers), None))
+        for extraction in ("html", "webdriver"):
+            out.append((f"scrape/{name}/selenium-{extraction}",
+                        lambda work, m=module, e=extraction: scrape_mode(args, work, m, "selenium", e, 1), missing))
+    out.append(("apply/apply_jobs", lambda work: apply_mode(args, work, apply_jobs, 1), selenium))
+    out.append(("apply/stealth_apply", lambda work: apply_mode(args, work, stealth_apply, 1),
+                browser_missing("undetected_chromedriver", None)))
+    if args.workers > 1:
+        out.append((f"apply/stealth_apply-x{args.workers}",
+                    lambda work: apply_mode(args, work, stealth_apply, args.workers),
+                    browser_missing("undetected_chromedriver", None)))
+    return [m for m in out if not args.only or any(part in m[0] for part in args.only)]
+
+
+def regressions(current: dict, previous: dict, tolerance: float) -> List[str]:
+    """Rates in ``current`` that fell by more than ``tolerance`` against ``previous``."""
+    found = []
+    for name, now in current["modes"].items():
+        before = previous.get("modes", {}).get(name, {})
+        if now.get("status") != "ok" or before.get("status") != "ok":
+            continue
+        for key in RATE_KEYS:
+            if before.get(key) and key in now:
+                drop = 1 - now[key] / before[key]
+                if drop > tolerance:
+                    found.append(f"{name} {key}: {before[key]:,.2f} → {now[key]:,.2f} (-{drop:.0%})")
+    return found
+
+
+def print_result(name: str, result: dict):
+    if result["status"] == "skipped":
+        print(f"[SKIP] {name:<36} {result['reason']}")
+    elif result["status"] == "error":
+        print(f"[FAIL] {name:<36} {result['error']}")
+    elif "pages" in result:
+        print(f"[BENCH] {name:<36} {result['pages']:4d} pages {result['cards']:6,d} cards {result['seconds']:7.2f}s  "
+              f"{result['pages_per_sec']:7.2f} pages/s {result['cards_per_sec']:8,.1f} cards/s  "
+              f"(unpaced {result['pages_per_sec_unpaced']:.2f} / {result['cards_per_sec_unpaced']:,.1f})")
+    else:
+        print(f"[BENCH] {name:<36} {result['applied']:4d} applied {result['failed']:3d} failed "
+              f"{result['seconds']:7.2f}s  {result['apps_per_min']:6.2f} apps/min "
+              f"(unpaced {result['apps_per_min_unpaced']:.2f}, pacing {result['pacing_seconds']:.0f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="output/bench/e2e.json", help="where to write the results")
+    parser.add_argument("--compare", help="earlier results to check for regressions")
+    parser.add_argument("--max-regression", type=float, default=0.3, help="largest tolerated drop in a rate")
+    parser.add_argument("--only", nargs="*", help="run only modes whose name contains one of these")
+    parser.add_argument("--queries", type=int, default=3, choices=range(1, len(QUERIES) + 1), metavar="N")
+    parser.add_argument("--pages", type=int, default=5, help="result pages per query")
+    parser.add_argument("--cards", type=int, default=20, help="job cards per page")
+    parser.add_argument("--workers", type=int, default=3, help="workers for the concurrent modes")
+    parser.add_argument("--apply-jobs", type=int, default=20, help="Easy Apply jobs seeded per apply mode")
+    parser.add_argument("--apply-budget", type=float, default=0, help="apply time budget in seconds (0 = none)")
+    parser.add_argument("--latency", type=float, default=0.0, help="mock server latency per response (s)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of page loads answered 503")
+    parser.add_argument("--apply-failure-rate", type=float, default=0.0, help="share of jobs with a broken wizard")
+    parser.add_argument("--no-skip", action="store_true", help="fail the suite when a mode has to be skipped")
+    args = parser.parse_args()
+
+    params = {k: v for k, v in vars(args).items() if k not in ("out", "compare", "max_regression", "only", "no_skip")}
+    results = {"created": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+               "params": params, "modes": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (name, runner, skip) in enumerate(modes(args)):
+            result = {"status": "skipped", "reason": skip} if skip else runner(Path(tmp) / f"mode{i}")
+            results["modes"][name] = result
+            print_result(name, result)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2))
+    print(f"[INFO] Results written to {out}")
+
+    failed = [name for name, r in results["modes"].items() if r["status"] == "error"]
+    if args.no_skip:
+        skipped = [name for name, r in results["modes"].items() if r["status"] == "skipped"]
+        for name in skipped:
+            print(f"[FAIL] {name} was skipped: {results['modes'][name]['reason']}")
+        failed += skipped
+    if args.compare and os.path.exists(args.compare):
+        previous = json.loads(Path(args.compare).read_text())
+        if previous.get("params") != params:
+            print(f"[INFO] {args.compare} was run with other parameters; not comparing")
+        else:
+            worse = regressions(results, previous, args.max_regression)
+            for line in worse:
+                print(f"[FAIL] regression: {line}")
+            if not worse:
+                print(f"[OK] no rate fell more than {args.max_regression:.0%} against {args.compare}")
+            failed += worse
+    elif args.compare:
+        print(f"[INFO] No earlier results at {args.compare}; nothing to compare")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark job-detail enrichment against the local fixture server.
+
+    python benchmarks/bench_enrich.py [--jobs 200] [--concurrency 8] [--latency 0.05]
+
+Seeds a scratch SQLite store with ``--jobs`` Pending relevant jobs whose
+links point at the fixture server, then runs ``enrich_jobs``:
+
+    sequential   concurrency 1, cold cache
+    concurrent   --concurrency, cold cache
+    rerun        nothing left to enrich
+    refresh      every row re-checked, cache fresh    → no requests
+    revalidate   every row re-checked, TTL 0          → conditional GETs, 304s
+
+and checks that no detail page is downloaded twice.
+"""
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "src"))
+
+import pandas as pd  # noqa: E402
+
+from fixture_server import job_guid, start_server  # noqa: E402
+from job_details import enrich_jobs  # noqa: E402
+from job_store import open_store  # noqa: E402
+from settings import ApplySettings, PathSettings, PerfSettings, ScrapeSettings, Settings  # noqa: E402
+
+
+def make_settings(work: Path, concurrency: int, ttl_days: float) -> Settings:
+    return Settings(
+        paths=PathSettings(storage="sqlite", store_path=str(work / "jobs.db"),
+                           jobs_csv=str(work / "jobs.csv"), filtered_csv=str(work / "filtered.csv"),
+                           detail_cache_dir=str(work / "detail_cache"), metrics_dir=str(work / "metrics")),
+        scrape=ScrapeSettings(),
+        apply=ApplySettings(),
+        perf=PerfSettings(detail_concurrency=concurrency, detail_requests_per_sec=0,
+                          detail_cache_ttl_days=ttl_days, http_timeout=10),
+    )
+
+
+def seed(settings: Settings, host: str, n: int):
+    guids = [job_guid("bench", 1, i) for i in range(n)]
+    df = pd.DataFrame({
+        "job_id": guids,
+        "title": [f"ML Engineer {i}" for i in range(n)],
+        "link": [f"{host}/job-detail/{g}" for g in guids],
+        "date_added": datetime.now().strftime("%m/%d/%Y"),
+        "date_posted": "Today",
+        "apply_text": "Easy Apply",
+        "status": "Pending",
+    })
+    store = open_store("sqlite", settings.paths.store_path, {})
+    store.upsert("filtered_jobs", df)
+    store.close()
+
+
+def run(server, settings: Settings, refresh: bool = False):
+    before = dict(server.stats)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        outcomes = enrich_jobs(settings, refresh=refresh)
+    elapsed = time.perf_counter() - start
+    delta = {k: server.stats[k] - before[k] for k in ("details", "not_modified")}
+    return elapsed, outcomes, delta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05, help="server delay per detail page (s)")
+    args = parser.parse_args()
+
+    server = start_server(detail_latency=args.latency)
+    host = "http://%s:%d" % server.server_address[:2]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seq = make_settings(Path(tmp) / "seq", 1, ttl_days=7)
+        seed(seq, host, args.jobs)
+        elapsed, outcomes, delta = run(server, seq)
+        print(f"[BENCH] sequential   {elapsed:6.2f}s  {args.jobs / elapsed:6.1f} pages/s  "
+              f"downloads {delta['details']}")
+
+        work = Path(tmp) / "conc"
+        conc = make_settings(work, args.concurrency, ttl_days=7)
+        seed(conc, host, args.jobs)
+        phases = [
+            ("concurrent", conc, False),
+            ("rerun", conc, False),
+            ("refresh", conc, True),
+            ("revalidate", make_settings(work, args.concurrency, ttl_days=0), True),
+        ]
+        downloads = 0
+        for name, settings, refresh in phases:
+            elapsed, outcomes, delta = run(server, settings, refresh)
+            downloads += delta["details"]
+            print(f"[BENCH] {name:<12} {elapsed:6.2f}s  downloads {delta['details']:4d}  "
+                  f"304s {delta['not_modified']:4d}  outcomes {dict(outcomes) or '-'}")
+
+        store = open_store("sqlite", conc.paths.store_path, {})
+        enriched = store.read_frame("filtered_jobs", ["job_id", "skills", "full_description", "date_posted"])
+        store.close()
+    server.shutdown()
+
+    assert downloads == args.jobs, f"{downloads} downloads for {args.jobs} jobs"
+    assert enriched["full_description"].str.len().gt(1000).all() and enriched["skills"].ne("").all()
+    print(f"[OK] each page downloaded once; {len(enriched)} row(s) enriched, "
+          f"e.g. {enriched['date_posted'].iloc[0]} / {enriched['skills'].iloc[0]}")
+
+
+if __name__ == "__main__":
+    main()
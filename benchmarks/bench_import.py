@@ -0,0 +1,81 @@
+"""Benchmark import time and import side effects of the stage modules.
+
+    python benchmarks/bench_import.py [--repeat 5]
+
+Imports each module in a fresh interpreter, from a scratch working directory
+holding a copy of config/. Reports the best-of-N wall time, whether selenium
+or undetected_chromedriver got loaded, and any file the import created (log
+files, directories). The same is measured for ``python src --help``.
+"""
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+MODULES = ["main", "stealth_scraper", "stealth_apply", "apply_jobs", "dice_scraper", "job_store", "log_report"]
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed,
+                  "selenium": "selenium" in sys.modules,
+                  "uc": "undetected_chromedriver" in sys.modules}}))
+"""
+
+
+def snapshot(path: Path) -> set:
+    return {p.relative_to(path) for p in path.rglob("*")}
+
+
+def probe(module: str, cwd: Path) -> dict:
+    before = snapshot(cwd)
+    proc = subprocess.run([sys.executable, "-c", PROBE.format(src=str(SRC), module=module)],
+                          cwd=cwd, capture_output=True, text=True)
+    created = sorted(str(p) for p in snapshot(cwd) - before)
+    if proc.returncode:
+        return {"error": proc.stderr.strip().splitlines()[-1], "created": created}
+    out = json.loads(proc.stdout.strip().splitlines()[-1])
+    out["created"] = created
+    return out
+
+
+def cli_help(cwd: Path) -> float:
+    import time
+    start = time.perf_counter()
+    subprocess.run([sys.executable, str(SRC), "--help"], cwd=cwd, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = Path(tmp)
+        shutil.copytree(ROOT / "config", cwd / "config")
+        for module in MODULES:
+            runs = [probe(module, cwd) for _ in range(args.repeat)]
+            if "error" in runs[0]:
+                print(f"[BENCH] import {module:<16} failed: {runs[0]['error']}")
+                continue
+            best = min(r["seconds"] for r in runs)
+            loaded = [name for name in ("selenium", "uc") if runs[0][name]]
+            created = sorted({c for r in runs for c in r["created"]})
+            print(f"[BENCH] import {module:<16} {best * 1000:7.1f} ms  "
+                  f"browser libs: {', '.join(loaded) or '-':<12}  files created: {len(created)}")
+        if (SRC / "__main__.py").exists():
+            best = min(cli_help(cwd) for _ in range(args.repeat))
+            print(f"[BENCH] python src --help     {best * 1000:7.1f} ms (whole process)")
+
+
+if __name__ == "__main__":
+    main()
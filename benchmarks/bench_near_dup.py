@@ -0,0 +1,101 @@
+"""Benchmark near-duplicate ingest cost as the history grows.
+
+    python benchmarks/bench_near_dup.py [--history 50000] [--batch 1000] [--dup-rate 0.1] [--edits 1]
+
+Streams synthetic postings (80 words from a 3,000-word vocabulary) into a
+fresh ``NearDupIndex`` one batch at a time, as the filter stage does. A
+``--dup-rate`` share of them are reposts of an earlier posting: another
+firm's short header plus ``--edits`` words changed. Reports ms per posting
+every few batches, which should stay flat since a lookup only reads the
+rows sharing a band key. It also reports the index size and how well
+reposts were matched: recall is reposts that joined their original's
+cluster, and precision is cluster joins that were real reposts. The
+reposts' mean true Jaccard similarity to their original is printed
+alongside, to compare with the threshold.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from near_dup import NearDupIndex, shingles  # noqa: E402
+
+VOCAB = [f"w{i}" for i in range(3000)]
+FIRMS = [f"via firm{i}" for i in range(50)]
+
+
+def make_posting(rng: random.Random) -> str:
+    return " ".join(rng.choices(VOCAB, k=80))
+
+
+def jaccard(a: str, b: str) -> float:
+    sa, sb = shingles(a), shingles(b)
+    return len(sa & sb) / len(sa | sb)
+
+
+def repost(rng: random.Random, text: str, edits: int) -> str:
+    words = text.split()
+    for i in rng.sample(range(len(words)), k=edits):
+        words[i] = rng.choice(VOCAB)
+    return f"{rng.choice(FIRMS)} {' '.join(words)}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, default=50_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--dup-rate", type=float, default=0.1)
+    parser.add_argument("--edits", type=int, default=1, help="words changed in a repost")
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--report-every", type=int, default=10, help="batches between reports")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    originals, truth, sims = [], {}, []  # truth: repost id -> original id
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "near_dup.db")
+        index = NearDupIndex(path, args.threshold)
+        joined, true_joins, n = 0, 0, 0
+        for batch_no in range(args.history // args.batch):
+            rows = []
+            for _ in range(args.batch):
+                job_id = f"job{n}"
+                if originals and rng.random() < args.dup_rate:
+                    src_id, src_text = rng.choice(originals)
+                    truth[job_id] = src_id
+                    rows.append((job_id, repost(rng, src_text, args.edits)))
+                    if len(sims) < 1000:
+                        sims.append(jaccard(src_text, rows[-1][1]))
+                else:
+                    text = make_posting(rng)
+                    originals.append((job_id, text))
+                    rows.append((job_id, text))
+                n += 1
+            start = time.perf_counter()
+            stats = index.add_many(rows)
+            elapsed = time.perf_counter() - start
+            joined += stats["joined"]
+            if batch_no % args.report_every == 0 or n == args.history:
+                print(f"[BENCH] history {n - args.batch:>7,} → batch of {args.batch}: "
+                      f"{elapsed * 1000 / args.batch:6.3f} ms/posting")
+
+        clusters = index.clusters(list(truth) + list(truth.values()))
+        for job_id, src_id in truth.items():
+            true_joins += clusters[job_id] == clusters[src_id]
+        index.close()
+        size = os.path.getsize(path)
+
+    recall = true_joins / len(truth) if truth else 1.0
+    precision = true_joins / joined if joined else 1.0
+    print(f"[BENCH] index: {n:,} postings, {size / 1024 / 1024:.1f} MiB ({size / n:.0f} B/posting)")
+    print(f"[BENCH] reposts: {len(truth):,} (mean Jaccard {sum(sims) / max(1, len(sims)):.2f}, "
+          f"threshold {args.threshold})  recall {recall:.3f}  precision {precision:.3f}")
+
+
+if __name__ == "__main__":
+    main()
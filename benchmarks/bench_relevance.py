@@ -0,0 +1,73 @@
+"""Benchmark the compiled title matcher against the old per-row lambda.
+
+    python benchmarks/bench_relevance.py [--rows 1000000]
+
+Builds a synthetic frame of job titles, times both filters and reports how
+many titles the old substring test matched that the word-boundary matcher
+rejects (e.g. "ml" inside "HTML", "rag" inside "Storage").
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from relevance import TitleMatcher  # noqa: E402
+
+PREFIXES = ["Senior", "Lead", "Principal", "Junior", "Staff", "Sr.", "", "", ""]
+ROLES = [
+    "Machine Learning Engineer", "Data Scientist", "ML Engineer", "AI/ML Developer", "NLP Engineer",
+    "Java Developer", "HTML/CSS Developer", "Storage Administrator", "Network Engineer", "Project Manager",
+    "Business Analyst", "Data Engineer", "QA Automation Engineer", "Travel Agent Coordinator",
+    "Cloud Architect", "Computer Vision Engineer", "DevOps Engineer", "Salesforce Admin",
+    "Drafting Technician", "Full Stack Developer", "Prompt Engineer", "LLM Researcher",
+]
+
+
+def synthetic_titles(rows: int, seed: int = 7) -> pd.Series:
+    rng = random.Random(seed)
+    return pd.Series([f"{rng.choice(PREFIXES)} {rng.choice(ROLES)} {rng.randint(1, 9)}".strip() for _ in range(rows)])
+
+
+def legacy_mask(titles: pd.Series, relevant_titles) -> pd.Series:
+    return titles.fillna("").str.lower().apply(lambda title: any(keyword in title for keyword in relevant_titles))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with open(ROOT / "relevant_titles.json", "r") as f:
+        keywords = json.load(f)["titles"]
+    titles = synthetic_titles(args.rows)
+
+    start = time.perf_counter()
+    old = legacy_mask(titles, keywords)
+    t_old = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = TitleMatcher(keywords)
+    new = matcher.mask(titles)
+    t_new = time.perf_counter() - start
+
+    dropped = titles[old & ~new]
+    print(f"[BENCH] {args.rows:,} titles, {len(matcher.keywords)} keywords")
+    print(f"[BENCH] lambda (substring any):  {t_old:6.2f}s  matched {int(old.sum()):,}")
+    print(f"[BENCH] compiled word-boundary:  {t_new:6.2f}s  matched {int(new.sum()):,}  ({t_old / t_new:.1f}x)")
+    if not dropped.empty:
+        examples = dropped.drop_duplicates().head(5).tolist()
+        print(f"[BENCH] false positives removed: {len(dropped):,}, e.g. {examples}")
+    sample = titles[new].drop_duplicates().head(5)
+    for title, keyword in zip(sample, matcher.explain(sample)):
+        print(f"        {title!r:40} ← {keyword!r}")
+
+
+if __name__ == "__main__":
+    main()
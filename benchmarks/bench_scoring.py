@@ -0,0 +1,108 @@
+"""Benchmark relevance scoring throughput (rows scored per second).
+
+    python benchmarks/bench_scoring.py [--rows 100000] [--new 0.01] [--words 150]
+
+Scores ``--rows`` synthetic postings against ``profile.txt`` with a fresh
+``JobScorer`` (a title plus ``--words`` Zipf-distributed description words
+each):
+
+    cold         empty cache: vectorise + score everything, then save
+    warm         new scorer, cache loaded from disk: score only
+    incremental  warm, plus a ``--new`` share of unseen postings
+    refit        baseline without a cache: TfidfVectorizer fitted on every row, every run
+
+A handful of postings are copies of the profile text; the bench checks they
+rank on top and that the warm scores match the cold ones.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+
+from scoring import NGRAMS, TOKEN_PATTERN, JobScorer, job_texts, read_profile  # noqa: E402
+
+TITLES = ["ML Engineer", "Data Scientist", "Java Developer", "Data Analyst", "DevOps Engineer",
+          "AI Engineer", "Business Analyst", "Research Scientist", "QA Engineer", "Data Engineer"]
+PLANTED = 5
+
+
+def make_jobs(rng: np.random.Generator, n: int, words: int, start: int = 0) -> pd.DataFrame:
+    vocab = np.array([f"w{i}" for i in range(20_000)])
+    ranks = np.minimum(rng.zipf(1.3, size=(n, words)), len(vocab)) - 1
+    return pd.DataFrame({
+        "job_id": [f"job{i}" for i in range(start, start + n)],
+        "title": rng.choice(TITLES, size=n),
+        "description": [" ".join(row) for row in vocab[ranks]],
+    })
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - start, out
+
+
+def refit(profile: str, df: pd.DataFrame) -> np.ndarray:
+    vectorizer = TfidfVectorizer(ngram_range=NGRAMS, token_pattern=TOKEN_PATTERN, stop_words="english",
+                                 sublinear_tf=True)
+    matrix = vectorizer.fit_transform(job_texts(df))
+    return (matrix @ vectorizer.transform([profile]).T).toarray().ravel()
+
+
+def report(name: str, rows: int, elapsed: float, extra: str = ""):
+    print(f"[BENCH] {name:<12} {rows:>8,} rows  {elapsed:7.2f}s  {rows / elapsed:>10,.0f} rows/s  {extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--new", type=float, default=0.01, help="share of unseen postings in the incremental run")
+    parser.add_argument("--words", type=int, default=150, help="description words per posting")
+    parser.add_argument("--profile", default=str(ROOT / "profile.txt"))
+    args = parser.parse_args()
+
+    profile = read_profile(args.profile)
+    rng = np.random.default_rng(7)
+    df = make_jobs(rng, args.rows, args.words)
+    planted = rng.choice(args.rows, size=PLANTED, replace=False)
+    df.loc[planted, "description"] = profile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = os.path.join(tmp, "score_cache.npz")
+        scorer = JobScorer(profile, cache)
+        elapsed, cold = timed(lambda: scorer.score(df))
+        save_time, kept = timed(scorer.save)
+        report("cold", len(df), elapsed + save_time,
+               f"(save {save_time:.2f}s, cache {os.path.getsize(cache) / 1024 / 1024:.1f} MiB for {kept:,} rows)")
+
+        load_time, scorer = timed(lambda: JobScorer(profile, cache))
+        elapsed, warm = timed(lambda: scorer.score(df))
+        report("warm", len(df), load_time + elapsed, f"(load {load_time:.2f}s, vectorised {scorer.vectorized})")
+
+        fresh = make_jobs(rng, max(1, int(args.rows * args.new)), args.words, start=args.rows)
+        grown = pd.concat([df, fresh], ignore_index=True)
+        scorer = JobScorer(profile, cache)
+        elapsed, _ = timed(lambda: scorer.score(grown))
+        report("incremental", len(grown), elapsed, f"(vectorised {scorer.vectorized})")
+
+    elapsed, _ = timed(lambda: refit(profile, df))
+    report("refit", len(df), elapsed)
+
+    top = set(np.argsort(-cold)[:PLANTED])
+    assert top == set(planted), "profile copies should rank on top"
+    assert np.allclose(cold, warm, atol=1e-6), "cached vectors must score the same"
+    print(f"[OK] {PLANTED} profile copies ranked on top (score {cold[planted].min():.2f}); "
+          f"median score {np.median(cold):.3f}; warm scores match cold")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark the HTTP-only search backend against the local fixture server.
+
+    python benchmarks/bench_search_backend.py [--pages 10] [--rate 0]
+
+Fetches every page of one query through ``RequestsBackend`` and reports
+pages/s, cards/s and how many TCP connections the pooled session opened.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "src"))
+
+from fixture_server import base_url, start_server  # noqa: E402
+from search_backend import RateLimiter, RequestsBackend  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--cards", type=int, default=20)
+    parser.add_argument("--rate", type=float, default=0, help="max requests/s (0 = unbounded)")
+    args = parser.parse_args()
+
+    server = start_server(pages=args.pages, cards=args.cards)
+    url = base_url(server)
+    backend = RequestsBackend(timeout=5, user_agent="bench", limiter=RateLimiter(args.rate))
+
+    cards = pages = 0
+    start = time.perf_counter()
+    for page in range(1, args.pages + 2):
+        jobs = backend.fetch_jobs(url.format(query="Machine+Learning", page=page))
+        if not jobs:
+            break
+        pages += 1
+        cards += len(jobs)
+    elapsed = time.perf_counter() - start
+    backend.close()
+    server.shutdown()
+
+    assert pages == args.pages, f"expected {args.pages} pages, got {pages}"
+    print(f"[BENCH] requests backend: {pages} pages / {cards} cards in {elapsed:.2f}s "
+          f"→ {pages / elapsed:.1f} pages/s, {cards / elapsed:,.0f} cards/s")
+    print(f"[BENCH] server saw {server.stats['requests']} requests over "
+          f"{server.stats['connections']} connection(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark Parquet vs CSV storage for the job history.
+
+    python benchmarks/bench_storage.py [--rows 300000]
+
+Writes the synthetic final_ml_jobs.csv from bench_candidates, imports it into
+a ParquetJobStore and compares file size, full-table load time and the
+apply stage's candidate query (CSV streaming vs Parquet pushdown).
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bench_candidates import synthetic_csv  # noqa: E402
+from job_store import CsvJobStore, ParquetJobStore  # noqa: E402
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=300_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "final_ml_jobs.csv"
+        synthetic_csv(csv_path, args.rows)
+        _, t_import = timed(lambda: ParquetJobStore(str(Path(tmp) / "store"), {"filtered_jobs": str(csv_path)}))
+        pq_path = Path(tmp) / "store" / "filtered_jobs.parquet"
+
+        csv_mb, pq_mb = csv_path.stat().st_size / 2**20, pq_path.stat().st_size / 2**20
+        print(f"[BENCH] {args.rows:,} rows (one-off import {t_import:.1f}s)")
+        print(f"[BENCH] size      csv {csv_mb:7.1f} MB   parquet {pq_mb:7.1f} MB  ({csv_mb / pq_mb:.1f}x smaller)")
+
+        csv_df, t_csv = timed(lambda: CsvJobStore({"filtered_jobs": str(csv_path)}).read_frame("filtered_jobs"))
+        pq_df, t_pq = timed(lambda: ParquetJobStore(str(Path(tmp) / "store")).read_frame("filtered_jobs"))
+        assert len(csv_df) == len(pq_df) == args.rows
+        print(f"[BENCH] full load csv {t_csv:6.2f}s     parquet {t_pq:6.2f}s     ({t_csv / t_pq:.1f}x)")
+
+        csv_c, t_csv = timed(lambda: CsvJobStore({"filtered_jobs": str(csv_path)}).apply_candidates(["pending"]))
+        pq_c, t_pq = timed(lambda: ParquetJobStore(str(Path(tmp) / "store")).apply_candidates(["pending"]))
+        assert set(csv_c["job_id"]) == set(pq_c["job_id"])
+        print(f"[BENCH] candidates csv {t_csv:5.2f}s     parquet {t_pq:6.3f}s     ({t_csv / t_pq:.0f}x)  "
+              f"{len(pq_c):,} rows")
+
+        _, t_count = timed(lambda: ParquetJobStore(str(Path(tmp) / "store")).count("filtered_jobs"))
+        print(f"[BENCH] count   parquet metadata {t_count * 1000:.1f} ms")
+        print("[OK] CSV and Parquet agree on rows and candidates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""Local HTTP server that mocks the parts of Dice the scrapers and apply bots use.
+
+    python benchmarks/fixture_server.py --port 8765 --pages 5 [--latency 0.05] [--failure-rate 0.02]
+
+``/jobs?q=<query>&page=<n>`` returns ``--cards`` job cards for pages
+``1..--pages`` and an empty result list after that. Responses are gzipped
+when the client accepts it and connections are kept alive (HTTP/1.1).
+
+``/dashboard/login`` mimics Dice's two-step (email, then password) login and
+sets a session cookie; ``/dashboard`` redirects to the login page without a
+valid one, so the apply bots' session reuse can be exercised offline.
+``/dashboard/jobs?page=<n>`` lists the account's applied jobs, ten per page.
+
+``/job-detail/<guid>`` is a job-detail page with a JobPosting JSON-LD block
+(description, skills, datePosted). It carries an ETag and Last-Modified and
+answers conditional requests with 304; ``--detail-latency`` delays it.
+
+The detail page also carries the ``apply-button-wc`` web component. After a
+status fetch it renders its open shadow root, with ``.application-submitted``
+for jobs the account has applied to and an apply button otherwise. Clicking
+it opens a two-step wizard, ``/job-applications/<guid>/wizard/1`` and ``2``,
+with a ``btn-next`` button on each step. The final one POSTs to
+``/job-applications/<guid>/submit``, which records the application. The
+wizard needs a logged-in session.
+
+Failure injection: ``--latency`` delays every response, ``--failure-rate``
+answers that share of page loads (search, detail, wizard) with a 503, and
+``--apply-failure-rate`` breaks the second wizard step (no ``btn-next``) for
+that share of jobs, always the same ones (``wizard_breaks``).
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CARD_TEMPLATE = """
+<div data-job-guid="{guid}" class="rounded-lg border p-4">
+  <a data-testid="job-search-job-detail-link" href="/job-detail/{guid}">{title}</a>
+  <p class="line-clamp-2 text-sm">{company}</p>
+  <div class="flex gap-1.5"><a href="/job-detail/{guid}">{apply_text}</a></div>
+  <p class="text-sm font-normal text-zinc-600">Remote</p>
+  <p class="text-sm font-normal text-zinc-600">•</p>
+  <p class="text-sm font-normal text-zinc-600">Today</p>
+  <div aria-labelledby="employmentType-label">Contract</div>
+  <div aria-labelledby="salary-label">USD 70.00 - 85.00 per hour</div>
+  <div class="mt-2"><p>{title} role for {query}. Python, PyTorch and cloud ML experience required.</p></div>
+</div>"""
+
+
+LOGIN_FORM = """<!DOCTYPE html><html><body>
+<form method="post" action="/dashboard/login">{fields}<button type="submit">Continue</button></form>
+</body></html>"""
+DASHBOARD = "<!DOCTYPE html><html><body><h1>Dashboard</h1></body></html>"
+DETAIL_TEMPLATE = """<!DOCTYPE html><html><head><title>{title}</title>
+<script type="application/ld+json">{posting}</script></head>
+<body><h1 data-cy="jobTitle">{title}</h1>
+<div data-testid="jobDescriptionHtml">{description}</div>
+<div data-testid="skillsList">{skills}</div>
+<apply-button-wc data-job-guid="{guid}"></apply-button-wc>{script}</body></html>"""
+# renders once the status call returns, like the real (hydrated) component
+APPLY_BUTTON_SCRIPT = """<script>
+customElements.define("apply-button-wc", class extends HTMLElement {
+  connectedCallback() {
+    const root = this.attachShadow({mode: "open"}), guid = this.dataset.jobGuid;
+    fetch(`/job-applications/${guid}/status`).then(r => r.json()).then(state => {
+      root.innerHTML = state.applied
+        ? '<span class="application-submitted">Application Submitted</span>'
+        : '<button type="button">Easy apply</button>';
+    });
+    this.addEventListener("click", () => {
+      if (!root.querySelector(".application-submitted")) location.href = `/job-applications/${guid}/wizard/1`;
+    });
+  }
+});
+</script>"""
+WIZARD_STEP = """<!DOCTYPE html><html><body><h2>Step {step} of 2</h2>
+<form method="{method}" action="{action}">{button}</form></body></html>"""
+WIZARD_DONE = "<!DOCTYPE html><html><body><h2>Application submitted</h2></body></html>"
+DETAIL_SKILLS = ["Python", "PyTorch", "TensorFlow", "SQL", "AWS", "Kubernetes", "Spark", "MLOps", "LLM", "Docker"]
+DETAIL_LAST_MODIFIED = "Mon, 02 Jun 2025 09:00:00 GMT"
+SESSION_COOKIE = "dice_session"
+APPLIED_PAGE_SIZE = 10
+
+
+def job_guid(query: str, page: int, idx: int) -> str:
+    """Stable UUID-shaped id for card ``idx`` on ``page`` of ``query``."""
+    h = hashlib.md5(f"{query}|{page}|{idx}".encode()).hexdigest()
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-8{h[17:20]}-{h[20:32]}"
+
+
+def wizard_breaks(guid: str, rate: float) -> bool:
+    """Whether job ``guid``'s wizard is broken at ``--apply-failure-rate`` ``rate`` (stable per guid)."""
+    return int(hashlib.md5(f"wizard|{guid}".encode()).hexdigest(), 16) % 10_000 < rate * 10_000
+
+
+def search_page(query: str, page: int, pages: int, cards: int) -> str:
+    body = ""
+    if 1 <= page <= pages:
+        body = "".join(
+            CARD_TEMPLATE.format(
+                guid=job_guid(query, page, i),
+                title=f"{query} Engineer {page}-{i}",
+                company=f"Staffing Firm {i % 7}",
+                apply_text="Easy Apply" if i % 3 else "Apply Now",
+                query=query,
+            )
+            for i in range(cards)
+        )
+    return f"<!DOCTYPE html><html><body><main>{body}</main></body></html>"
+
+
+def detail_page(guid: str) -> str:
+    """Detail page of job ``guid``: ~3 KB of description plus skills, stable per guid."""
+    h = int(hashlib.md5(guid.encode()).hexdigest(), 16)
+    title = f"Machine Learning Engineer {guid[:8]}"
+    skills = [DETAIL_SKILLS[(h >> (4 * i)) % len(DETAIL_SKILLS)] for i in range(5)]
+    skills = list(dict.fromkeys(skills))
+    paragraphs = "".join(
+        f"<p>Paragraph {i + 1}: you will design, train and ship models with {', '.join(skills)}, "
+        f"work with product and data teams, and own evaluation and monitoring in production. "
+        f"Requisition {guid}.</p>"
+        for i in range(12)
+    )
+    posting = {
+        "@context": "https://schema.org", "@type": "JobPosting", "title": title,
+        "description": paragraphs, "skills": ", ".join(skills),
+        "datePosted": f"2025-05-{1 + h % 28:02d}T12:00:00Z",
+    }
+    return DETAIL_TEMPLATE.format(
+        title=title, posting=json.dumps(posting), description=paragraphs,
+        skills="".join(f"<span>{s}</span>" for s in skills), guid=guid, script=APPLY_BUTTON_SCRIPT,
+    )
+
+
+def wizard_page(guid: str, step: int, broken: bool) -> str:
+    """Step ``step`` of the apply wizard; a ``broken`` second step has no ``btn-next``."""
+    if step == 1:
+        button = '<button type="submit" class="btn-next">Next</button>'
+        return WIZARD_STEP.format(step=1, method="get", action=f"/job-applications/{guid}/wizard/2", button=button)
+    button = "<p>Upload a resume to continue.</p>" if broken else \
+        '<button type="submit" class="btn-next">Submit</button>'
+    return WIZARD_STEP.format(step=2, method="post", action=f"/job-applications/{guid}/submit", button=button)
+
+
+def applied_page(applied, page: int) -> str:
+    chunk = applied[(page - 1) * APPLIED_PAGE_SIZE:page * APPLIED_PAGE_SIZE] if page >= 1 else []
+    rows = "".join(f'<li><a href="/job-detail/{guid}">Applied job</a></li>' for guid in chunk)
+    return f"<!DOCTYPE html><html><body><ul>{rows}</ul></body></html>"
+
+
+def make_handler(pages: int, cards: int, detail_latency: float = 0.0, latency: float = 0.0,
+                 failure_rate: float = 0.0, apply_failure_rate: float = 0.0):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            with self.server.stats_lock:
+                self.server.stats["connections"] += 1
+
+        def _send(self, status: int, payload: bytes = b"", headers=()):
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            for name, value in headers:
+                self.send_header(name, value)
+            if payload and "gzip" in self.headers.get("Accept-Encoding", ""):
+                payload = gzip.compress(payload)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _session(self) -> str:
+            for part in self.headers.get("Cookie", "").split(";"):
+                name, _, value = part.strip().partition("=")
+                if name == SESSION_COOKIE:
+                    return value
+            return ""
+
+        def _count(self, stat: str):
+            with self.server.stats_lock:
+                self.server.stats[stat] += 1
+
+        def _fail(self) -> bool:
+            """Answer with a 503 for a ``failure_rate`` share of page loads."""
+            if not failure_rate:
+                return False
+            with self.server.stats_lock:
+                failed = self.server.rng.random() < failure_rate
+                if failed:
+                    self.server.stats["failures"] += 1
+            if failed:
+                self._send(503, b"Service Unavailable")
+            return failed
+
+        def _job_application(self, path: str):
+            """``/job-applications/<guid>/status``, ``.../wizard/<step>`` and ``.../submit``."""
+            guid, _, rest = path[len("/job-applications/"):].partition("/")
+            action, _, step = rest.partition("/")
+            if (self.command, action) not in {("GET", "status"), ("GET", "wizard"), ("POST", "submit")}:
+                self.send_error(404)
+            elif action == "status":
+                with self.server.stats_lock:
+                    applied = guid in self.server.applied
+                self._send(200, json.dumps({"applied": applied}).encode(), headers=[("Cache-Control", "no-store")])
+            elif self._session() not in self.server.sessions:
+                self._send(302, headers=[("Location", "/dashboard/login")])
+            elif action == "wizard":
+                if not self._fail():
+                    page = wizard_page(guid, 2 if step == "2" else 1, wizard_breaks(guid, apply_failure_rate))
+                    self._send(200, page.encode())
+            else:
+                with self.server.stats_lock:
+                    if guid not in self.server.applied:
+                        self.server.applied.append(guid)
+                        self.server.stats["applications"] += 1
+                self._send(200, WIZARD_DONE.encode())
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            self._count("requests")
+            if latency:
+                time.sleep(latency)
+            if url.path == "/dashboard/login":
+                self._send(200, LOGIN_FORM.format(fields='<input name="email">').encode())
+            elif url.path in ("/dashboard", "/dashboard/jobs"):
+                if self._session() not in self.server.sessions:
+                    self._send(302, headers=[("Location", "/dashboard/login")])
+                elif url.path == "/dashboard":
+                    self._send(200, DASHBOARD.encode())
+                else:
+                    page = int(parse_qs(url.query).get("page", ["1"])[0])
+                    self._send(200, applied_page(self.server.applied, page).encode())
+            elif url.path.startswith("/job-applications/"):
+                self._job_application(url.path)
+            elif url.path.startswith("/job-detail/"):
+                if self._fail():
+                    return
+                guid = url.path.rsplit("/", 1)[1]
+                body = detail_page(guid).encode("utf-8")
+                etag = f'"{hashlib.md5(body).hexdigest()}"'
+                if detail_latency:
+                    time.sleep(detail_latency)
+                if self.headers.get("If-None-Match") == etag or (
+                        "If-None-Match" not in self.headers
+                        and self.headers.get("If-Modified-Since") == DETAIL_LAST_MODIFIED):
+                    with self.server.stats_lock:
+                        self.server.stats["not_modified"] += 1
+                    self._send(304, headers=[("ETag", etag)])
+                    return
+                with self.server.stats_lock:
+                    self.server.stats["details"] += 1
+                self._send(200, body, headers=[("ETag", etag), ("Last-Modified", DETAIL_LAST_MODIFIED)])
+            elif url.path == "/jobs":
+                if self._fail():
+                    return
+                self._count("searches")
+                qs = parse_qs(url.query)
+                query = qs.get("q", [""])[0]
+                page = int(qs.get("page", ["1"])[0])
+                self._send(200, search_page(query, page, pages, cards).encode("utf-8"))
+            else:
+                self.send_error(404)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            form = parse_qs(self.rfile.read(length).decode())
+            self._count("requests")
+            if latency:
+                time.sleep(latency)
+            path = urlparse(self.path).path
+            if path.startswith("/job-applications/"):
+                self._job_application(path)
+                return
+            if path != "/dashboard/login":
+                self.send_error(404)
+                return
+            email = form.get("email", [""])[0]
+            if "password" not in form:
+                fields = f'<input type="hidden" name="email" value="{email}"><input name="password" type="password">'
+                self._send(200, LOGIN_FORM.format(fields=fields).encode())
+                return
+            token = secrets.token_hex(16)
+            with self.server.stats_lock:
+                self.server.sessions.add(token)
+                self.server.stats["logins"] += 1
+            self._send(303, headers=[("Location", "/dashboard"),
+                                     ("Set-Cookie", f"{SESSION_COOKIE}={token}; Path=/; Max-Age=86400")])
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_server(port: int = 0, pages: int = 5, cards: int = 20, applied=(),
+                 detail_latency: float = 0.0, latency: float = 0.0, failure_rate: float = 0.0,
+                 apply_failure_rate: float = 0.0, seed: int = 7) -> ThreadingHTTPServer:
+    """Start the server on a background thread; ``port=0`` picks a free port.
+
+    ``applied`` is the list of job GUIDs the mock account has applied to
+    (submitted applications are appended to ``server.applied``);
+    ``detail_latency`` is added to every job-detail response and ``latency``
+    to every response (seconds). ``failure_rate`` and ``apply_failure_rate``
+    are shares in [0, 1]; ``seed`` makes the injected 503s repeatable.
+    """
+    handler = make_handler(pages, cards, detail_latency, latency, failure_rate, apply_failure_rate)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    server.stats = {"connections": 0, "requests": 0, "logins": 0, "details": 0, "not_modified": 0,
+                    "searches": 0, "failures": 0, "applications": 0}
+    server.sessions = set()
+    server.applied = list(applied)
+    server.rng = random.Random(seed)
+    server.stats_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    """``BASE_URL`` template pointing at ``server``."""
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/jobs?q={{query}}&page={{page}}"
+
+
+def site_url(server: ThreadingHTTPServer) -> str:
+    """``site_url`` (the apply bots' origin) pointing at ``server``."""
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--cards", type=int, default=20)
+    parser.add_argument("--detail-latency", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of page loads answered 503")
+    parser.add_argument("--apply-failure-rate", type=float, default=0.0, help="share of jobs with a broken wizard")
+    args = parser.parse_args()
+
+    srv = start_server(args.port, args.pages, args.cards, detail_latency=args.detail_latency, latency=args.latency,
+                       failure_rate=args.failure_rate, apply_failure_rate=args.apply_failure_rate)
+    print(f"Serving on BASE_URL={base_url(srv)} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        srv.shutdown()
@@ -0,0 +1,54 @@
+"""Command line for the pipeline stages.
+
+    python src <command> [options]       (or, from the repo root: python -m src <command>)
+
+    scrape   scrape search results into the job store
+    filter   classify newly scraped jobs into the relevant-jobs table
+    enrich   fetch detail pages (full text, skills, posting date) of relevant jobs
+    apply    easy-apply to pending relevant jobs
+    report   mine output/logs for query yield and apply outcomes
+
+``python src <command> --help`` lists a command's options. Only the chosen
+stage is imported, so ``filter`` and ``report`` never load the browser
+libraries, and nothing opens a log file until a stage actually runs.
+"""
+import argparse
+import importlib
+import sys
+from pathlib import Path
+
+# the stage modules import each other by bare name
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+# command -> (module, entry point taking argv)
+COMMANDS = {
+    "scrape": ("stealth_scraper", "cli"),
+    "filter": ("main", "filter_cli"),
+    "enrich": ("job_details", "cli"),
+    "apply": ("stealth_apply", "cli"),
+    "report": ("log_report", "main"),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python src",
+        description=__doc__.split("\n\n", 1)[0],
+        epilog=__doc__.split("\n\n", 1)[1],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("args", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    module, entry = COMMANDS[args.command]
+    sys.argv[0] = f"python src {args.command}"
+    from settings import SettingsError
+    try:
+        getattr(importlib.import_module(module), entry)(args.args)
+    except SettingsError as exc:
+        sys.exit(f"[CONFIG] {exc}")
+
+
+if __name__ == "__main__":
+    main()
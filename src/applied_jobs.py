@@ -0,0 +1,43 @@
+import logging
+import re
+from typing import Set
+
+from job_index import JOB_ID_RE
+
+logger = logging.getLogger(__name__)
+
+GUID_ATTR_RE = re.compile(r'data-job-guid="([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})"', re.I)
+
+
+def job_ids_in_html(html: str) -> Set[str]:
+    """Every job GUID linked (``/job-detail/<id>``) or tagged (``data-job-guid``) on a page."""
+    ids = {m.group(1).lower() for m in JOB_ID_RE.finditer(html)}
+    ids.update(m.group(1).lower() for m in GUID_ATTR_RE.finditer(html))
+    return ids
+
+
+def fetch_applied_job_ids(driver, url_template: str, max_pages: int, timeout: float) -> Set[str]:
+    """Walk the account's applied-jobs list once, page by page, and collect its job IDs.
+
+    ``url_template`` takes ``{page}``. Stops at the first page that adds no
+    new IDs (past the end, or a site that ignores ``page``) or at ``max_pages``.
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    applied: Set[str] = set()
+    for page in range(1, max_pages + 1):
+        driver.get(url_template.format(page=page))
+        try:
+            # the list renders client-side; an empty page just times out
+            WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+                lambda d: job_ids_in_html(d.page_source)
+            )
+        except TimeoutException:
+            break
+        new = job_ids_in_html(driver.page_source) - applied
+        if not new:
+            break
+        applied |= new
+        logger.info(f"[PRE-FLIGHT] Applied list page {page}: {len(new)} job(s)")
+    return applied
@@ -1,49 +1,93 @@
-import os
-import time
-import yaml
 import logging
 import random
+import time
 from datetime import datetime
-import pandas as pd
-from selenium import webdriver
 from pathlib import Path
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, ElementNotInteractableException
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from dotenv import load_dotenv
+from typing import Optional
 
-# ====== CONFIG ======
-def load_config(path="config/apply_job_config.yaml"):
-    with open(path, "r") as f:
-        return yaml.safe_load(f)
-    
-def str2bool(s): return str(s).lower() in {"1","true","yes","y"}
+import pandas as pd
 
-config = load_config()
-load_dotenv()
+from apply_journal import ApplyJournal
+from apply_scheduler import POOL_PER_JOB, ApplyScheduler, CostModel, schedule_columns
+from applied_jobs import fetch_applied_job_ids
+from job_store import open_store
+from metrics import METRICS
+from apply_waits import ApplyWaits, ThrottlePolicy
+from scoring import JobScorer, best_candidates
+from session_cache import SessionCache, session_is_valid
+from settings import Settings, get_settings
 
-DELAY = config["delay"]
-CSV_FILE = config["main_csv_file"]
-EMAIL = os.getenv("APPLY_EMAIL") or config["email"]
-PASSWORD = os.getenv("APPLY_PASSWORD") or config["password"]
-DRIVER_PATH = config.get("driver_path", "/usr/local/bin/chromedriver")
-LOG_DIR = Path(config.get("log_dir", "output/logs"))
-PROCESS_FAILED = str2bool(os.getenv("APPLY_PROCESS_FAILED", "false"))
+logger = logging.getLogger()
+
+# ====== CONFIG ======
+# Filled in from the shared Settings by configure() (main() calls it):
+# importing this module reads no files, opens no log and loads no selenium.
+SETTINGS: Optional[Settings] = None
+DELAY = 5
+CSV_FILE = ""
+EMAIL = PASSWORD = ""
+DRIVER_PATH = ""
+LOG_DIR = Path("output/logs")
+STORAGE = "csv"
+STORE_PATH = JOURNAL_FILE = SITE_URL = SESSION_FILE = SESSION_KEY = ""
+PROFILE_DIR = None
+APPLIED_JOBS_URL = ""
+APPLIED_JOBS_MAX_PAGES = 50
+METRICS_DIR = ""
+WAIT_TIMEOUTS: dict = {}
+THROTTLE = ThrottlePolicy()
+PROCESS_FAILED = False
+TIME_BUDGET = 0.0  # seconds per run; 0 = none
+NEAR_DUP_INDEX: Optional[str] = None  # set when applying to one job per near-duplicate cluster
+
+
+def configure(settings: Optional[Settings] = None) -> Settings:
+    """Copy the apply stage's settings into the module constants."""
+    global SETTINGS, DELAY, CSV_FILE, EMAIL, PASSWORD, DRIVER_PATH, LOG_DIR, STORAGE, STORE_PATH, JOURNAL_FILE
+    global SITE_URL, SESSION_FILE, SESSION_KEY, PROFILE_DIR, APPLIED_JOBS_URL, APPLIED_JOBS_MAX_PAGES
+    global METRICS_DIR, WAIT_TIMEOUTS, THROTTLE, PROCESS_FAILED, NEAR_DUP_INDEX, TIME_BUDGET
+
+    SETTINGS = (settings or get_settings()).require("apply")
+    paths, apply, perf = SETTINGS.paths, SETTINGS.apply, SETTINGS.perf
+    DELAY = apply.delay
+    CSV_FILE = paths.filtered_csv
+    EMAIL = apply.email
+    PASSWORD = apply.password
+    DRIVER_PATH = apply.driver_path
+    LOG_DIR = Path(paths.log_dir)
+    STORAGE = paths.storage
+    STORE_PATH = paths.store_path
+    JOURNAL_FILE = paths.apply_journal_file
+    SITE_URL = apply.site_url.rstrip("/")
+    SESSION_FILE = paths.session_cache_file
+    SESSION_KEY = SETTINGS.session_key
+    PROFILE_DIR = paths.browser_profile_dir
+    APPLIED_JOBS_URL = SITE_URL + apply.applied_jobs_path
+    APPLIED_JOBS_MAX_PAGES = apply.applied_jobs_max_pages
+    METRICS_DIR = paths.metrics_dir
+    WAIT_TIMEOUTS = perf.wait_timeouts or {}
+    THROTTLE = ThrottlePolicy(*perf.step_pause)
+    PROCESS_FAILED = apply.process_failed
+    TIME_BUDGET = perf.apply_time_budget
+    NEAR_DUP_INDEX = paths.near_dup_index_file if apply.one_per_cluster else None
+    return SETTINGS
 
 # ====== Logging ======
-LOG_DIR.mkdir(parents=True, exist_ok=True)
-log_filename = LOG_DIR / f"apply_job_bot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-logging.basicConfig(
-    filename=str(log_filename),
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger()
+def setup_logging() -> Path:
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    log_filename = LOG_DIR / f"apply_job_bot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    logging.basicConfig(
+        filename=str(log_filename),
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    return log_filename
 
 def get_driver():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
     chrome_options = Options()
 
     # ✅ Use stable headless mode compatible with CI
@@ -52,23 +96,30 @@ def get_driver():
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--window-size=1920,1080")
+    if PROFILE_DIR:
+        # persistent profile keeps cookies/local storage across runs on the same machine
+        chrome_options.add_argument(f"--user-data-dir={Path(PROFILE_DIR).resolve()}")
 
     # ✅ Use Chrome 136 installed via CI
     chrome_options.binary_location = "/opt/chrome/chrome"
 
-    driver_path = config.get("driver_path", "/usr/local/bin/chromedriver")
-    service = Service(driver_path)
+    service = Service(DRIVER_PATH)
 
     driver = webdriver.Chrome(service=service, options=chrome_options)
     driver.implicitly_wait(3)
     return driver
 
 
+@METRICS.timed("apply.login")
 def login_to_dice(driver, EMAIL, PASSWORD, DELAY_WAIT):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
     logger.info("Logging into Dice...")
     print("Logging into Dice...")
 
-    driver.get("https://www.dice.com/dashboard/login")
+    driver.get(f"{SITE_URL}/dashboard/login")
     
     WebDriverWait(driver, DELAY_WAIT).until(
         EC.presence_of_element_located((By.NAME, "email"))
@@ -86,10 +137,43 @@ def login_to_dice(driver, EMAIL, PASSWORD, DELAY_WAIT):
     logger.info("Login successful.")
     print("Login successful.")
 
-def easy_apply(driver, job_link, job_title):
+
+def start_session(driver, cache: SessionCache):
+    """Reuse the cached Dice session if it is still live, otherwise log in and cache the new one."""
+    if cache.restore(driver, SITE_URL) and session_is_valid(driver, f"{SITE_URL}/dashboard", DELAY):
+        logger.info("Reused cached Dice session.")
+        print("Reused cached Dice session.")
+        METRICS.count("apply.session", "restored")
+        return
+    METRICS.count("apply.session", "login")
+    login_to_dice(driver, EMAIL, PASSWORD, DELAY)
+    cache.save(driver)
+
+
+def preflight_applied(driver, store) -> int:
+    """Mark everything on the account's applied list Applied before any job page is opened."""
+    try:
+        with METRICS.timer("apply.preflight"):
+            applied_ids = fetch_applied_job_ids(driver, APPLIED_JOBS_URL, APPLIED_JOBS_MAX_PAGES, DELAY)
+    except Exception as e:
+        logger.warning(f"[PRE-FLIGHT] Could not read the applied-jobs list, skipping: {e}")
+        return 0
+    marked = store.mark_status("filtered_jobs", applied_ids, "Applied")
+    logger.info(f"[PRE-FLIGHT] {len(applied_ids)} job(s) on the applied list, {marked} marked Applied")
+    print(f"[PRE-FLIGHT] {len(applied_ids)} job(s) on the applied list, {marked} marked Applied")
+    return marked
+
+def easy_apply(driver, job_link, job_title, waits: ApplyWaits, throttle: ThrottlePolicy):
+    from selenium.common.exceptions import ElementNotInteractableException, TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    waits.reset()
     try:
         driver.get(job_link)
-        time.sleep(DELAY)
+        with waits.step("page_ready", job_title):
+            waits.page_ready()
 
         '''
         # Save the job
@@ -113,52 +197,62 @@ def easy_apply(driver, job_link, job_title):
                 button.click()
                 logger.info(f"SAVED: {job_title}")
                 print(f"SAVED: {job_title}")
-                time.sleep(DELAY - 1)
+                throttle.pause()
         except Exception as e:
             logger.warning(f"Save logic failed for {job_title} — {e}")
             print(f"Save logic failed for {job_title}")
         '''
 
-        # Check if already applied
+        # Check if already applied (waits for the button's shadow DOM to render)
         try:
-            apply_component = driver.find_element(By.TAG_NAME, "apply-button-wc")
-            shadow_root = driver.execute_script("return arguments[0].shadowRoot", apply_component)
-            submitted_tag = shadow_root.find_elements(By.CSS_SELECTOR, ".application-submitted")
-            if submitted_tag:
+            with waits.step("apply_state", job_title):
+                state = waits.apply_state()
+            if state == "applied":
                 logger.info(f"SKIPPED (already applied): {job_title}")
                 print(f"SKIPPED (already applied): {job_title}")
                 return "Applied"
         except Exception as e:
             logger.warning(f"Could not check application status for {job_title} — {e}")
+            METRICS.count("apply.warning", "apply_state")
 
         # Remove modal if blocking
         try:
             modal = driver.find_element(By.TAG_NAME, "login-dhi-modal")
             if modal.is_displayed():
                 driver.execute_script("arguments[0].remove();", modal)
-                time.sleep(1)
         except Exception:
             pass
 
         # Apply to the job
         try:
-            apply_button = WebDriverWait(driver, DELAY).until(
+            apply_button = WebDriverWait(driver, waits.timeouts["apply_state"]).until(
                 EC.presence_of_element_located((By.TAG_NAME, "apply-button-wc"))
             )
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", apply_button)
-            time.sleep(2)
+            throttle.pause()
             apply_button.click()
         except (TimeoutException, ElementNotInteractableException) as e:
             logger.error(f"Cannot click apply-button-wc for {job_title}: {e}")
+            METRICS.count("apply.failure", "apply_button")
             return "Failed"
 
-        next_btn = driver.find_element(By.XPATH, "//button[contains(@class, 'btn-next')]")
-        next_btn.click()
-        time.sleep(DELAY - 2)
-
-        final_btn = driver.find_element(By.XPATH, "//button[contains(@class, 'btn-next')]")
-        final_btn.click()
-        time.sleep(DELAY - 2)
+        # NEXT, then the final NEXT (submit)
+        for which in ("first", "final"):
+            try:
+                with waits.step("next_button", job_title):
+                    next_btn = waits.next_button()
+                throttle.pause()
+                next_btn.click()
+            except Exception as e:
+                logger.error(f"[ERROR] Cannot click {which} NEXT button for {job_title}: {e}")
+                METRICS.count("apply.failure", f"{which}_next_button")
+                return "Failed"
+        try:
+            with waits.step("submitted", job_title):
+                waits.submitted()
+        except TimeoutException:
+            logger.warning(f"No confirmation after final NEXT for {job_title}")
+            METRICS.count("apply.warning", "no_confirmation")
 
         logger.info(f"APPLIED: {job_title}")
         print(f"APPLIED: {job_title}")
@@ -166,73 +260,103 @@ def easy_apply(driver, job_link, job_title):
 
     except Exception as e:
         logger.error(f"FAILED to apply for {job_title} - {job_link}: {e}")
+        METRICS.count("apply.failure", f"exception:{type(e).__name__}")
         print(f"FAILED to apply for {job_title} - {job_link}")
         return "Failed"
 
 
-def main(process_failed=False):
-    driver = get_driver()
+def main(process_failed=None, time_budget=None):
+    started = time.monotonic()
+    if SETTINGS is None:
+        configure()
+    setup_logging()
+    process_failed = PROCESS_FAILED if process_failed is None else process_failed
+    time_budget = TIME_BUDGET if time_budget is None else time_budget
+    store = open_store(STORAGE, STORE_PATH, {"filtered_jobs": CSV_FILE})
+    journal = ApplyJournal(JOURNAL_FILE)
+    replayed = False  # the journal is only cleared once it has reached the store
+    tried = {}  # job_id -> attempts so far, written back when the run ends
+    driver = None
 
     try:
-        login_to_dice(driver, EMAIL, PASSWORD, DELAY)
-
-        df = pd.read_csv(CSV_FILE)
-        
-        # 1. Filter only Easy Apply jobs
-        easy_apply_df = df[df["apply_text"].str.strip().str.lower() == "easy apply"].copy()
-        
-        # 2. Further filter to only Pending (or Failed if specified)
+        # merge results a crashed / timed-out previous run never got to save
+        journal.replay(store)
+        replayed = True
+        driver = get_driver()
+        start_session(driver, SessionCache(SESSION_FILE, SESSION_KEY))
+        preflight_applied(driver, store)
+
+        # 1-2. Easy Apply jobs that are Pending (or Failed if specified)
         status_to_process = ["pending"]
         if process_failed:
             status_to_process.append("failed")
 
-        pending_df = easy_apply_df[
-            easy_apply_df["status"].str.lower().isin(status_to_process)
-        ].copy()
-
         target_n = random.randint(50, 100)            # pick a target
-        n_to_apply = min(target_n, len(pending_df))   # but don’t exceed available
-        if n_to_apply < len(pending_df):
-            pending_df = pending_df.sample(n=n_to_apply, random_state=None)
-
+        # the best-scored candidates (a few per job); the scheduler hands out the target_n
+        # most valuable (relevance, freshness, earlier failures) while the time budget lasts
+        pending_df = best_candidates(store, status_to_process, POOL_PER_JOB * target_n, NEAR_DUP_INDEX,
+                                     JobScorer.from_settings(SETTINGS), schedule_columns(store))
+        jobs = ApplyScheduler(pending_df, limit=target_n, cost=CostModel.from_reports(METRICS_DIR),
+                              deadline=started + time_budget if time_budget else None)
+        n_to_apply = jobs.limit
+        if pending_df.attrs["near_duplicates"]:
+            logger.info(f"[INFO] Skipping {pending_df.attrs['near_duplicates']} near-duplicate posting(s)")
+            print(f"[INFO] Skipping {pending_df.attrs['near_duplicates']} near-duplicate posting(s)")
+
+        total_in_store = store.count("filtered_jobs")
         logger.info(f"[INFO] Will attempt {n_to_apply} job(s) this run "
-                    f"(requested {target_n}, available {len(df)})")
+                    f"(requested {target_n}, available {total_in_store})")
         print(f"[INFO] Will attempt {n_to_apply} job(s) this run "
-            f"(requested {target_n}, available {len(df)})")
+            f"(requested {target_n}, available {total_in_store})")
         
         logger.info(f"[INFO] Processing jobs with status: {status_to_process}")
         print(f"[INFO] Processing jobs with status: {status_to_process}")
 
         results = []
+        waits = ApplyWaits(driver, WAIT_TIMEOUTS)
 
-        for _, row in pending_df.iterrows():
+        while True:
+            row = jobs.next()
+            if row is None:
+                break
+            job_started = time.perf_counter()
             try:
-                result = easy_apply(driver, row["link"], row["title"])
+                with METRICS.timer("apply.easy_apply"):
+                    result = easy_apply(driver, row["link"], row["title"], waits, THROTTLE)
             except Exception as e:
                 logger.error(f"Error applying for {row['title']} - {row['link']}: {e}")
                 result = "Failed"
+            METRICS.count("apply.result", result)
             results.append(result)
+            tried[row["job_id"]] = row["attempts"] + 1
+            journal.record(row["job_id"], result, title=row["title"], attempts=tried[row["job_id"]])
+            store.update_status("filtered_jobs", row["job_id"], result)
+            elapsed = time.perf_counter() - job_started
+            METRICS.observe("apply.job", elapsed)
+            jobs.finished(elapsed)
 
-        easy_apply_df.loc[pending_df.index, "status"] = results
         applied = results.count("Applied")
-        total_pending = len(pending_df)
-
-        # 3. Merge updated Easy Apply section back into full df
-        df_remaining = df.drop(easy_apply_df.index)
-        df_combined = pd.concat([df_remaining, easy_apply_df], ignore_index=True)
-
-        # Sort by status only
-        df_combined["status"] = pd.Categorical(df_combined["status"], categories=["Pending", "Applied", "Failed"], ordered=True)
-        df_combined = df_combined.sort_values(by="status").reset_index(drop=True)
-
-        df_combined.to_csv(CSV_FILE, index=False)
-
-        logger.info(f"[DONE] Newly applied: {applied} out of {total_pending} Easy Apply jobs (Total in CSV: {len(df)})")
-        print(f"[DONE] Newly applied: {applied} out of {total_pending} Easy Apply jobs (Total in CSV: {len(df)})")
+        for step, median in waits.summary().items():
+            logger.info(f"[SUMMARY] {step}: median {median:.2f}s")
+        total_pending = n_to_apply
+        if jobs.out_of_time:
+            logger.info(f"[INFO] Time budget reached: {jobs.pending()} job(s) left Pending")
+            print(f"[INFO] Time budget reached: {jobs.pending()} job(s) left Pending")
+
+        logger.info(f"[DONE] Newly applied: {applied} out of {total_pending} Easy Apply jobs (Total in CSV: {total_in_store})")
+        print(f"[DONE] Newly applied: {applied} out of {total_pending} Easy Apply jobs (Total in CSV: {total_in_store})")
     
     finally:
-        driver.quit()
+        if tried:
+            store.upsert("filtered_jobs", pd.DataFrame({"job_id": list(tried), "attempts": list(tried.values())}),
+                         update_columns=["attempts"])
+        store.close()
+        if replayed:
+            journal.clear()  # everything journaled is now in the store
+        METRICS.write_report(METRICS_DIR, "apply")
+        if driver is not None:
+            driver.quit()
 
 if __name__ == "__main__":
-    main(process_failed=PROCESS_FAILED)
+    main()
 
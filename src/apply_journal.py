@@ -0,0 +1,64 @@
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class ApplyJournal:
+    """Append-only JSONL log of apply results, fsync'd after every job.
+
+    Each ``easy_apply`` outcome is journaled before the store is touched, so
+    a crash or CI timeout loses at most the job in flight. On the next start
+    ``replay`` merges whatever the previous run didn't, then clears the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+
+    def record(self, job_id: str, status: str, **fields):
+        entry = {"job_id": job_id, "status": status,
+                 "at": datetime.now().isoformat(timespec="seconds"), **fields}
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def entries(self) -> List[dict]:
+        """Journaled results not yet merged; a torn last line is ignored."""
+        entries = []
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping unreadable journal line: {line[:80]!r}")
+        return entries
+
+    def replay(self, store, table: str = "filtered_jobs") -> int:
+        """Apply unmerged results (and attempt counts) to ``store``, persist them, then clear the journal."""
+        entries = self.entries()
+        if not entries:
+            return 0
+        for entry in entries:
+            store.update_status(table, entry["job_id"], entry["status"])
+        counted = {e["job_id"]: e["attempts"] for e in entries if "attempts" in e}
+        if counted:
+            store.upsert(table, pd.DataFrame({"job_id": list(counted), "attempts": list(counted.values())}),
+                         update_columns=["attempts"])
+        store.flush()
+        self.clear()
+        logger.info(f"Replayed {len(entries)} journaled apply result(s) into {table}")
+        return len(entries)
+
+    def clear(self):
+        with open(self.path, "w") as f:
+            f.flush()
+            os.fsync(f.fileno())
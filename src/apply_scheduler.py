@@ -0,0 +1,173 @@
+"""Deadline-aware apply ordering: most valuable job first, stop before time runs out.
+
+    scheduler = ApplyScheduler(pending_df, limit=target, deadline=start + budget,
+                               cost=CostModel.from_reports("output/metrics"))
+    while (row := scheduler.next()) is not None:
+        ...
+        scheduler.finished(seconds)
+
+A job's priority multiplies three things:
+
+    relevance   its ``score`` from scoring.py (1 without one)
+    freshness   halves every ``FRESH_HALF_LIFE_DAYS`` since ``date_posted``
+                (``date_added`` when that is missing): old postings have
+                probably closed
+    retries     ``RETRY_PENALTY`` per earlier failed attempt (``attempts``)
+
+Jobs come off a heap, so workers always take the best one left. Before
+handing one out, the scheduler checks that the time left before
+``deadline`` still covers a job. The cost of a job is the p95 of the
+end-to-end durations measured this run, including the pacing delays and
+rate limiting. Until a few have been measured, the recent apply reports in
+``metrics_dir`` are used instead. A run that would otherwise be killed by
+the CI timeout stops cleanly, with everything it did recorded.
+"""
+import heapq
+import itertools
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from metrics import percentile
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_COLUMNS = ["date_posted", "date_added", "attempts"]
+FRESH_HALF_LIFE_DAYS = 7.0
+RETRY_PENALTY = 0.5
+RELEVANCE_FLOOR = 0.01  # so freshness still orders jobs that share the profile no terms
+HISTORY_REPORTS = 5  # recent apply reports the prior cost comes from
+MIN_SAMPLES = 5  # jobs this run must time before its own p95 replaces the prior
+DEFAULT_JOB_SECONDS = 90.0  # nothing measured yet
+PACING_SECONDS = 12.0  # worst-case human delays around easy_apply, for reports older than apply.job
+POOL_PER_JOB = 4  # best-scored candidates handed to the scheduler per job a run may attempt
+
+# ── Priority ─────────────────────────────────────────────────────
+
+def schedule_columns(store) -> List[str]:
+    """The scheduling columns ``filtered_jobs`` has (``attempts`` appears after the first failure)."""
+    existing = set(store.columns("filtered_jobs"))
+    return [col for col in SCHEDULE_COLUMNS if col in existing]
+
+
+def age_days(df: pd.DataFrame, now: Optional[datetime] = None) -> pd.Series:
+    """Days since posting (NaN when neither date parses)."""
+    now = pd.Timestamp(now or datetime.now()).normalize()
+    posted = pd.Series(pd.NaT, index=df.index)
+    for col in ("date_added", "date_posted"):  # date_posted wins where both parse
+        if col in df.columns:
+            dates = pd.to_datetime(df[col], format="mixed", errors="coerce")
+            posted = dates.where(dates.notna(), posted)
+    return ((now - posted).dt.days).clip(lower=0)
+
+
+def attempts(df: pd.DataFrame) -> pd.Series:
+    if "attempts" not in df.columns:
+        return pd.Series(0, index=df.index)
+    return pd.to_numeric(df["attempts"], errors="coerce").fillna(0).astype(int)
+
+
+def priority(df: pd.DataFrame, now: Optional[datetime] = None) -> pd.Series:
+    """relevance × freshness × retry penalty for every row of ``df``."""
+    relevance = df["score"].clip(lower=0) + RELEVANCE_FLOOR if "score" in df.columns else 1.0
+    freshness = np.exp2(-age_days(df, now) / FRESH_HALF_LIFE_DAYS).fillna(0.5)  # undated: a week old
+    return relevance * freshness * RETRY_PENALTY ** attempts(df)
+
+# ── Cost ─────────────────────────────────────────────────────────
+
+class CostModel:
+    """Seconds one job takes end to end, measured this run or taken from recent reports. Thread-safe."""
+
+    def __init__(self, prior: Optional[float] = None):
+        self.prior = prior
+        self.samples: List[float] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_reports(cls, metrics_dir: str, n: int = HISTORY_REPORTS) -> "CostModel":
+        """Prior cost: count-weighted p95 of ``apply.job`` over the last ``n`` apply reports."""
+        weighted, count = 0.0, 0
+        for path in sorted(Path(metrics_dir).glob("apply_*.json"))[-n:]:
+            try:
+                phases = json.loads(path.read_text()).get("phases", {})
+            except (OSError, ValueError):
+                continue
+            phase, extra = phases.get("apply.job", {}), 0.0
+            if not phase.get("count"):
+                phase, extra = phases.get("apply.easy_apply", {}), PACING_SECONDS
+            if phase.get("count"):
+                weighted += (phase["p95"] + extra) * phase["count"]
+                count += phase["count"]
+        return cls(weighted / count if count else None)
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def reserve(self) -> float:
+        """Seconds to keep free for the next job (p95)."""
+        with self._lock:
+            if len(self.samples) >= MIN_SAMPLES:
+                return percentile(self.samples, 95)
+        return self.prior or DEFAULT_JOB_SECONDS
+
+    def mean(self) -> Optional[float]:
+        with self._lock:
+            return sum(self.samples) / len(self.samples) if self.samples else None
+
+# ── Scheduler ────────────────────────────────────────────────────
+
+class ApplyScheduler:
+    """Thread-safe max-heap of candidate rows by ``priority``, handing out at most
+    ``limit`` of them and none that would not finish before ``deadline``
+    (a ``clock()`` value; None = no deadline). Rows come out as dicts with
+    ``attempts`` (an int) and ``priority`` added."""
+
+    def __init__(self, df: pd.DataFrame, limit: Optional[int] = None, deadline: Optional[float] = None,
+                 cost: Optional[CostModel] = None, clock: Callable[[], float] = time.monotonic,
+                 now: Optional[datetime] = None):
+        df = df.assign(attempts=attempts(df), priority=priority(df, now) if not df.empty else [])
+        seq = itertools.count()
+        self._heap = [(-p, next(seq), row) for p, row in zip(df["priority"], df.to_dict("records"))]
+        heapq.heapify(self._heap)
+        self.limit = len(self._heap) if limit is None else min(limit, len(self._heap))
+        self.deadline = deadline
+        self.cost = cost or CostModel()
+        self.clock = clock
+        self.handed_out = 0
+        self.out_of_time = False
+        self._lock = threading.Lock()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline (None without one)."""
+        return None if self.deadline is None else self.deadline - self.clock()
+
+    def next(self) -> Optional[dict]:
+        """The best job left, or None when the limit is reached, the heap is empty or time is short."""
+        with self._lock:
+            if self.handed_out >= self.limit or not self._heap:
+                return None
+            left = self.remaining()
+            if left is not None and left < self.cost.reserve():
+                if not self.out_of_time:
+                    logger.info(f"[INFO] {left:.0f}s left, a job needs ~{self.cost.reserve():.0f}s: "
+                                f"stopping with {self.pending()} job(s) not started")
+                self.out_of_time = True
+                return None
+            self.handed_out += 1
+            return heapq.heappop(self._heap)[2]
+
+    def finished(self, seconds: float):
+        """Report how long a job took, end to end."""
+        self.cost.observe(seconds)
+
+    def pending(self) -> int:
+        """Jobs within the limit that have not been handed out."""
+        return self.limit - self.handed_out
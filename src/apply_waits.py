@@ -0,0 +1,116 @@
+import logging
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUTS = {"page_ready": 15, "apply_state": 10, "next_button": 10}
+NEXT_BUTTON_XPATH = "//button[contains(@class, 'btn-next')]"
+
+# apply-button-wc renders its shadow DOM after the page is "complete"; report
+# which state it settled in, or null while it is still empty
+APPLY_STATE_JS = """
+const host = document.querySelector('apply-button-wc');
+const root = host && host.shadowRoot;
+if (!root) return null;
+if (root.querySelector('.application-submitted')) return 'applied';
+if (root.querySelector('button, a')) return 'ready';
+return null;
+"""
+
+
+class ThrottlePolicy:
+    """Deliberate pacing between clicks, kept out of the wait logic.
+
+    ``pause()`` sleeps U(min_delay, max_delay); ``(0, 0)`` means go as fast
+    as the page allows.
+    """
+
+    def __init__(self, min_delay: float = 0.0, max_delay: float = 0.0):
+        self.min_delay = min_delay
+        self.max_delay = max(min_delay, max_delay)
+
+    def pause(self):
+        if self.max_delay > 0:
+            time.sleep(random.uniform(self.min_delay, self.max_delay))
+
+
+class ApplyWaits:
+    """Explicit-condition waits for the easy-apply flow, with per-step timing.
+
+    Every wait returns as soon as its condition holds and raises selenium's
+    ``TimeoutException`` after the step's timeout. Wrap a step in
+    ``step(name)`` to log how long it took and keep the sample in ``timings``
+    (and in the run's ``apply.<name>`` metrics histogram).
+    """
+
+    def __init__(self, driver, timeouts: Optional[Dict[str, float]] = None,
+                 timings: Optional[Dict[str, List[float]]] = None):
+        self.driver = driver
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        # pass one dict to several instances (one per worker) to pool the samples
+        self.timings: Dict[str, List[float]] = {} if timings is None else timings
+        self._clicked = None  # (element, text) of the last NEXT button handed out
+
+    def _wait(self, name: str):
+        from selenium.webdriver.support.ui import WebDriverWait
+        return WebDriverWait(self.driver, self.timeouts[name], poll_frequency=0.1)
+
+    @contextmanager
+    def step(self, name: str, label: str = ""):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings.setdefault(name, []).append(elapsed)
+            METRICS.observe(f"apply.{name}", elapsed)
+            logger.info(f"[STEP] {name} {elapsed:.2f}s {label}".rstrip())
+
+    def page_ready(self):
+        self._wait("page_ready").until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+
+    def apply_state(self) -> str:
+        """``"applied"`` or ``"ready"`` once the apply button's shadow DOM has rendered."""
+        return self._wait("apply_state").until(lambda d: d.execute_script(APPLY_STATE_JS))
+
+    def _advanced(self) -> bool:
+        """Has the last NEXT button been replaced or relabelled since it was clicked?"""
+        from selenium.common.exceptions import StaleElementReferenceException
+        element, text = self._clicked
+        try:
+            return element.text != text
+        except StaleElementReferenceException:
+            return True
+
+    def next_button(self):
+        """The clickable ``btn-next``; after a previous click, the wizard's next one."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+
+        clickable = EC.element_to_be_clickable((By.XPATH, NEXT_BUTTON_XPATH))
+        after_click = self._clicked is not None
+        button = self._wait("next_button").until(
+            lambda d: (not after_click or self._advanced()) and clickable(d)
+        )
+        self._clicked = (button, button.text)
+        return button
+
+    def submitted(self):
+        """Wait for the wizard to move on from the final NEXT click."""
+        self._wait("next_button").until(lambda d: self._advanced())
+        self._clicked = None
+
+    def reset(self):
+        self._clicked = None
+
+    def summary(self) -> Dict[str, float]:
+        """Median seconds per step over the run so far."""
+        return {name: statistics.median(samples) for name, samples in self.timings.items()}
@@ -0,0 +1,82 @@
+import logging
+from datetime import datetime
+from typing import List, Optional
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+from job_index import extract_job_id
+
+logger = logging.getLogger(__name__)
+
+# ── Selectors (kept in sync with the WebDriver extraction) ───────
+CARD_SELECTOR = "div[data-job-guid]"
+LINK_SELECTOR = "a[data-testid='job-search-job-detail-link']"
+META_SELECTOR = "p.text-sm.font-normal.text-zinc-600"
+COMPANY_SELECTOR = "p.line-clamp-2.text-sm"
+DESC_SELECTOR = "div.mt-2 p"
+APPLY_SELECTOR = "div[class*='gap-1.5'] > a"  # == .//div[contains(@class, 'gap-1.5')]/a
+
+
+def _text(el) -> str:
+    """Visible text of a tag with whitespace collapsed, like WebElement.text."""
+    if el is None:
+        return ""
+    return " ".join(el.get_text(" ").split())
+
+
+def make_soup(html: str) -> BeautifulSoup:
+    """Parse with lxml when available, falling back to the stdlib parser."""
+    try:
+        return BeautifulSoup(html, "lxml")
+    except FeatureNotFound:
+        return BeautifulSoup(html, "html.parser")
+
+
+def parse_card(card, base_url: str = "", date_added: Optional[str] = None) -> dict:
+    """Turn one ``div[data-job-guid]`` tag into the scraper's job dict."""
+    link_el = card.select_one(LINK_SELECTOR)
+    if link_el is None or not link_el.get("href"):
+        raise ValueError("card has no job-detail link")
+
+    meta_elems = card.select(META_SELECTOR)
+    location = _text(meta_elems[0]) if meta_elems else "N/A"
+    posted_date = _text(meta_elems[2]) if len(meta_elems) > 2 else "N/A"
+
+    company_el = card.select_one(COMPANY_SELECTOR)
+    link = urljoin(base_url, link_el["href"])
+
+    def extract_tag(label_id: str) -> str:
+        return _text(card.select_one(f"div[aria-labelledby='{label_id}']"))
+
+    return {
+        "title": _text(link_el),
+        "company": _text(company_el) if company_el is not None else "N/A",
+        "link": link,
+        "description": _text(card.select_one(DESC_SELECTOR)),
+        "location": location,
+        "date_added": date_added or datetime.now().strftime("%m/%d/%Y"),
+        "date_posted": posted_date,
+        "job_type": extract_tag("employmentType-label"),
+        "salary": extract_tag("salary-label"),
+        "apply_text": _text(card.select_one(APPLY_SELECTOR)),
+        "job_id": extract_job_id(link, card.get("data-job-guid")),
+    }
+
+
+def parse_job_cards(html: str, base_url: str = "") -> List[dict]:
+    """Parse every job card of a search-result page in a single pass.
+
+    ``html`` is one ``driver.page_source`` snapshot, so a whole page costs a
+    single WebDriver round trip instead of ~10 per card. Relative links are
+    resolved against ``base_url`` (the page URL) to match ``get_attribute("href")``.
+    """
+    soup = make_soup(html)
+    date_added = datetime.now().strftime("%m/%d/%Y")
+    jobs = []
+    for card in soup.select(CARD_SELECTOR):
+        try:
+            jobs.append(parse_card(card, base_url, date_added))
+        except Exception as exc:
+            logger.error(f"Error parsing card: {exc}")
+    return jobs
@@ -0,0 +1,369 @@
+"""Job-detail enrichment: full posting text, skills and posting date.
+
+    python src enrich [--refresh]      (python src/main.py runs it after the filter)
+
+Every Pending row of ``filtered_jobs`` that has not been enriched yet gets
+its detail page fetched over one pooled aiohttp session, with at most
+``detail_concurrency`` requests in flight and ``detail_requests_per_sec``
+started per second. No browser is involved.
+
+Pages are cached under ``detail_cache_dir`` by job id, together with their
+ETag / Last-Modified. An entry younger than ``detail_cache_ttl_days`` is
+reused without a request; an older one is revalidated with a conditional
+GET, and a 304 carries no body. Entries idle longer than
+``detail_cache_max_idle_days``, and the least recently used beyond
+``detail_cache_max_entries``, are evicted when the cache is saved.
+
+Enriched rows (``details_fetched_at`` set) are not fetched again;
+``--refresh`` re-checks them through the cache.
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+import pandas as pd
+
+from card_parser import make_soup
+from job_index import normalize_posted_date
+from job_store import open_store
+from metrics import METRICS
+from settings import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+# columns the stage adds to filtered_jobs (date_posted is refined in place)
+DETAIL_COLUMNS = ["full_description", "skills", "date_posted", "details_fetched_at"]
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36"
+RETRY_STATUS = (429, 500, 502, 503, 504)
+GONE_STATUS = (404, 410)  # the posting was taken down: recorded, never retried
+MAX_RETRIES = 2
+BACKOFF = 1.0  # seconds, doubled per retry
+# HTML fallbacks for pages without a JobPosting JSON-LD block
+DESCRIPTION_SELECTOR = "[data-testid='jobDescriptionHtml']"
+SKILLS_SELECTOR = "[data-testid='skillsList'] span"
+
+# ── Parsing ──────────────────────────────────────────────────────
+
+def _plain_text(el) -> str:
+    """Text of a tag, one line per block, whitespace inside lines collapsed."""
+    if el is None:
+        return ""
+    lines = (" ".join(line.split()) for line in el.get_text("\n").splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _job_posting(soup) -> dict:
+    """The schema.org JobPosting object embedded in a detail page, or {}."""
+    for script in soup.select("script[type='application/ld+json']"):
+        try:
+            data = json.loads(script.string or "")
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            data = data.get("@graph", [data])
+        for item in data if isinstance(data, list) else []:
+            if isinstance(item, dict) and item.get("@type") == "JobPosting":
+                return item
+    return {}
+
+
+def _skill_names(value) -> List[str]:
+    """JSON-LD ``skills`` is a comma-separated string, a list, or DefinedTerm objects."""
+    if isinstance(value, str):
+        value = value.split(",")
+    elif isinstance(value, dict):
+        value = [value]
+    names, seen = [], set()
+    for item in value or []:
+        name = str(item.get("name", "") if isinstance(item, dict) else item).strip()
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+
+def parse_job_detail(html: str) -> dict:
+    """Full description, skills (comma-separated) and ISO posting date of a detail page."""
+    soup = make_soup(html)
+    posting = _job_posting(soup)
+    if posting.get("description"):
+        description = _plain_text(make_soup(posting["description"]))
+    else:
+        description = _plain_text(soup.select_one(DESCRIPTION_SELECTOR))
+    skills = _skill_names(posting.get("skills")) or _skill_names([el.get_text() for el in soup.select(SKILLS_SELECTOR)])
+    posted = str(posting.get("datePosted") or "")[:10]
+    return {
+        "full_description": description,
+        "skills": ", ".join(skills),
+        "date_posted": normalize_posted_date(posted) if posted else "",
+    }
+
+# ── Cache ────────────────────────────────────────────────────────
+
+class DetailCache:
+    """Detail pages on disk by job id, with the validators to re-fetch them conditionally.
+
+    ``index.json`` maps job id → {url, etag, last_modified, fetched, used}
+    (epoch seconds); bodies are gzipped under ``pages/``. Used from a single
+    event loop, so there is no locking.
+    """
+
+    def __init__(self, cache_dir: str, ttl_days: float = 7, max_idle_days: float = 30,
+                 max_entries: int = 5000, entries: Optional[Dict[str, dict]] = None):
+        self.dir = Path(cache_dir)
+        self.ttl = ttl_days * 86400
+        self.max_idle = max_idle_days * 86400
+        self.max_entries = max_entries
+        self.entries = entries or {}
+
+    @classmethod
+    def load(cls, cache_dir: str, ttl_days: float = 7, max_idle_days: float = 30,
+             max_entries: int = 5000) -> "DetailCache":
+        path = Path(cache_dir) / "index.json"
+        entries = {}
+        if path.exists():
+            try:
+                entries = json.loads(path.read_text())
+            except ValueError:
+                logger.warning(f"Ignoring unreadable detail cache index {path}")
+        return cls(cache_dir, ttl_days, max_idle_days, max_entries, entries)
+
+    def _page(self, job_id: str) -> Path:
+        return self.dir / "pages" / f"{job_id}.html.gz"
+
+    def lookup(self, job_id: str, url: str, now: float) -> Optional[dict]:
+        """The entry for ``job_id`` if it holds ``url``'s page; marks it used."""
+        entry = self.entries.get(job_id)
+        if entry is None or entry.get("url") != url or not self._page(job_id).exists():
+            return None
+        entry["used"] = now
+        return entry
+
+    def is_fresh(self, entry: dict, now: float) -> bool:
+        return now - entry["fetched"] < self.ttl
+
+    def read(self, job_id: str) -> str:
+        return gzip.decompress(self._page(job_id).read_bytes()).decode("utf-8")
+
+    def put(self, job_id: str, url: str, body: str, etag: Optional[str], last_modified: Optional[str], now: float):
+        page = self._page(job_id)
+        page.parent.mkdir(parents=True, exist_ok=True)
+        tmp = page.with_suffix(".tmp")
+        tmp.write_bytes(gzip.compress(body.encode("utf-8")))
+        os.replace(tmp, page)
+        self.entries[job_id] = {"url": url, "etag": etag, "last_modified": last_modified, "fetched": now, "used": now}
+
+    def revalidated(self, job_id: str, now: float):
+        """The server answered 304: the cached page is good for another TTL."""
+        self.entries[job_id]["fetched"] = now
+
+    def evict(self, now: float) -> int:
+        """Drop idle entries, then the least recently used beyond ``max_entries``."""
+        live = sorted(
+            (job_id for job_id, entry in self.entries.items() if now - entry["used"] < self.max_idle),
+            key=lambda job_id: self.entries[job_id]["used"], reverse=True,
+        )
+        keep = set(live[:self.max_entries])
+        dropped = [job_id for job_id in self.entries if job_id not in keep]
+        for job_id in dropped:
+            del self.entries[job_id]
+            self._page(job_id).unlink(missing_ok=True)
+        return len(dropped)
+
+    def save(self, now: Optional[float] = None) -> int:
+        """Evict, then write the index atomically; returns the number of entries evicted."""
+        evicted = self.evict(time.time() if now is None else now)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        path = self.dir / "index.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.entries, separators=(",", ":")))
+        os.replace(tmp, path)
+        return evicted
+
+# ── Fetching ─────────────────────────────────────────────────────
+
+class AsyncRateLimiter:
+    """``search_backend.RateLimiter`` for coroutines on one event loop."""
+
+    def __init__(self, max_per_sec: float):
+        self.interval = 1.0 / max_per_sec if max_per_sec > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class DetailFetcher:
+    """Bounded concurrent GETs of detail pages through a ``DetailCache``.
+
+    ``fetch`` returns job id → (outcome, html) where outcome is one of
+    ``cached`` (fresh entry, no request), ``not_modified`` (304),
+    ``downloaded``, ``gone`` (404/410) or ``error`` (html is None for the
+    last two). Duplicate job ids are fetched once.
+    """
+
+    def __init__(self, cache: DetailCache, concurrency: int = 4, max_per_sec: float = 2.0,
+                 timeout: float = 15.0, user_agent: str = USER_AGENT):
+        self.cache = cache
+        self.concurrency = concurrency
+        self.limiter = AsyncRateLimiter(max_per_sec)
+        self.timeout = timeout
+        self.headers = {
+            "User-Agent": user_agent,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        }
+        self.bytes_downloaded = 0
+
+    async def _request(self, session, url: str, headers: dict):
+        """One GET with retries on 429/5xx; returns (status, headers, body or None)."""
+        for attempt in range(MAX_RETRIES + 1):
+            await self.limiter.wait()
+            try:
+                with METRICS.timer("enrich.http_get"):
+                    async with session.get(url, headers=headers) as resp:
+                        if resp.status not in RETRY_STATUS or attempt == MAX_RETRIES:
+                            body = await resp.text() if resp.status == 200 else None
+                            return resp.status, resp.headers, body
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                if attempt == MAX_RETRIES:
+                    raise
+                logger.info(f"Retrying {url} after {type(exc).__name__}")
+            await asyncio.sleep(BACKOFF * 2 ** attempt)
+
+    async def _fetch_one(self, session, slots, job_id: str, url: str, now: float) -> Tuple[str, Optional[str]]:
+        entry = self.cache.lookup(job_id, url, now)
+        if entry and self.cache.is_fresh(entry, now):
+            return "cached", self.cache.read(job_id)
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        async with slots:
+            try:
+                status, resp_headers, body = await self._request(session, url, headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                logger.warning(f"Detail request failed for {url}: {type(exc).__name__} {exc}")
+                METRICS.count("enrich.fetch_failure", type(exc).__name__)
+                return "error", None
+        if status == 304 and entry:
+            self.cache.revalidated(job_id, now)
+            return "not_modified", self.cache.read(job_id)
+        if status in GONE_STATUS:
+            return "gone", None
+        if status != 200:
+            logger.warning(f"Detail request for {url} returned HTTP {status}")
+            METRICS.count("enrich.fetch_failure", f"http_{status}")
+            return "error", None
+        self.bytes_downloaded += len(body.encode("utf-8"))
+        self.cache.put(job_id, url, body, resp_headers.get("ETag"), resp_headers.get("Last-Modified"), now)
+        return "downloaded", body
+
+    async def fetch_all(self, jobs: Iterable[Tuple[str, str]]) -> Dict[str, Tuple[str, Optional[str]]]:
+        todo = dict(jobs)  # job id -> url; a repeated id is fetched once
+        now = time.time()
+        slots = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=self.headers) as session:
+            results = await asyncio.gather(*(
+                self._fetch_one(session, slots, job_id, url, now) for job_id, url in todo.items()
+            ))
+        return dict(zip(todo, results))
+
+    def fetch(self, jobs: Iterable[Tuple[str, str]]) -> Dict[str, Tuple[str, Optional[str]]]:
+        return asyncio.run(self.fetch_all(jobs))
+
+# ── Stage ────────────────────────────────────────────────────────
+
+def rows_to_enrich(df: pd.DataFrame, refresh: bool = False) -> pd.DataFrame:
+    """Pending rows with a link that have not been enriched (every Pending row on ``refresh``)."""
+    if df.empty or "link" not in df.columns:
+        return df.iloc[0:0]
+    todo = df["status"].astype(str).str.lower().eq("pending") & df["link"].fillna("").astype(str).ne("")
+    if not refresh and "details_fetched_at" in df.columns:
+        todo &= df["details_fetched_at"].fillna("").astype(str).eq("")
+    return df[todo]
+
+
+def enrich_frame(df: pd.DataFrame, fetcher: DetailFetcher) -> Tuple[pd.DataFrame, Counter]:
+    """Detail fields for the rows of ``df`` (job_id, link, date_posted) and the fetch outcomes.
+
+    Rows whose fetch failed are left out so the next run retries them; a
+    page that is gone is recorded with empty fields.
+    """
+    with METRICS.timer("enrich.fetch_all"):
+        results = fetcher.fetch(zip(df["job_id"], df["link"]))
+    stamp = datetime.now().isoformat(timespec="seconds")
+    posted = df["date_posted"] if "date_posted" in df.columns else pd.Series("", index=df.index)
+    rows, outcomes = [], Counter()
+    for job_id, old_posted in zip(df["job_id"], posted):
+        outcome, html = results[job_id]
+        outcomes[outcome] += 1
+        if outcome == "error":
+            continue
+        with METRICS.timer("enrich.parse"):
+            fields = parse_job_detail(html) if html else {"full_description": "", "skills": "", "date_posted": ""}
+        fields["date_posted"] = fields["date_posted"] or old_posted
+        rows.append({"job_id": job_id, **fields, "details_fetched_at": stamp})
+    for outcome, n in outcomes.items():
+        METRICS.count("enrich.outcome", outcome, n)
+    return pd.DataFrame(rows, columns=["job_id", *DETAIL_COLUMNS]), outcomes
+
+
+def enrich_jobs(settings: Settings, refresh: bool = False) -> Counter:
+    """Fetch, parse and store the detail fields of relevant Pending jobs."""
+    paths, perf = settings.paths, settings.perf
+    store = open_store(
+        paths.storage,
+        paths.store_path,
+        {"jobs": paths.jobs_csv, "filtered_jobs": paths.filtered_csv},
+    )
+    cache = DetailCache.load(paths.detail_cache_dir, perf.detail_cache_ttl_days,
+                             perf.detail_cache_max_idle_days, perf.detail_cache_max_entries)
+    fetcher = DetailFetcher(cache, perf.detail_concurrency, perf.detail_requests_per_sec, perf.http_timeout)
+    try:
+        todo = rows_to_enrich(store.read_frame("filtered_jobs"), refresh)
+        enriched, outcomes = enrich_frame(todo, fetcher) if not todo.empty else (pd.DataFrame(), Counter())
+        with METRICS.timer("enrich.store_upsert"):
+            store.upsert("filtered_jobs", enriched, update_columns=DETAIL_COLUMNS)
+    finally:
+        store.close()
+        evicted = cache.save()
+    METRICS.count("enrich.cache", "evicted", evicted)
+    METRICS.write_report(paths.metrics_dir, "enrich")
+
+    print(f"[ENRICH] {len(todo)} job(s): {outcomes['downloaded']} downloaded "
+          f"({fetcher.bytes_downloaded / 1024:.0f} KiB), {outcomes['cached']} cached, "
+          f"{outcomes['not_modified']} not modified, {outcomes['gone']} gone, "
+          f"{outcomes['error']} failed (retried next run)")
+    print(f"[ENRICH] Cache: {len(cache.entries)} page(s) in {paths.detail_cache_dir}, {evicted} evicted")
+    return outcomes
+
+
+def cli(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Fetch job-detail pages of relevant jobs into the store.")
+    parser.add_argument("--refresh", action="store_true",
+                        help="re-check already enriched Pending jobs (conditional requests through the cache)")
+    args = parser.parse_args(argv)
+    enrich_jobs(get_settings(), refresh=args.refresh)
+
+
+if __name__ == "__main__":
+    cli()
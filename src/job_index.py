@@ -0,0 +1,154 @@
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+JOB_ID_RE = re.compile(r"/job-detail/([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})", re.I)
+RELATIVE_RE = re.compile(r"^(\d+)\+?\s*(minute|min|hour|hr|second|sec|day|week|month)s?\s+ago$")
+DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%m/%d/%Y", "%b %d, %Y", "%B %d, %Y")
+DAYS_PER_UNIT = {"day": 1, "week": 7, "month": 30}
+# when the same job_id appears twice, keep the most advanced status
+STATUS_RANK = {"Applied": 0, "Failed": 1, "Pending": 2}
+
+# ── Keys & dates ─────────────────────────────────────────────────
+
+def extract_job_id(link: str, guid: Optional[str] = None) -> str:
+    """Canonical job key: the ``/job-detail/<uuid>`` GUID (or ``data-job-guid``).
+
+    Links without a GUID fall back to the link minus its query string, so
+    tracking parameters like ``?searchlink=`` never create a second key.
+    """
+    if guid:
+        return guid.strip().lower()
+    link = str(link or "")
+    match = JOB_ID_RE.search(link)
+    if match:
+        return match.group(1).lower()
+    return link.split("?", 1)[0].rstrip("/")
+
+
+def normalize_posted_date(text, reference: Optional[datetime] = None) -> str:
+    """Turn "Today", "Yesterday", "3 days ago", "30+ days ago", ... into YYYY-MM-DD.
+
+    ``reference`` is when the text was scraped (default: now). Absolute
+    dates are re-formatted; anything unrecognised is returned unchanged.
+    """
+    raw = "" if text is None or (isinstance(text, float) and pd.isna(text)) else str(text).strip()
+    t = re.sub(r"^(posted|updated|reposted)\s+", "", raw.lower())
+    if not t or t in {"n/a", "nan"}:
+        return raw
+    ref = reference or datetime.now()
+
+    if t in {"today", "just now", "just posted", "new"}:
+        return ref.strftime("%Y-%m-%d")
+    if t == "yesterday":
+        return (ref - timedelta(days=1)).strftime("%Y-%m-%d")
+    match = RELATIVE_RE.match(t)
+    if match:
+        days = int(match.group(1)) * DAYS_PER_UNIT.get(match.group(2), 0)
+        return (ref - timedelta(days=days)).strftime("%Y-%m-%d")
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(raw, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return raw
+
+
+def ensure_job_ids(df: pd.DataFrame) -> pd.DataFrame:
+    """Backfill ``job_id`` and absolute ``date_posted`` on rows written before them.
+
+    Relative dates of old rows are resolved against their ``date_added``.
+    """
+    if df.empty or "link" not in df.columns:
+        return df
+    if "job_id" not in df.columns:
+        df["job_id"] = None
+    missing = df["job_id"].isna() | (df["job_id"].astype(str) == "")
+    if missing.any():
+        df.loc[missing, "job_id"] = df.loc[missing, "link"].map(extract_job_id)
+
+    if "date_posted" in df.columns:
+        added = pd.to_datetime(df.get("date_added"), format="mixed", errors="coerce")
+        df["date_posted"] = [
+            normalize_posted_date(posted, ts.to_pydatetime()) if not pd.isna(ts) else posted
+            for posted, ts in zip(df["date_posted"], added)
+        ]
+    return df
+
+
+def dedup_jobs(df: pd.DataFrame) -> pd.DataFrame:
+    """One row per ``job_id``, preferring Applied > Failed > Pending, else the earliest row."""
+    if df.empty or "job_id" not in df.columns:
+        return df
+    if "status" in df.columns:
+        rank = df["status"].astype(str).map(STATUS_RANK).fillna(len(STATUS_RANK))
+        keep = rank.sort_values(kind="stable").index
+        keep = df.loc[keep].drop_duplicates(subset=["job_id"], keep="first").index
+        return df.loc[df.index.isin(keep)]
+    return df.drop_duplicates(subset=["job_id"], keep="first")
+
+# ── Persistent index ─────────────────────────────────────────────
+
+class JobIndex:
+    """Persistent ``job_id → [first_seen, last_seen]`` map with O(1) membership.
+
+    Loaded once at startup; ``claim`` is thread-safe so scraper workers can
+    share one instance.
+    """
+
+    def __init__(self, path: str, entries: Optional[Dict[str, List[str]]] = None):
+        self.path = Path(path)
+        self.entries: Dict[str, List[str]] = entries or {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> "JobIndex":
+        p = Path(path)
+        if p.exists():
+            with open(p, "r") as f:
+                return cls(path, json.load(f))
+        return cls(path)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def claim(self, job_id: str, seen_at: Optional[datetime] = None) -> bool:
+        """Record a sighting of ``job_id``; True only the first time it is ever seen."""
+        stamp = (seen_at or datetime.now()).isoformat(timespec="seconds")
+        with self._lock:
+            entry = self.entries.get(job_id)
+            if entry is None:
+                self.entries[job_id] = [stamp, stamp]
+                return True
+            entry[1] = max(entry[1], stamp)
+            return False
+
+    def seed(self, df: pd.DataFrame) -> int:
+        """Add ids from an existing jobs frame (first seen = ``date_added``)."""
+        if df.empty or "job_id" not in df.columns:
+            return 0
+        added = pd.to_datetime(df.get("date_added"), format="mixed", errors="coerce")
+        before = len(self.entries)
+        with self._lock:
+            for job_id, ts in zip(df["job_id"], added):
+                if job_id not in self.entries:
+                    stamp = ts.isoformat(timespec="seconds") if not pd.isna(ts) else ""
+                    self.entries[job_id] = [stamp, stamp]
+        return len(self.entries) - before
+
+    def save(self):
+        """Atomic write: dump to a temp file, then rename over the index."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with self._lock, open(tmp, "w") as f:
+            json.dump(self.entries, f, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp, self.path)
@@ -0,0 +1,730 @@
+"""Job storage: SQLite (WAL) system of record with CSV import/export.
+
+Stages talk to a store instead of rewriting whole CSVs:
+
+    store = open_store("sqlite", "output/jobs.db", {"jobs": "output/jobs.csv"})
+    store.upsert("jobs", df_new)                       # batched insert
+    store.update_status("filtered_jobs", job_id, "Applied")  # one row
+    store.close()
+
+Tables mirror the CSVs: ``jobs`` (every scraped posting, jobs.csv) and
+``filtered_jobs`` (relevant postings + apply status, final_ml_jobs.csv).
+``CsvJobStore`` keeps the old read-everything/rewrite-everything behaviour
+behind the same interface; ``ParquetJobStore`` keeps one typed, compressed
+Parquet file per table (needs pyarrow). CLI:
+
+    python src/job_store.py export   # write the CSV artifacts from the store
+    python src/job_store.py import   # (re)load the store from the CSVs
+"""
+import argparse
+import logging
+import os
+import random
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from job_index import dedup_jobs, ensure_job_ids
+from settings import SCRAPER_CONFIG, load_settings
+
+logger = logging.getLogger(__name__)
+
+TABLES = ("jobs", "filtered_jobs")
+# column order of the committed CSV artifacts
+CSV_COLUMNS = ["title", "company", "link", "description", "location", "date_added", "job_type",
+               "salary", "apply_text", "status", "date_posted", "job_id"]
+STATUS_ORDER = ["Pending", "Applied", "Failed"]
+EASY_APPLY = "Easy Apply"
+CANDIDATE_COLUMNS = ["job_id", "title", "link", "status"]
+CHUNK_ROWS = 50_000  # CsvJobStore streaming reads
+SEQ_COLUMN = "seq"  # CsvJobStore/ParquetJobStore insertion order, their read_since cursor (sqlite has id)
+# ParquetJobStore column types
+PARQUET_CATEGORIES = ("status", "apply_text", "job_type", "company")
+PARQUET_DATES = ("date_added", "date_posted")
+
+
+def _clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalise a jobs frame for storage: ids, ISO dates, trimmed apply text."""
+    df = ensure_job_ids(df.drop(columns=[SEQ_COLUMN], errors="ignore"))
+    if "date_added" in df.columns:
+        added = pd.to_datetime(df["date_added"], format="mixed", errors="coerce")
+        df["date_added"] = added.dt.strftime("%Y-%m-%d").where(added.notna(), df["date_added"].astype(str))
+    if "apply_text" in df.columns:
+        df["apply_text"] = df["apply_text"].fillna("").astype(str).str.strip()
+        # stores match Easy Apply exactly, so fold " easy apply " and friends into it
+        df.loc[df["apply_text"].str.lower() == EASY_APPLY.lower(), "apply_text"] = EASY_APPLY
+    if "status" in df.columns:
+        df["status"] = df["status"].fillna("Pending").astype(str).str.strip().str.capitalize()
+    return df
+
+
+def _sequence(df: pd.DataFrame, known: Optional[pd.Series] = None) -> pd.DataFrame:
+    """Fill in missing ``SEQ_COLUMN`` numbers: a job's number in ``known`` (job_id → seq), else the next free ones in row order."""
+    if df.empty or "job_id" not in df.columns:
+        return df
+    seq = df[SEQ_COLUMN] if SEQ_COLUMN in df.columns else pd.Series(np.nan, index=df.index)
+    seq = pd.to_numeric(seq, errors="coerce")
+    if known is not None and seq.isna().any():
+        seq = seq.fillna(df["job_id"].map(known))
+    missing = seq.isna()
+    if missing.any():
+        start = int(seq.max()) if missing.sum() < len(seq) else 0
+        seq[missing] = np.arange(start + 1, start + 1 + int(missing.sum()))
+    return df.assign(**{SEQ_COLUMN: seq.astype("int64")})
+
+
+def sort_by_status(df: pd.DataFrame) -> pd.DataFrame:
+    """Pending → Applied → Failed, the order the CSV artifacts have always used."""
+    if "status" not in df.columns:
+        return df
+    df = df.copy()
+    df["status"] = pd.Categorical(df["status"], categories=STATUS_ORDER, ordered=True)
+    return df.sort_values(by="status", kind="stable").reset_index(drop=True)
+
+# ── SQLite store ─────────────────────────────────────────────────
+
+class SqliteJobStore:
+    """Jobs in SQLite (WAL): unique ``job_id`` index, (apply_text, status) index.
+
+    Writes touch only the changed rows, so per-run I/O scales with what a
+    stage changed rather than with the size of the history. The connection
+    may be used from worker threads as long as callers serialise access.
+    """
+
+    kind = "sqlite"
+
+    def __init__(self, path: str, csv_files: Optional[Dict[str, str]] = None):
+        self.path = path
+        self.csv_files = csv_files or {}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        for table in TABLES:
+            self._create_table(table)
+            self._seed_from_csv(table)
+
+    def _create_table(self, table: str):
+        with self.conn:
+            self.conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id      TEXT NOT NULL,
+                    title       TEXT,
+                    company     TEXT,
+                    link        TEXT,
+                    description TEXT,
+                    location    TEXT,
+                    date_added  TEXT,
+                    date_posted TEXT,
+                    job_type    TEXT,
+                    salary      TEXT,
+                    apply_text  TEXT,
+                    status      TEXT NOT NULL DEFAULT 'Pending',
+                    updated_at  TEXT
+                )""")
+            self.conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {table}_job_id ON {table}(job_id)")
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_apply_status ON {table}(apply_text, status)")
+
+    def _seed_from_csv(self, table: str):
+        csv_file = self.csv_files.get(table)
+        if csv_file and os.path.exists(csv_file) and not self.count(table):
+            n = self.import_csv(table, csv_file)
+            logger.info(f"Seeded {table} with {n} row(s) from {csv_file}")
+
+    def _columns(self, table: str) -> List[str]:
+        return [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+
+    def _ensure_columns(self, table: str, columns: Iterable[str]):
+        existing = set(self._columns(table))
+        with self.conn:
+            for col in columns:
+                if col not in existing:
+                    self.conn.execute(f'ALTER TABLE {table} ADD COLUMN "{col}" TEXT')
+
+    # reads ---------------------------------------------------------
+    def columns(self, table: str) -> List[str]:
+        return [c for c in self._columns(table) if c not in ("id", "updated_at")]
+
+    def count(self, table: str) -> int:
+        return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def job_ids(self, table: str) -> Set[str]:
+        return {row[0] for row in self.conn.execute(f"SELECT job_id FROM {table}")}
+
+    def read_frame(self, table: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        cols = ", ".join(f'"{c}"' for c in columns) if columns else "*"
+        df = pd.read_sql_query(f"SELECT {cols} FROM {table} ORDER BY id", self.conn)
+        return df.drop(columns=["id", "updated_at"], errors="ignore")
+
+    def read_since(self, table: str, cursor: int = 0) -> Tuple[pd.DataFrame, int]:
+        """Rows inserted after ``cursor`` (a row id) and the new high-water mark."""
+        df = pd.read_sql_query(f"SELECT * FROM {table} WHERE id > ? ORDER BY id", self.conn, params=[cursor])
+        new_cursor = int(df["id"].max()) if not df.empty else cursor
+        return df.drop(columns=["id", "updated_at"]), new_cursor
+
+    def apply_candidates(self, statuses: List[str], columns: Optional[List[str]] = None,
+                         sample: Optional[int] = None) -> pd.DataFrame:
+        """Easy Apply rows of ``filtered_jobs`` whose status is in ``statuses``.
+
+        ``sample`` returns a random subset of at most that many rows; the
+        total number of candidates is in ``df.attrs["available"]`` either way.
+        """
+        cols = ", ".join(f'"{c}"' for c in (columns or CANDIDATE_COLUMNS))
+        marks = ", ".join("?" for _ in statuses)
+        where = f"FROM filtered_jobs WHERE apply_text = ? AND status IN ({marks})"
+        params = [EASY_APPLY, *[s.capitalize() for s in statuses]]
+        if sample is None:
+            df = pd.read_sql_query(f"SELECT {cols} {where} ORDER BY id", self.conn, params=params)
+            df.attrs["available"] = len(df)
+        else:
+            df = pd.read_sql_query(f"SELECT {cols} {where} ORDER BY RANDOM() LIMIT ?", self.conn,
+                                   params=[*params, sample])
+            df.attrs["available"] = self.conn.execute(f"SELECT COUNT(*) {where}", params).fetchone()[0]
+        return df
+
+    def iter_apply_candidates(self, statuses: List[str], columns: Optional[List[str]] = None):
+        """``apply_candidates`` in row order, as frames of at most ``CHUNK_ROWS`` rows."""
+        cols = ", ".join(f'"{c}"' for c in (columns or CANDIDATE_COLUMNS))
+        marks = ", ".join("?" for _ in statuses)
+        params = [EASY_APPLY, *[s.capitalize() for s in statuses]]
+        yield from pd.read_sql_query(
+            f"SELECT {cols} FROM filtered_jobs WHERE apply_text = ? AND status IN ({marks}) ORDER BY id",
+            self.conn, params=params, chunksize=CHUNK_ROWS)
+
+    # writes --------------------------------------------------------
+    def upsert(self, table: str, df: pd.DataFrame, update_columns: Iterable[str] = ()) -> int:
+        """Batched insert keyed on ``job_id``; returns the number of new rows.
+
+        Existing rows are left alone unless ``update_columns`` names fields
+        to refresh from the incoming data.
+        """
+        if df.empty:
+            return 0
+        df = _clean_frame(df)
+        self._ensure_columns(table, df.columns)
+        cols = list(df.columns)
+        update_columns = [c for c in update_columns if c in cols and c != "job_id"]
+        conflict = (
+            "DO UPDATE SET " + ", ".join(f'"{c}" = excluded."{c}"' for c in update_columns)
+            if update_columns else "DO NOTHING"
+        )
+        col_sql = ", ".join(f'"{c}"' for c in cols)
+        marks = ", ".join("?" for _ in cols)
+        sql = f"INSERT INTO {table} ({col_sql}) VALUES ({marks}) ON CONFLICT(job_id) {conflict}"
+        rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+        before = self.count(table)
+        with self.conn:
+            self.conn.executemany(sql, rows)
+        return self.count(table) - before
+
+    def delete(self, table: str, job_ids: Iterable[str]) -> int:
+        with self.conn:
+            cur = self.conn.executemany(f"DELETE FROM {table} WHERE job_id = ?", ((j,) for j in job_ids))
+        return cur.rowcount
+
+    def update_status(self, table: str, job_id: str, status: str):
+        with self.conn:
+            self.conn.execute(
+                f"UPDATE {table} SET status = ?, updated_at = ? WHERE job_id = ?",
+                (status, datetime.now().isoformat(timespec="seconds"), job_id),
+            )
+
+    def mark_status(self, table: str, job_ids: Iterable[str], status: str) -> int:
+        """Set ``status`` on every listed job not already in it; returns rows changed."""
+        before = self.conn.total_changes
+        stamp = datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            self.conn.executemany(
+                f"UPDATE {table} SET status = ?, updated_at = ? WHERE job_id = ? AND status IS NOT ?",
+                [(status, stamp, job_id, status) for job_id in job_ids],
+            )
+        return self.conn.total_changes - before
+
+    # CSV bridge ----------------------------------------------------
+    def import_csv(self, table: str, csv_file: str) -> int:
+        return self.upsert(table, pd.read_csv(csv_file))
+
+    def export_csv(self, table: str, csv_file: str) -> int:
+        df = sort_by_status(self.read_frame(table))
+        ordered = [c for c in CSV_COLUMNS if c in df.columns]
+        df = df[ordered + [c for c in df.columns if c not in ordered]]
+        df.to_csv(csv_file, index=False)
+        return len(df)
+
+    def flush(self):
+        """Writes are committed as they happen; nothing is buffered."""
+        self.conn.commit()
+
+    def close(self):
+        # fold the WAL back into the main file so the DB can be committed as-is
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.conn.close()
+
+# ── CSV store (legacy) ───────────────────────────────────────────
+
+def _matches(col: pd.Series, wanted: Set[str]) -> np.ndarray:
+    """Case/space-insensitive membership test on a categorical column.
+
+    Only the column's (few) categories are normalised, not every row.
+    """
+    cats = col.cat.categories
+    keep = np.array([str(c).strip().lower() in wanted for c in cats] + [False])
+    return keep[col.cat.codes.to_numpy()]  # code -1 (NaN) picks the trailing False
+
+
+class CsvJobStore:
+    """Same interface, backed by whole-file CSV reads and rewrites.
+
+    The apply stage never loads a whole file: ``apply_candidates``,
+    ``iter_apply_candidates``, ``count`` and ``mark_status`` stream the
+    columns they need in chunks, and status changes are kept as a
+    ``job_id → status`` patch that ``flush`` streams back into the CSV (row
+    order kept). Anything else loads the frame, folding in pending patches.
+    """
+
+    kind = "csv"
+
+    def __init__(self, csv_files: Dict[str, str]):
+        self.csv_files = csv_files
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._dirty: Set[str] = set()
+        self._patches: Dict[str, Dict[str, str]] = {}
+
+    def _load(self, table: str) -> pd.DataFrame:
+        path = self.csv_files[table]
+        return ensure_job_ids(pd.read_csv(path)) if os.path.exists(path) else pd.DataFrame()
+
+    def _frame(self, table: str) -> pd.DataFrame:
+        if table not in self._frames:
+            df = self._load(table)
+            if not df.empty and (SEQ_COLUMN not in df.columns or df[SEQ_COLUMN].isna().any()):
+                # files from before the column: number the rows in file order, once
+                df = _sequence(df)
+                self._dirty.add(table)
+            patch = self._patches.pop(table, None)
+            if patch and not df.empty:
+                hit = df["job_id"].isin(patch.keys())
+                df.loc[hit, "status"] = df.loc[hit, "job_id"].map(patch)
+                self._dirty.add(table)
+            self._frames[table] = df
+        return self._frames[table]
+
+    def _streamable(self, table: str) -> bool:
+        """Not loaded yet, and the file already carries job_id (older CSVs need a full load to backfill it)."""
+        path = self.csv_files[table]
+        return (table not in self._frames and os.path.exists(path)
+                and "job_id" in pd.read_csv(path, nrows=0).columns)
+
+    def _chunks(self, table: str, usecols: Optional[List[str]] = None, **kwargs):
+        return pd.read_csv(self.csv_files[table], usecols=usecols, chunksize=CHUNK_ROWS, **kwargs)
+
+    def columns(self, table: str) -> List[str]:
+        if self._streamable(table):
+            columns = pd.read_csv(self.csv_files[table], nrows=0).columns
+        else:
+            columns = self._frame(table).columns
+        return [c for c in columns if c != SEQ_COLUMN]
+
+    def count(self, table: str) -> int:
+        if self._streamable(table):
+            return sum(len(chunk) for chunk in self._chunks(table, ["job_id"]))
+        return len(self._frame(table))
+
+    def job_ids(self, table: str) -> Set[str]:
+        df = self._frame(table)
+        return set(df["job_id"]) if "job_id" in df.columns else set()
+
+    def read_frame(self, table: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        df = self._frame(table)
+        if columns and not df.empty:
+            return df[columns].copy()
+        return df.drop(columns=[SEQ_COLUMN], errors="ignore")
+
+    def read_since(self, table: str, cursor: int = 0) -> Tuple[pd.DataFrame, int]:
+        """Rows inserted after ``cursor`` (a ``SEQ_COLUMN`` number) and the new high-water mark.
+
+        Rewrites (dedup, status order) move rows around but keep their
+        numbers, so no row is skipped or read twice.
+        """
+        df = self._frame(table)
+        if df.empty:
+            return df.copy(), cursor
+        last = int(df[SEQ_COLUMN].max())
+        if cursor > last:  # the store was rebuilt
+            cursor = 0
+        new = df[df[SEQ_COLUMN] > cursor].sort_values(SEQ_COLUMN, kind="stable")
+        return new.drop(columns=[SEQ_COLUMN]).reset_index(drop=True), last
+
+    def apply_candidates(self, statuses: List[str], columns: Optional[List[str]] = None,
+                         sample: Optional[int] = None) -> pd.DataFrame:
+        """Easy Apply rows with a status in ``statuses``; ``sample`` reservoir-samples at most N."""
+        columns = columns or CANDIDATE_COLUMNS
+        rng = random.Random()
+        kept, reservoir, seen = [], [], 0
+        for rows in self.iter_apply_candidates(statuses, columns):
+            if sample is None:
+                kept.append(rows)
+                continue
+            for row in rows.itertuples(index=False, name=None):  # Algorithm R
+                seen += 1
+                if len(reservoir) < sample:
+                    reservoir.append(row)
+                else:
+                    j = rng.randrange(seen)
+                    if j < sample:
+                        reservoir[j] = row
+        if sample is None:
+            df = pd.concat(kept, ignore_index=True) if kept else pd.DataFrame(columns=columns)
+            seen = len(df)
+        else:
+            df = pd.DataFrame(reservoir, columns=columns)
+        df.attrs["available"] = seen
+        return df
+
+    def iter_apply_candidates(self, statuses: List[str], columns: Optional[List[str]] = None):
+        """``apply_candidates`` in row order, as frames of at most ``CHUNK_ROWS`` rows."""
+        columns = columns or CANDIDATE_COLUMNS
+        wanted = {s.lower() for s in statuses}
+        if not self._streamable("filtered_jobs"):
+            df = self._frame("filtered_jobs")
+            if df.empty:
+                return
+            mask = (df["apply_text"].str.strip().str.lower() == EASY_APPLY.lower()) & \
+                df["status"].str.lower().isin(wanted)
+            df = df.loc[mask, columns]
+            for start in range(0, len(df), CHUNK_ROWS):
+                yield df.iloc[start:start + CHUNK_ROWS].reset_index(drop=True)
+            return
+
+        patch = self._patches.get("filtered_jobs", {})
+        usecols = list(dict.fromkeys([*columns, "job_id", "status", "apply_text"]))
+        dtypes = {"status": "category", "apply_text": "category"}
+        for chunk in self._chunks("filtered_jobs", usecols, dtype=dtypes):
+            easy = _matches(chunk["apply_text"], {EASY_APPLY.lower()})
+            ok = easy & _matches(chunk["status"], wanted)
+            if patch:
+                chunk["status"] = chunk["status"].astype(object)
+                hit = chunk["job_id"].isin(patch.keys()).to_numpy()
+                if hit.any():
+                    chunk.loc[hit, "status"] = chunk.loc[hit, "job_id"].map(patch)
+                    ok[hit] = easy[hit] & chunk.loc[hit, "status"].str.lower().isin(wanted).to_numpy()
+            rows = chunk.loc[ok, columns].reset_index(drop=True)
+            for col in ("status", "apply_text"):
+                if col in rows.columns:
+                    rows[col] = rows[col].astype(object)
+            yield rows
+
+    def upsert(self, table: str, df: pd.DataFrame, update_columns: Iterable[str] = ()) -> int:
+        if df.empty:
+            return 0
+        old = self._frame(table)
+        df = ensure_job_ids(df.drop(columns=[SEQ_COLUMN], errors="ignore"))
+        before = len(old)
+        combined = pd.concat([old, df], ignore_index=True)
+        update_columns = list(update_columns)
+        if update_columns and not old.empty:
+            latest = df.drop_duplicates("job_id", keep="last").set_index("job_id")[update_columns]
+            hit = combined["job_id"].isin(latest.index)
+            combined.loc[hit, update_columns] = latest.loc[combined.loc[hit, "job_id"]].values
+        known = old.groupby("job_id")[SEQ_COLUMN].min() if not old.empty else None
+        # a row that replaced an older copy of its job keeps that copy's number
+        self._frames[table] = _sequence(dedup_jobs(combined).reset_index(drop=True), known)
+        self._dirty.add(table)
+        return len(self._frames[table]) - before
+
+    def delete(self, table: str, job_ids: Iterable[str]) -> int:
+        df = self._frame(table)
+        drop = df["job_id"].isin(set(job_ids))
+        self._frames[table] = df[~drop].reset_index(drop=True)
+        self._dirty.add(table)
+        return int(drop.sum())
+
+    def update_status(self, table: str, job_id: str, status: str):
+        if table not in self._frames:
+            self._patches.setdefault(table, {})[job_id] = status
+            return
+        df = self._frame(table)
+        df.loc[df["job_id"] == job_id, "status"] = status
+        self._dirty.add(table)
+
+    def mark_status(self, table: str, job_ids: Iterable[str], status: str) -> int:
+        job_ids = set(job_ids)
+        if self._streamable(table):
+            patch = self._patches.setdefault(table, {})
+            changed = 0
+            for chunk in self._chunks(table, ["job_id", "status"]):
+                hit = chunk[chunk["job_id"].isin(job_ids)]
+                current = hit["job_id"].map(patch).fillna(hit["status"])
+                for job_id in hit.loc[current != status, "job_id"]:
+                    patch[job_id] = status
+                    changed += 1
+            return changed
+        df = self._frame(table)
+        if df.empty:
+            return 0
+        hit = df["job_id"].isin(job_ids) & (df["status"] != status)
+        if hit.any():
+            df.loc[hit, "status"] = status
+            self._dirty.add(table)
+        return int(hit.sum())
+
+    def _write_patch(self, table: str, patch: Dict[str, str]):
+        """Stream the CSV through, rewriting only ``status`` for patched rows."""
+        path = self.csv_files[table]
+        tmp = f"{path}.tmp"
+        first = True
+        # read everything as text so untouched cells are written back verbatim
+        for chunk in self._chunks(table, dtype=object, keep_default_na=False):
+            hit = chunk["job_id"].isin(patch.keys())
+            if hit.any():
+                chunk.loc[hit, "status"] = chunk.loc[hit, "job_id"].map(patch)
+            chunk.to_csv(tmp, index=False, header=first, mode="w" if first else "a")
+            first = False
+        if not first:
+            os.replace(tmp, path)
+
+    def export_csv(self, table: str, csv_file: str) -> int:
+        df = sort_by_status(self._frame(table))
+        df.to_csv(csv_file, index=False)
+        return len(df)
+
+    def flush(self):
+        """Rewrite every CSV changed since the last flush."""
+        for table, patch in self._patches.items():
+            if patch:
+                self._write_patch(table, patch)
+        self._patches.clear()
+        for table in self._dirty:
+            self.export_csv(table, self.csv_files[table])
+        self._dirty.clear()
+
+    def close(self):
+        self.flush()
+
+
+# ── Parquet store ────────────────────────────────────────────────
+
+def _to_arrow(df: pd.DataFrame):
+    """Dictionary-encode the low-cardinality columns, store ISO dates as dates."""
+    import pyarrow as pa
+
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object:  # frames concatenated from several sources can mix types
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    for col in PARQUET_DATES:
+        if col in df.columns:
+            parsed = pd.to_datetime(df[col], format="%Y-%m-%d", errors="coerce")
+            # a column with unparseable text (e.g. raw "Posted recently") stays a string
+            if parsed.notna().sum() == (df[col].fillna("").astype(str) != "").sum():
+                df[col] = parsed
+    for col in PARQUET_CATEGORIES:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _from_arrow(table) -> pd.DataFrame:
+    """Back to the plain-string frame the stages expect."""
+    df = table.to_pandas()
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+        elif col in PARQUET_DATES and pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].dt.strftime("%Y-%m-%d")
+    return df
+
+
+class ParquetJobStore(CsvJobStore):
+    """One Parquet file per table under ``store_dir`` (zstd, dictionary-encoded).
+
+    ``status``/``apply_text``/``job_type``/``company`` are dictionary columns
+    and the dates real dates, so nothing is re-parsed on load. Reads that
+    need a few fields (``count``, ``job_ids``, ``apply_candidates``,
+    ``mark_status``) use column and predicate pushdown instead of loading
+    the table; everything else goes through the cached frame. The CSVs are
+    only ever exports.
+    """
+
+    kind = "parquet"
+
+    def __init__(self, store_dir: str, csv_files: Optional[Dict[str, str]] = None):
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError as exc:
+            raise RuntimeError("storage: parquet needs pyarrow (pip install pyarrow)") from exc
+        super().__init__(csv_files or {})
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+        self.paths = {table: os.path.join(store_dir, f"{table}.parquet") for table in TABLES}
+        for table in TABLES:
+            csv_file = self.csv_files.get(table)
+            if not os.path.exists(self.paths[table]) and csv_file and os.path.exists(csv_file):
+                n = self.import_csv(table, csv_file)
+                logger.info(f"Seeded {table} with {n} row(s) from {csv_file}")
+        self.flush()
+
+    def _load(self, table: str) -> pd.DataFrame:
+        import pyarrow.parquet as pq
+        path = self.paths[table]
+        return _from_arrow(pq.read_table(path)) if os.path.exists(path) else pd.DataFrame()
+
+    def _streamable(self, table: str) -> bool:
+        return table not in self._frames and os.path.exists(self.paths[table])
+
+    def _read(self, table: str, columns: List[str], filters=None) -> pd.DataFrame:
+        import pyarrow.parquet as pq
+        return _from_arrow(pq.read_table(self.paths[table], columns=columns, filters=filters))
+
+    def columns(self, table: str) -> List[str]:
+        if self._streamable(table):
+            import pyarrow.parquet as pq
+            return [c for c in pq.read_schema(self.paths[table]).names if c != SEQ_COLUMN]
+        return super().columns(table)
+
+    def count(self, table: str) -> int:
+        if self._streamable(table):
+            import pyarrow.parquet as pq
+            return pq.ParquetFile(self.paths[table]).metadata.num_rows
+        return len(self._frame(table))
+
+    def job_ids(self, table: str) -> Set[str]:
+        if self._streamable(table):
+            return set(self._read(table, ["job_id"])["job_id"])
+        return super().job_ids(table)
+
+    def read_frame(self, table: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        if columns and self._streamable(table) and not self._patches.get(table):
+            return self._read(table, columns)
+        return super().read_frame(table, columns)
+
+    def apply_candidates(self, statuses: List[str], columns: Optional[List[str]] = None,
+                         sample: Optional[int] = None) -> pd.DataFrame:
+        if not self._streamable("filtered_jobs"):
+            return super().apply_candidates(statuses, columns, sample)
+        columns = columns or CANDIDATE_COLUMNS
+        patch = self._patches.get("filtered_jobs", {})
+        wanted = [s.capitalize() for s in statuses]
+        # stored values are clean (_clean_frame), so exact predicates are enough;
+        # patched rows are re-checked below whatever their stored status
+        predicate = [("apply_text", "=", EASY_APPLY)]
+        df = self._read("filtered_jobs", list(dict.fromkeys([*columns, "job_id", "status"])),
+                        filters=predicate + [("status", "in", wanted)] if not patch else predicate)
+        if patch:
+            hit = df["job_id"].isin(patch.keys())
+            df.loc[hit, "status"] = df.loc[hit, "job_id"].map(patch)
+            df = df[df["status"].isin(wanted)]
+        df = df[columns].reset_index(drop=True)
+        available = len(df)
+        if sample is not None and sample < available:
+            df = df.sample(n=sample).reset_index(drop=True)
+        df.attrs["available"] = available
+        return df
+
+    def iter_apply_candidates(self, statuses: List[str], columns: Optional[List[str]] = None):
+        if not self._streamable("filtered_jobs"):
+            yield from super().iter_apply_candidates(statuses, columns)
+            return
+        import pyarrow.parquet as pq
+        columns = columns or CANDIDATE_COLUMNS
+        patch = self._patches.get("filtered_jobs", {})
+        wanted = [s.capitalize() for s in statuses]
+        read = list(dict.fromkeys([*columns, "job_id", "status", "apply_text"]))
+        for batch in pq.ParquetFile(self.paths["filtered_jobs"]).iter_batches(CHUNK_ROWS, columns=read):
+            df = _from_arrow(batch)
+            if patch:
+                hit = df["job_id"].isin(patch.keys())
+                df.loc[hit, "status"] = df.loc[hit, "job_id"].map(patch)
+            df = df[(df["apply_text"] == EASY_APPLY) & df["status"].isin(wanted)]
+            yield df[columns].reset_index(drop=True)
+
+    def upsert(self, table: str, df: pd.DataFrame, update_columns: Iterable[str] = ()) -> int:
+        if df.empty:
+            return 0
+        return super().upsert(table, _clean_frame(df), update_columns)
+
+    def mark_status(self, table: str, job_ids: Iterable[str], status: str) -> int:
+        job_ids = set(job_ids)
+        if not self._streamable(table):
+            return super().mark_status(table, job_ids, status)
+        if not job_ids:
+            return 0
+        patch = self._patches.setdefault(table, {})
+        hit = self._read(table, ["job_id", "status"], filters=[("job_id", "in", list(job_ids))])
+        current = hit["job_id"].map(patch).fillna(hit["status"])
+        changed = hit.loc[current != status, "job_id"]
+        for job_id in changed:
+            patch[job_id] = status
+        return len(changed)
+
+    def import_csv(self, table: str, csv_file: str) -> int:
+        return self.upsert(table, pd.read_csv(csv_file))
+
+    def export_csv(self, table: str, csv_file: str) -> int:
+        # the CSVs are artifacts here, not the store: no SEQ_COLUMN
+        df = sort_by_status(self.read_frame(table))
+        df.to_csv(csv_file, index=False)
+        return len(df)
+
+    def _write(self, table: str):
+        import pyarrow.parquet as pq
+        path = self.paths[table]
+        tmp = f"{path}.tmp"
+        pq.write_table(_to_arrow(self._frames[table]), tmp, compression="zstd")
+        os.replace(tmp, path)
+
+    def flush(self):
+        """Fold pending status patches in and rewrite every changed table."""
+        for table, patch in list(self._patches.items()):
+            if patch:
+                self._frame(table)  # loading applies the patch and marks the table dirty
+        self._patches.clear()
+        for table in self._dirty:
+            self._write(table)
+        self._dirty.clear()
+
+
+def open_store(kind: str, store_path: str, csv_files: Dict[str, str]):
+    """``kind`` is "sqlite" (default system of record), "parquet" or "csv" (legacy).
+
+    ``store_path`` is the database file for sqlite and a directory for parquet.
+    """
+    if kind == "csv":
+        return CsvJobStore(csv_files)
+    if kind == "parquet":
+        return ParquetJobStore(store_path, csv_files)
+    return SqliteJobStore(store_path, csv_files)
+
+# ── CLI ──────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Import/export the job store.")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("--config", default=SCRAPER_CONFIG)
+    args = parser.parse_args()
+
+    paths = load_settings(scraper_path=args.config).paths
+    csv_files = {"jobs": paths.jobs_csv, "filtered_jobs": paths.filtered_csv}
+    kind = paths.storage
+    if kind == "csv":
+        print(f"[{args.command.upper()}] storage is csv: the CSVs are the store, nothing to do")
+        return
+    store = open_store(kind, paths.store_path, {})
+    try:
+        for table, csv_file in csv_files.items():
+            if args.command == "export":
+                n = store.export_csv(table, csv_file)
+                print(f"[EXPORT] {table}: {n} row(s) → {csv_file}")
+            elif os.path.exists(csv_file):
+                n = store.import_csv(table, csv_file)
+                print(f"[IMPORT] {table}: {n} new row(s) from {csv_file}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""Mine the output/logs history: query yield, page depth, FOUND cadence, apply outcomes.
+
+    python src/log_report.py [--since 2025-06-01] [--json output/log_report.json] [--rebuild]
+
+Each log is streamed line by line once and reduced to a small per-file
+summary, cached in ``log_index_file`` keyed by file name, size and mtime, so
+a re-run only parses logs that are new or have changed since the last one.
+"""
+import argparse
+import json
+import logging
+import os
+import re
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from metrics import DEFAULT_BUCKETS
+from settings import SCRAPER_CONFIG, load_settings
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+TS_FORMAT = "%Y-%m-%d %H:%M:%S,%f"
+# "%(asctime)s - %(levelname)s - %(message)s" and the older "%(asctime)s [%(levelname)s] %(message)s"
+LINE_RE = re.compile(r"^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3}) (?:- [A-Z]+ - |\[[A-Z]+\] )(.*)$")
+FILE_RE = re.compile(r"^(?P<name>.+?)_(?P<ts>\d{8}_\d{6})\.log$")
+
+QUERY_RE = re.compile(r"^Query: (.*) \| Page: (\d+)$")
+FOUND_PREFIX = "[+] FOUND"
+APPLIED_PREFIX = "APPLIED: "
+SKIPPED_PREFIX = "SKIPPED (already applied): "
+# message prefix -> failure reason, first match wins
+FAILURE_RES = (
+    (re.compile(r"^Cannot click apply-button-wc "), "apply_button"),
+    (re.compile(r"^\[ERROR\] Cannot click (\w+) NEXT button "), "{}_next_button"),
+    (re.compile(r"^FAILED to apply for "), "exception"),
+)
+WARNING_RES = (
+    (re.compile(r"^Could not check application status "), "apply_state"),
+    (re.compile(r"^No confirmation after final NEXT "), "no_confirmation"),
+)
+
+# ── Parsing ──────────────────────────────────────────────────────
+
+def log_kind(name: str) -> str:
+    """``scrape`` or ``apply`` from the log's file name (dice_scraper_..., stealth_apply_job_bot_...)."""
+    return "apply" if "apply" in name else "scrape"
+
+
+def _parse_ts(text: str) -> datetime:
+    return datetime.strptime(text, TS_FORMAT)
+
+
+def _bucket(value: float) -> int:
+    for i, bound in enumerate(DEFAULT_BUCKETS):
+        if value <= bound:
+            return i
+    return len(DEFAULT_BUCKETS)
+
+
+def parse_log(path: Path) -> dict:
+    """One streaming pass over a log file, reduced to counts that can be summed across files.
+
+    FOUND lines are credited to the most recent ``Query: X | Page: N`` line
+    (``yields`` keeps that per-page sequence for the query scheduler's replay);
+    gaps between consecutive FOUND lines are kept as bucket counts (the
+    buckets of ``metrics.DEFAULT_BUCKETS``) so the index stays small.
+    """
+    queries: Dict[str, Dict[str, int]] = {}
+    depth: Dict[str, Dict[str, int]] = {}
+    yields: Dict[str, List[int]] = {}  # query -> jobs found on page 1, 2, ... in its last run
+    gaps = [0] * (len(DEFAULT_BUCKETS) + 1)
+    gap_total = gap_max = 0.0
+    failures, warnings = Counter(), Counter()
+    applied = skipped = lines = 0
+    first_ts = last_ts = None
+    current = None  # (query stats, depth stats, yields) of the page being scraped
+    last_found: Optional[datetime] = None
+
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            match = LINE_RE.match(line)
+            if not match:
+                continue  # stack traces and other continuation lines
+            lines += 1
+            ts, msg = match.group(1), match.group(2).rstrip()
+            if first_ts is None:
+                first_ts = ts
+            last_ts = ts
+
+            if msg.startswith(FOUND_PREFIX):
+                if current:
+                    current[0]["found"] += 1
+                    current[1]["found"] += 1
+                    current[2][-1] += 1
+                now = _parse_ts(ts)
+                if last_found is not None:
+                    gap = (now - last_found).total_seconds()
+                    gaps[_bucket(gap)] += 1
+                    gap_total += gap
+                    gap_max = max(gap_max, gap)
+                last_found = now
+                continue
+
+            query = QUERY_RE.match(msg)
+            if query:
+                q = queries.setdefault(query.group(1), {"runs": 0, "pages": 0, "found": 0})
+                page = query.group(2)
+                if page == "1":
+                    q["runs"] += 1
+                    yields[query.group(1)] = []
+                pages = yields.setdefault(query.group(1), [])
+                pages.append(0)
+                q["pages"] += 1
+                d = depth.setdefault(page, {"pages": 0, "found": 0})
+                d["pages"] += 1
+                current = (q, d, pages)
+                continue
+
+            if msg.startswith(APPLIED_PREFIX):
+                applied += 1
+            elif msg.startswith(SKIPPED_PREFIX):
+                skipped += 1
+            else:
+                for regex, reason in FAILURE_RES:
+                    hit = regex.match(msg)
+                    if hit:
+                        failures[reason.format(*hit.groups())] += 1
+                        break
+                else:
+                    for regex, reason in WARNING_RES:
+                        if regex.match(msg):
+                            warnings[reason] += 1
+                            break
+
+    duration = (_parse_ts(last_ts) - _parse_ts(first_ts)).total_seconds() if first_ts else 0.0
+    return {
+        "kind": log_kind(path.name),
+        "started": first_ts[:19] if first_ts else None,
+        "duration_s": round(duration, 3),
+        "lines": lines,
+        "queries": queries,
+        "depth": depth,
+        "yields": yields,
+        "found_gaps": {"counts": gaps, "total": round(gap_total, 3), "max": round(gap_max, 3)},
+        "apply": {"applied": applied, "skipped": skipped,
+                  "failures": dict(failures), "warnings": dict(warnings)},
+    }
+
+# ── Index ────────────────────────────────────────────────────────
+
+def load_index(path: Path) -> dict:
+    if path.exists():
+        try:
+            index = json.loads(path.read_text())
+            if index.get("version") == INDEX_VERSION:
+                return index
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Ignoring unreadable log index {path}: {exc}")
+    return {"version": INDEX_VERSION, "files": {}}
+
+
+def save_index(path: Path, index: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(index, separators=(",", ":")))
+    os.replace(tmp, path)
+
+
+def refresh_index(log_dir: Path, index: dict) -> Counter:
+    """Parse logs that are new or changed since they were indexed; forget deleted ones."""
+    files = index["files"]
+    seen, stats = set(), Counter()
+    for path in sorted(log_dir.glob("*.log")):
+        st = path.stat()
+        seen.add(path.name)
+        entry = files.get(path.name)
+        if entry and entry["size"] == st.st_size and entry["mtime"] == st.st_mtime:
+            stats["cached"] += 1
+            continue
+        files[path.name] = {"size": st.st_size, "mtime": st.st_mtime, "summary": parse_log(path)}
+        stats["parsed"] += 1
+    for name in set(files) - seen:
+        del files[name]
+        stats["dropped"] += 1
+    return stats
+
+# ── Report ───────────────────────────────────────────────────────
+
+def _bucket_percentile(counts, q: float) -> Optional[str]:
+    """Upper bound of the bucket holding the q-th percentile gap."""
+    total = sum(counts)
+    if not total:
+        return None
+    target, seen = q / 100 * total, 0
+    labels = [f"<={b:g}s" for b in DEFAULT_BUCKETS] + [f">{DEFAULT_BUCKETS[-1]:g}s"]
+    for label, n in zip(labels, counts):
+        seen += n
+        if seen >= target:
+            return label
+    return labels[-1]
+
+
+def build_report(summaries: Iterable[dict]) -> dict:
+    """Sum per-file summaries into the cross-run report."""
+    queries: Dict[str, Counter] = {}
+    depth: Dict[int, Counter] = {}
+    gaps = [0] * (len(DEFAULT_BUCKETS) + 1)
+    gap_total, gap_max = 0.0, 0.0
+    outcomes, failures, warnings = Counter(), Counter(), Counter()
+    runs: Dict[str, list] = {}
+
+    for s in summaries:
+        runs.setdefault(s["kind"], []).append(s["duration_s"])
+        for q, row in s["queries"].items():
+            queries.setdefault(q, Counter()).update(row)
+        for page, row in s["depth"].items():
+            depth.setdefault(int(page), Counter()).update(row)
+        g = s["found_gaps"]
+        gaps = [a + b for a, b in zip(gaps, g["counts"])]
+        gap_total += g["total"]
+        gap_max = max(gap_max, g["max"])
+        a = s["apply"]
+        outcomes.update({"applied": a["applied"], "skipped": a["skipped"]})
+        failures.update(a["failures"])
+        warnings.update(a["warnings"])
+
+    failed = sum(failures.values())
+    attempted = outcomes["applied"] + failed
+    n_gaps = sum(gaps)
+    return {
+        "queries": {
+            q: {**row, "found_per_page": round(row["found"] / max(1, row["pages"]), 3),
+                "found_per_run": round(row["found"] / max(1, row["runs"]), 3)}
+            for q, row in sorted(queries.items(), key=lambda kv: -kv[1]["found"])
+        },
+        "page_depth": {
+            page: {**row, "found_per_page": round(row["found"] / max(1, row["pages"]), 3)}
+            for page, row in sorted(depth.items())
+        },
+        "found_gaps": {
+            "count": n_gaps,
+            "mean_s": round(gap_total / n_gaps, 3) if n_gaps else None,
+            "p50": _bucket_percentile(gaps, 50),
+            "p95": _bucket_percentile(gaps, 95),
+            "max_s": gap_max,
+        },
+        "apply": {
+            "applied": outcomes["applied"],
+            "skipped": outcomes["skipped"],
+            "failed": failed,
+            "success_rate": round(outcomes["applied"] / attempted, 3) if attempted else None,
+            "failures": {
+                reason: {"count": n, "share": round(n / attempted, 3)}
+                for reason, n in failures.most_common()
+            },
+            "warnings": dict(warnings.most_common()),
+        },
+        "runs": {
+            kind: {"count": len(d), "total_s": round(sum(d), 1),
+                   "mean_s": round(sum(d) / len(d), 1), "max_s": round(max(d), 1)}
+            for kind, d in sorted(runs.items())
+        },
+    }
+
+
+def _in_range(name: str, since: Optional[str]) -> bool:
+    if not since:
+        return True
+    match = FILE_RE.match(name)
+    return bool(match) and match.group("ts")[:8] >= since.replace("-", "")
+
+
+def print_report(report: dict, top: int):
+    print("[SUMMARY] Runs: " + ", ".join(
+        f"{kind} {r['count']} (mean {r['mean_s']:.0f}s, max {r['max_s']:.0f}s)"
+        for kind, r in report["runs"].items()))
+
+    print(f"\n[QUERIES] top {top} by jobs found")
+    for q, r in list(report["queries"].items())[:top]:
+        print(f"  {q:<36} runs {r['runs']:>4}  pages {r['pages']:>5}  found {r['found']:>5}  "
+              f"per page {r['found_per_page']:.2f}")
+    dead = [q for q, r in report["queries"].items() if not r["found"]]
+    if dead:
+        print(f"  no jobs ever found: {', '.join(dead)}")
+
+    print("\n[DEPTH] jobs found per page visited")
+    for page, r in report["page_depth"].items():
+        print(f"  page {page:>3}: visited {r['pages']:>5}  found {r['found']:>5}  per page {r['found_per_page']:.2f}")
+
+    g = report["found_gaps"]
+    if g["count"]:
+        print(f"\n[FOUND] {g['count']} gap(s) between FOUND lines: mean {g['mean_s']}s, "
+              f"p50 {g['p50']}, p95 {g['p95']}, max {g['max_s']}s")
+
+    a = report["apply"]
+    rate = f"{a['success_rate']:.1%}" if a["success_rate"] is not None else "n/a"
+    print(f"\n[APPLY] applied {a['applied']}, failed {a['failed']}, skipped {a['skipped']} — success rate {rate}")
+    for reason, r in a["failures"].items():
+        print(f"  failed at {reason:<20} {r['count']:>5}  ({r['share']:.1%} of attempts)")
+    for reason, n in a["warnings"].items():
+        print(f"  warning  {reason:<20} {n:>5}")
+
+# ── Main ─────────────────────────────────────────────────────────
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default=SCRAPER_CONFIG)
+    parser.add_argument("--since", help="only logs started on or after YYYY-MM-DD")
+    parser.add_argument("--top", type=int, default=15, help="queries to list")
+    parser.add_argument("--json", dest="json_out", help="also write the full report here")
+    parser.add_argument("--rebuild", action="store_true", help="ignore the cached index and re-parse every log")
+    args = parser.parse_args(argv)
+
+    paths = load_settings(scraper_path=args.config).paths
+    log_dir = Path(paths.log_dir)
+    index_path = Path(paths.log_index_file)
+
+    index = {"version": INDEX_VERSION, "files": {}} if args.rebuild else load_index(index_path)
+    stats = refresh_index(log_dir, index)
+    if stats["parsed"] or stats["dropped"] or args.rebuild:
+        save_index(index_path, index)
+    print(f"[INFO] {stats['parsed']} log(s) parsed, {stats['cached']} from the index ({index_path})")
+
+    report = build_report(
+        entry["summary"] for name, entry in sorted(index["files"].items()) if _in_range(name, args.since)
+    )
+    print_report(report, args.top)
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2))
+        print(f"\n[INFO] Report written to {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
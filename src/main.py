@@ -1,49 +1,119 @@
 # main.py
-from stealth_scraper import main as run_scraper
+from job_store import open_store
+from metrics import METRICS
+from near_dup import index_relevant_jobs
+from relevance import TitleMatcher
+from settings import Settings, get_settings
+import argparse
 import json
-import pandas as pd
 import os
-import yaml
+from typing import List, Optional
 
-def load_config(path="config/scraper_config.yaml"):
-    with open(path, "r") as f:
-        return yaml.safe_load(f)
+def load_filter_state(path):
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            return json.load(f)
+    return {}
 
-def filter_relevant_jobs(config):
-    input_csv = config["main_csv_file"]
-    output_csv = config["filtered_csv_file"]
+def save_filter_state(path, state):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
 
-    with open("relevant_titles.json", "r") as f:
-        relevant_titles = json.load(f)["titles"]
+def filter_relevant_jobs(settings: Settings, full_rebuild=False):
+    """Classify only the rows scraped since the last run (the filter cursor).
 
-    df_new = pd.read_csv(input_csv)
-    mask = df_new["title"].fillna("").str.lower().apply(
-        lambda title: any(keyword in title for keyword in relevant_titles)
+    A full pass happens on ``full_rebuild``, on first run, or when the
+    relevant_titles.json keyword hash or the storage kind has changed.
+    """
+    paths = settings.paths
+    output_csv = paths.filtered_csv
+    storage = paths.storage
+    state_file = paths.filter_state_file
+    store = open_store(
+        storage,
+        paths.store_path,
+        {"jobs": paths.jobs_csv, "filtered_jobs": output_csv},
     )
-    df_filtered = df_new[mask]
 
-    if os.path.exists(output_csv):
-        df_old = pd.read_csv(output_csv)
-        existing_links = set(zip(df_old["link"], df_old.get("date_posted", pd.Series([""] * len(df_old)))))
-        df_combined = pd.concat([df_old, df_filtered], ignore_index=True)
-        df_combined = df_combined.drop_duplicates(subset=["link", "date_posted"], keep="first")
-    else:
-        df_combined = df_filtered
-        existing_links = set()
+    matcher = TitleMatcher.from_file("relevant_titles.json")
+    state = load_filter_state(state_file)
+    if state.get("keywords_hash") != matcher.fingerprint or state.get("storage") != storage:
+        if state:
+            print("[FILTERED] relevant_titles.json or storage changed — rebuilding from scratch")
+        full_rebuild = True
+    cursor = 0 if full_rebuild else state.get("cursor", 0)
 
-    if "status" in df_combined.columns:
-        df_combined["status"] = pd.Categorical(df_combined["status"], categories=["Pending", "Applied", "Failed"], ordered=True)
-        df_combined = df_combined.sort_values("status")
+    with METRICS.timer("filter.read"):
+        df_new, new_cursor = store.read_since("jobs", cursor)
+    with METRICS.timer("filter.classify"):
+        df_filtered = df_new[matcher.mask(df_new["title"])] if not df_new.empty else df_new
 
-    df_combined.to_csv(output_csv, index=False)
+    existing_ids = store.job_ids("filtered_jobs")
+    with METRICS.timer("merge.filtered_upsert"):
+        store.upsert("filtered_jobs", df_filtered)
+    if full_rebuild:
+        # drop still-Pending rows the current keyword list no longer matches
+        current = store.read_frame("filtered_jobs", ["job_id", "title", "status"])
+        stale = current[~matcher.mask(current["title"]) & (current["status"] == "Pending")]
+        if not stale.empty:
+            store.delete("filtered_jobs", stale["job_id"])
+            print(f"[FILTERED] Removed {len(stale)} pending job(s) no longer matching relevant_titles.json")
+    dup_stats = {}
+    if settings.scrape.near_dup_threshold:
+        with METRICS.timer("filter.near_dup"):
+            dup_stats = index_relevant_jobs(paths.near_dup_index_file, settings.scrape.near_dup_threshold,
+                                            store, df_filtered)
+    with METRICS.timer("merge.store_close"):
+        store.close()
+    save_filter_state(state_file, {"cursor": new_cursor, "keywords_hash": matcher.fingerprint, "storage": storage})
+    METRICS.count("filter.rows", "classified", len(df_new))
+    METRICS.count("filter.rows", "relevant", len(df_filtered))
+    for key, n in dup_stats.items():
+        METRICS.count("filter.near_dup", key, n)
+    METRICS.write_report(paths.metrics_dir, "filter")
+
+    print(f"[FILTERED] Classified {len(df_new)} row(s) {'(full rebuild)' if full_rebuild else f'since cursor {cursor}'}")
+    if dup_stats:
+        print(f"[FILTERED] Near-duplicates: {dup_stats['joined']} of {dup_stats['indexed']} newly indexed "
+              f"job(s) joined an existing cluster")
+    if df_filtered.empty:
+        print(f"[FILTERED] Merged & saved new 0 relevant *pending* jobs to {output_csv}")
+        return
 
     new_pending_jobs = df_filtered[
-        (~df_filtered[["link", "date_posted"]].apply(tuple, axis=1).isin(existing_links)) &
+        (~df_filtered["job_id"].isin(existing_ids)) &
         (df_filtered["status"].str.lower() == "pending")
     ]
     print(f"[FILTERED] Merged & saved new {len(new_pending_jobs)} relevant *pending* jobs to {output_csv}")
+    if not new_pending_jobs.empty:
+        hits = matcher.explain(new_pending_jobs["title"]).value_counts()
+        print("[FILTERED] Matched keywords: " + ", ".join(f"{k} ({n})" for k, n in hits.items()))
+
+def cli(argv: Optional[List[str]] = None, scrape: bool = True):
+    """Scrape then filter; ``scrape=False`` filters only, without loading the scraper."""
+    parser = argparse.ArgumentParser(
+        description="Scrape Dice, filter relevant jobs, then fetch their detail pages." if scrape
+        else "Filter scraped jobs down to relevant titles."
+    )
+    parser.add_argument("--full-rebuild", action="store_true",
+                        help="re-classify every scraped row instead of only rows added since the last run")
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    if scrape:
+        from stealth_scraper import main as run_scraper
+        run_scraper()
+    filter_relevant_jobs(settings, full_rebuild=args.full_rebuild)
+    if scrape and settings.scrape.enrich_details:
+        from job_details import enrich_jobs
+        enrich_jobs(settings)
+
+
+def filter_cli(argv: Optional[List[str]] = None):
+    cli(argv, scrape=False)
+
 
 if __name__ == "__main__":
-    config = load_config()
-    run_scraper()
-    filter_relevant_jobs(config)
+    cli()
@@ -0,0 +1,137 @@
+import bisect
+import functools
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# seconds; a phase's histogram counts samples <= each upper bound (+ overflow)
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (``q`` in 0..100) of a non-empty sample list."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class Histogram:
+    """Bucketed counts plus raw samples (runs are small enough to keep them)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.samples: List[float] = []
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.samples.append(value)
+
+    def summary(self) -> dict:
+        if not self.samples:
+            return {"count": 0}
+        labels = [f"le_{b:g}" for b in self.buckets] + ["overflow"]
+        return {
+            "count": len(self.samples),
+            "total": round(sum(self.samples), 3),
+            "p50": round(percentile(self.samples, 50), 3),
+            "p95": round(percentile(self.samples, 95), 3),
+            "max": round(max(self.samples), 3),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class Metrics:
+    """Thread-safe run metrics: phase timers, labelled counters and per-item records.
+
+        with METRICS.timer("scrape.driver_get"):
+            driver.get(url)
+        METRICS.count("apply.failure", "next_button")
+        METRICS.record("queries", {"query": q, "pages_scanned": 3, "new_jobs": 12})
+        METRICS.write_report("output/metrics", "scrape")
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.histograms: Dict[str, Histogram] = {}
+            self.counters: Dict[str, Counter] = {}
+            self.records: Dict[str, List[dict]] = {}
+            self.started = time.time()
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            self.histograms.setdefault(name, Histogram()).observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name: str):
+        """Decorator form of ``timer``."""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def count(self, name: str, key: str = "total", n: int = 1):
+        with self._lock:
+            self.counters.setdefault(name, Counter())[key] += n
+
+    def record(self, name: str, row: dict):
+        with self._lock:
+            self.records.setdefault(name, []).append(dict(row))
+
+    def report(self, stage: str) -> dict:
+        with self._lock:
+            return {
+                "stage": stage,
+                "started": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+                "duration_s": round(time.time() - self.started, 3),
+                "phases": {name: h.summary() for name, h in sorted(self.histograms.items())},
+                "counters": {name: dict(c) for name, c in sorted(self.counters.items())},
+                "records": {name: list(rows) for name, rows in self.records.items()},
+            }
+
+    def write_report(self, out_dir: str, stage: str) -> Optional[Path]:
+        """Write ``<out_dir>/<stage>_<timestamp>.json`` and start afresh for the next stage.
+
+        A report that cannot be written is logged, never allowed to break a run.
+        """
+        try:
+            path = Path(out_dir) / f"{stage}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.report(stage), indent=2, default=str))
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning(f"Could not write metrics report: {exc}")
+            return None
+        finally:
+            self.reset()
+        logger.info(f"Metrics report written to {path}")
+        return path
+
+
+# process-wide registry the stages share
+METRICS = Metrics()
@@ -0,0 +1,239 @@
+"""Near-duplicate postings: MinHash signatures with an LSH band index.
+
+Staffing firms repost the same requirement under their own GUIDs with
+near-identical titles and descriptions, which the ``job_id`` dedup cannot
+see. Each relevant posting's title + description is cut into word 3-gram
+shingles and summarised by a 64-value MinHash signature. The signature is
+split into 16 bands of 4, and every band is hashed into a key.
+
+Two postings sharing any band key are compared on their full signatures.
+The share of equal values estimates the Jaccard similarity of their
+shingle sets, and at ``threshold`` or above the new posting joins the
+other's cluster. A cluster is named after its first posting.
+
+The index is a small SQLite file. Per posting it holds the 256-byte
+signature plus 16 ``(band key, posting)`` rows under a primary key. A
+lookup is one indexed query, so adding a posting costs the same whatever
+the size of the history:
+
+    index = NearDupIndex("output/near_dup.db")
+    cluster = index.add(job_id, f"{title} {description}")
+    index.close()
+
+The filter stage indexes new relevant rows, and ``cluster_candidates``
+gives the apply stages one job per cluster.
+"""
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+BANDS = 16  # of NUM_PERM // BANDS rows: pairs at Jaccard 0.8 share a band with p > 0.999, at 0.3 with p < 0.13
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 3
+MIN_SHINGLES = 5  # shorter texts (a bare title) are too generic to cluster
+MAX_CANDIDATES = 256  # band matches compared per lookup, so boilerplate-heavy bands stay cheap
+SEED = 20250601  # fixed: signatures must be comparable across runs
+TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+_rng = np.random.default_rng(SEED)
+# multiply-shift hash family on 32-bit shingle hashes: h_i(x) = (a_i * x + b_i) >> 32
+_A = _rng.integers(1, 2**63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+
+# ── Signatures ───────────────────────────────────────────────────
+
+def shingles(text: str) -> set:
+    words = TOKEN_RE.findall(str(text).lower())
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash(text: str) -> Optional[np.ndarray]:
+    """``NUM_PERM`` uint32 MinHash values of ``text``'s shingles, or None if it is too short."""
+    grams = shingles(text)
+    if len(grams) < MIN_SHINGLES:
+        return None
+    hashes = np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams))
+    return ((np.outer(_A, hashes) + _B[:, None]) >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+
+def band_keys(signature: np.ndarray) -> List[int]:
+    """One signed 64-bit key per band (band number included, so bands never collide)."""
+    return [
+        int.from_bytes(hashlib.blake2b(bytes([band]) + rows.tobytes(), digest_size=8).digest(), "little", signed=True)
+        for band, rows in enumerate(signature.reshape(BANDS, ROWS))
+    ]
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+# ── Index ────────────────────────────────────────────────────────
+
+class NearDupIndex:
+    """Persistent job id → cluster map with an LSH band index (SQLite).
+
+    Not thread-safe; the filter and apply stages use it from one thread.
+    """
+
+    def __init__(self, path: str, threshold: float = 0.8):
+        self.path = path
+        self.threshold = threshold
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS postings (
+                    id         INTEGER PRIMARY KEY,
+                    job_id     TEXT NOT NULL UNIQUE,
+                    cluster_id TEXT NOT NULL,
+                    signature  BLOB
+                )""")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS bands (
+                    key     INTEGER NOT NULL,
+                    posting INTEGER NOT NULL,
+                    PRIMARY KEY (key, posting)
+                ) WITHOUT ROWID""")
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+
+    def _match(self, signature: np.ndarray, keys: List[int]) -> Optional[str]:
+        """Cluster of the most similar indexed posting at or above the threshold."""
+        marks = ", ".join("?" for _ in keys)
+        rows = self.conn.execute(
+            f"""SELECT p.cluster_id, p.signature FROM postings p
+                WHERE p.id IN (SELECT DISTINCT posting FROM bands WHERE key IN ({marks}) LIMIT ?)""",
+            [*keys, MAX_CANDIDATES],
+        ).fetchall()
+        best, best_sim = None, self.threshold
+        for cluster_id, blob in rows:
+            sim = similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            if sim >= best_sim:
+                best, best_sim = cluster_id, sim
+        return best
+
+    def _add(self, job_id: str, text: str) -> Tuple[str, bool]:
+        row = self.conn.execute("SELECT cluster_id FROM postings WHERE job_id = ?", (job_id,)).fetchone()
+        if row:
+            return row[0], False
+        signature = minhash(text)
+        if signature is None:
+            self.conn.execute("INSERT INTO postings (job_id, cluster_id) VALUES (?, ?)", (job_id, job_id))
+            return job_id, True
+        keys = band_keys(signature)
+        cluster_id = self._match(signature, keys) or job_id
+        cur = self.conn.execute(
+            "INSERT INTO postings (job_id, cluster_id, signature) VALUES (?, ?, ?)",
+            (job_id, cluster_id, signature.tobytes()),
+        )
+        self.conn.executemany("INSERT OR IGNORE INTO bands (key, posting) VALUES (?, ?)",
+                              [(key, cur.lastrowid) for key in keys])
+        return cluster_id, True
+
+    def add(self, job_id: str, text: str) -> str:
+        """Index one posting (a no-op if already indexed); returns its cluster id."""
+        with self.conn:
+            return self._add(job_id, text)[0]
+
+    def add_many(self, rows: Iterable[Tuple[str, str]]) -> Counter:
+        """Index ``(job_id, text)`` rows in one transaction, in order.
+
+        Counts ``indexed`` (new postings) and ``joined`` (new postings that
+        landed in an existing cluster).
+        """
+        stats = Counter()
+        with self.conn:
+            for job_id, text in rows:
+                cluster_id, new = self._add(job_id, text)
+                stats["indexed"] += new
+                stats["joined"] += new and cluster_id != job_id
+        return stats
+
+    def clusters(self, job_ids: Iterable[str]) -> Dict[str, str]:
+        """job id → cluster id for the indexed ones."""
+        job_ids = list(job_ids)
+        out = {}
+        for start in range(0, len(job_ids), 500):
+            chunk = job_ids[start:start + 500]
+            marks = ", ".join("?" for _ in chunk)
+            out.update(self.conn.execute(
+                f"SELECT job_id, cluster_id FROM postings WHERE job_id IN ({marks})", chunk
+            ).fetchall())
+        return out
+
+    def close(self):
+        self.conn.close()
+
+# ── Stage helpers ────────────────────────────────────────────────
+
+def _texts(df: pd.DataFrame) -> Iterable[Tuple[str, str]]:
+    title = df["title"].fillna("").astype(str)
+    description = df["description"].fillna("").astype(str) if "description" in df.columns else ""
+    return zip(df["job_id"], title + " " + description)
+
+
+def index_relevant_jobs(index_path: str, threshold: float, store, df_new: pd.DataFrame) -> Counter:
+    """Cluster newly filtered rows; an empty index is first filled from the whole of ``filtered_jobs``."""
+    index = NearDupIndex(index_path, threshold)
+    try:
+        if not len(index):
+            df_new = store.read_frame("filtered_jobs")
+        if df_new.empty:
+            return Counter()
+        return index.add_many(_texts(df_new))
+    finally:
+        index.close()
+
+
+def cluster_candidates(store, statuses: List[str], index_path: Optional[str],
+                       sample: Optional[int] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """``store.apply_candidates``, keeping at most one job per near-duplicate cluster.
+
+    Without an index (``index_path`` None or not built yet) this is plain
+    ``store.apply_candidates``.
+
+    Clusters with an Applied member are dropped altogether. Within a
+    cluster a Pending job wins over a Failed one, then the cluster's first
+    posting. ``df.attrs`` carries ``available`` (after dedup) and
+    ``near_duplicates`` (candidates dropped).
+    """
+    if not index_path or not os.path.exists(index_path):
+        df = store.apply_candidates(statuses, columns, sample=sample)
+        df.attrs["near_duplicates"] = 0
+        return df
+    df = store.apply_candidates(statuses, columns)
+    dropped = 0
+    if not df.empty:
+        index = NearDupIndex(index_path)
+        try:
+            clusters = df["job_id"].map(index.clusters(df["job_id"])).fillna(df["job_id"])
+            applied = store.apply_candidates(["applied"], columns=["job_id"])["job_id"]
+            done = set(index.clusters(applied).values())
+        finally:
+            index.close()
+        order = pd.DataFrame({
+            "failed": df["status"].astype(str).str.lower().ne("pending"),
+            "copy": clusters.ne(df["job_id"]),
+        }).sort_values(["failed", "copy"], kind="stable").index
+        keep = ~clusters.loc[order].isin(done) & ~clusters.loc[order].duplicated()
+        dropped = int((~keep).sum())
+        df = df.loc[keep[keep].index].sort_index().reset_index(drop=True)
+    available = len(df)
+    if sample is not None and sample < available:
+        df = df.sample(n=sample).reset_index(drop=True)
+    df.attrs["available"] = available
+    df.attrs["near_duplicates"] = dropped
+    return df
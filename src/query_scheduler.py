@@ -0,0 +1,397 @@
+"""Yield-aware query scheduling: which queries to run, in what order, how deep.
+
+    python src/query_scheduler.py plan [--budget 150]
+    python src/query_scheduler.py simulate [--budget 150] [--since 2025-06-01]
+
+``QueryHistory`` keeps, per query, an EWMA of *fresh* jobs (not in the job
+index before the run) on each result page and its overlap with the other
+queries. ``plan_queries`` turns that into an ordered ``[(query, pages)]``
+that spends a page budget where the next page is expected to find the most
+new jobs. Queries that stop finding anything are sampled less often, never
+dropped. ``simulate`` replays the per-page yields in the scraper logs.
+"""
+import argparse
+import heapq
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from settings import SCRAPER_CONFIG, load_settings
+
+logger = logging.getLogger(__name__)
+
+ALPHA = 0.3  # EWMA weight of the latest run
+PRIOR_WEIGHT = 1.0  # pseudo-observations of the depth-wide mean behind each estimate
+DEFAULT_SECONDS_PER_PAGE = 5.0
+MAX_INTERVAL = 8  # a query that keeps finding nothing still runs every 8th run
+
+Plan = List[Tuple[str, int]]
+
+# ── History ──────────────────────────────────────────────────────
+
+def _ewma(old: Optional[float], value: float) -> float:
+    return value if old is None else (1 - ALPHA) * old + ALPHA * value
+
+
+class QueryHistory:
+    """Per-query yield history, persisted as JSON next to the job index.
+
+    ``queries[q]`` holds ``pages`` (page number -> ``[ewma_fresh, runs]``),
+    ``overlap`` (other query -> EWMA share of q's fresh jobs it also
+    returned), ``idle_runs`` (consecutive runs without a fresh job) and
+    ``since_sampled`` (runs skipped since q last ran).
+    """
+
+    def __init__(self, path: str, data: Optional[dict] = None):
+        self.path = Path(path)
+        data = data or {}
+        self.queries: Dict[str, dict] = data.get("queries", {})
+        self.seconds_per_page: Optional[float] = data.get("seconds_per_page")
+        self.runs: int = data.get("runs", 0)
+
+    @classmethod
+    def load(cls, path: str) -> "QueryHistory":
+        p = Path(path)
+        if p.exists():
+            with open(p, "r") as f:
+                return cls(path, json.load(f))
+        return cls(path)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"runs": self.runs, "seconds_per_page": self.seconds_per_page,
+                       "queries": self.queries}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def _entry(self, query: str) -> dict:
+        return self.queries.setdefault(
+            query, {"pages": {}, "overlap": {}, "idle_runs": 0, "since_sampled": 0, "last_run": None}
+        )
+
+    # -- updates ---------------------------------------------------
+
+    def observe(self, query: str, fresh_per_page: List[int], exhausted: bool = False,
+                overlap: Optional[Dict[str, float]] = None, when: Optional[str] = None):
+        """Fold one run of ``query`` in: fresh jobs on pages 1..n, in order.
+
+        ``exhausted`` means the results ran out after page n, so page n+1 is
+        recorded as a zero-yield page rather than left unknown.
+        """
+        entry = self._entry(query)
+        yields = list(fresh_per_page) + ([0] if exhausted else [])
+        for page, fresh in enumerate(yields, start=1):
+            old, n = entry["pages"].get(str(page), (None, 0))
+            entry["pages"][str(page)] = [round(_ewma(old, fresh), 4), n + 1]
+        for other, share in (overlap or {}).items():
+            entry["overlap"][other] = round(_ewma(entry["overlap"].get(other), share), 4)
+        entry["idle_runs"] = 0 if sum(fresh_per_page) else entry["idle_runs"] + 1
+        entry["since_sampled"] = 0
+        entry["last_run"] = when or datetime.now().isoformat(timespec="seconds")
+
+    def skipped(self, query: str):
+        self._entry(query)["since_sampled"] += 1
+
+    def observe_pace(self, seconds: float, pages: int):
+        if pages:
+            self.seconds_per_page = round(_ewma(self.seconds_per_page, seconds / pages), 3)
+
+    def record_run(self, queries: Iterable[str], query_stats: List[dict], run_new: Set[str]):
+        """Update from a scraper run: ``query_stats`` from ``scrape_query`` (with
+        ``page_ids``) and ``run_new``, every job id first claimed in this run.
+
+        A job counts as fresh for every query that returned it, whichever
+        claimed it first, so the estimates don't depend on the run order.
+        """
+        ran = {s["query"]: s for s in query_stats if s.get("page_ids") is not None}
+        seen = {q: {i for page in s["page_ids"] for i in page} for q, s in ran.items()}
+        for query in queries:
+            stats = ran.get(query)
+            if stats is None:
+                self.skipped(query)
+                continue
+            fresh = seen[query] & run_new
+            overlap = {
+                other: len(fresh & ids) / len(fresh)
+                for other, ids in seen.items() if other != query and fresh
+            }
+            self.observe(
+                query,
+                [len(set(page) & run_new) for page in stats["page_ids"]],
+                exhausted=stats.get("stop_reason") == "no_cards",
+                overlap=overlap,
+            )
+            self.observe_pace(stats.get("seconds", 0.0), len(stats["page_ids"]))
+        self.runs += 1
+
+    # -- estimates -------------------------------------------------
+
+    def depth_prior(self) -> Dict[int, float]:
+        """Mean fresh jobs at each depth over every query observed there."""
+        sums: Dict[int, List[float]] = {}
+        for entry in self.queries.values():
+            for page, (value, _) in entry["pages"].items():
+                sums.setdefault(int(page), []).append(value)
+        return {page: sum(v) / len(v) for page, v in sums.items()}
+
+    def expected(self, query: str, max_pages: int, prior: Optional[Dict[int, float]] = None) -> List[float]:
+        """Expected fresh jobs on pages 1..max_pages, shrunk towards the depth-wide mean.
+
+        The mean is scaled by how the query did against it on the pages it
+        has been seen on, so a thin query isn't credited with the deep pages
+        of broad ones. Unseen queries get the plain mean, so they are explored.
+        """
+        prior = self.depth_prior() if prior is None else prior
+        fallback = sum(prior.values()) / len(prior) if prior else 1.0
+        pages = self.queries.get(query, {}).get("pages", {})
+        own = sum(value for value, _ in pages.values())
+        typical = sum(prior.get(int(page), fallback) for page in pages)
+        scale = (own + 1) / (typical + 1)
+        out = []
+        for page in range(1, max_pages + 1):
+            p = prior.get(page, fallback) * scale
+            value, n = pages.get(str(page), (0.0, 0))
+            out.append((n * value + PRIOR_WEIGHT * p) / (n + PRIOR_WEIGHT))
+        return out
+
+    def due(self, query: str) -> bool:
+        """Back off exponentially on a query that keeps finding nothing: every run,
+        then every 2nd, 4th, ... up to every ``MAX_INTERVAL``-th."""
+        entry = self.queries.get(query)
+        if not entry or entry["idle_runs"] < 2:
+            return True
+        interval = min(MAX_INTERVAL, 2 ** (entry["idle_runs"] - 1))
+        return entry["since_sampled"] + 1 >= interval
+
+# ── Planning ─────────────────────────────────────────────────────
+
+def _best_extension(gains: List[float], start: int, limit: int) -> Tuple[float, int]:
+    """Best mean gain per page over extending a query from ``start`` pages to
+    any ``k <= limit``; looking ahead lets a deep, productive page pay for
+    thin pages before it."""
+    best, best_k, total = 0.0, start, 0.0
+    for k in range(start + 1, limit + 1):
+        total += gains[k - 1]
+        rate = total / (k - start)
+        if rate > best:
+            best, best_k = rate, k
+    return best, best_k
+
+
+def _kept_share(history: QueryHistory, query: str, earlier: List[str]) -> float:
+    """Share of ``query``'s fresh jobs expected to be left after ``earlier`` ran."""
+    overlap = history.queries.get(query, {}).get("overlap", {})
+    keep = 1.0
+    for other in earlier:
+        keep *= 1 - overlap.get(other, 0.0)
+    return keep
+
+
+def plan_queries(queries: List[str], history: QueryHistory, max_pages: int,
+                 page_budget: int = 0) -> Tuple[Plan, List[str]]:
+    """Order and budget ``queries``; returns ``(plan, skipped)``.
+
+    Queries not due (see ``QueryHistory.due``) are skipped this run. The
+    rest are ordered greedily by expected fresh jobs, discounted by their
+    overlap with the queries already ahead of them. Each gets one page. The
+    remaining budget goes, page run by page run, to whichever query has the
+    highest expected yield per page. ``page_budget <= 0`` means no budget:
+    every due query gets ``max_pages``.
+    """
+    due = [q for q in queries if history.due(q)]
+    skipped = [q for q in queries if q not in due]
+    prior = history.depth_prior()
+    base = {q: history.expected(q, max_pages, prior) for q in due}
+
+    # order: most expected fresh jobs first, net of overlap with earlier queries
+    order: List[str] = []
+    discount: Dict[str, float] = {}
+    remaining = list(due)
+    while remaining:
+        kept = {q: _kept_share(history, q, order) for q in remaining}
+        nxt = max(remaining, key=lambda q: (sum(base[q]) * kept[q], -queries.index(q)))
+        order.append(nxt)
+        discount[nxt] = kept[nxt]
+        remaining.remove(nxt)
+
+    if page_budget <= 0:
+        return [(q, max_pages) for q in order], skipped
+
+    alloc = {q: 0 for q in order}
+    budget = page_budget
+    for q in order[:budget]:  # every due query gets at least its first page
+        alloc[q] = 1
+        budget -= 1
+
+    gains = {q: [g * discount[q] for g in base[q]] for q in order}
+    heap = []
+    for q in order:
+        if alloc[q]:
+            rate, k = _best_extension(gains[q], alloc[q], min(max_pages, alloc[q] + budget))
+            if k > alloc[q]:
+                heapq.heappush(heap, (-rate, order.index(q), q, k))
+    while heap and budget > 0:
+        _, _, q, k = heapq.heappop(heap)
+        k = min(k, alloc[q] + budget)
+        budget -= k - alloc[q]
+        alloc[q] = k
+        rate, k = _best_extension(gains[q], alloc[q], min(max_pages, alloc[q] + budget))
+        if k > alloc[q]:
+            heapq.heappush(heap, (-rate, order.index(q), q, k))
+
+    plan = [(q, alloc[q]) for q in order if alloc[q]]
+    skipped += [q for q in order if not alloc[q]]
+    return plan, skipped
+
+
+class PageBudget:
+    """Hands out a plan's page allowances while the run is in progress.
+
+    A query that stops early (no new jobs, no more results, a timeout) hands
+    back the pages it didn't use, and a later query gets them on top of its
+    own share, up to ``max_pages``. Thread-safe for scraper workers, and
+    independent of their timing: grants go out in plan order, and the query
+    ``workers`` places down the plan waits for this one to settle and gets
+    its unused pages. With one worker that is simply the next query.
+    """
+
+    def __init__(self, plan: Plan, max_pages: int, workers: int = 1):
+        self.order = {q: i for i, (q, _) in enumerate(plan)}
+        self.planned = dict(plan)
+        self.max_pages = max_pages
+        self.workers = max(1, workers)
+        self.spare = 0
+        self.granted = 0  # queries granted so far, in plan order
+        self.unused: Dict[int, int] = {}  # plan position -> pages handed back
+        self._cond = threading.Condition()
+
+    def grant(self, query: str) -> int:
+        pos, lag = self.order[query], self.order[query] - self.workers
+        with self._cond:
+            self._cond.wait_for(lambda: self.granted == pos and (lag < 0 or lag in self.unused))
+            if lag >= 0:
+                self.spare += self.unused[lag]
+            pages = min(self.max_pages, self.planned[query] + self.spare)
+            self.spare -= max(0, pages - self.planned[query])
+            self.granted += 1
+            self._cond.notify_all()
+            return pages
+
+    def settle(self, query: str, granted: int, used: int):
+        with self._cond:
+            self.unused[self.order[query]] = max(0, granted - used)
+            self._cond.notify_all()
+
+
+def page_budget(pages: int, seconds: float, history: QueryHistory) -> int:
+    """Pages this run may fetch: ``pages``, and/or ``seconds`` at the measured pace (0 = no limit)."""
+    limits = [int(pages)] if pages else []
+    if seconds:
+        pace = history.seconds_per_page or DEFAULT_SECONDS_PER_PAGE
+        limits.append(max(1, int(seconds / pace)))
+    return min(limits) if limits else 0
+
+# ── Offline replay ───────────────────────────────────────────────
+
+def replay_runs(summaries: List[dict]) -> List[Dict[str, List[int]]]:
+    """Per-run ``{query: [found on page 1, 2, ...]}`` from log_report summaries, oldest first."""
+    return [s["yields"] for s in summaries if s["kind"] == "scrape" and s.get("yields")]
+
+
+def simulate(runs: List[Dict[str, List[int]]], queries: List[str], max_pages: int, budget: int) -> dict:
+    """Replay logged yields under a page budget: the scheduler (learning only
+    from the pages it chose to fetch) vs. the file order with ``max_pages``
+    each until the budget runs out.
+
+    A page the original run never reached (early stop, timeout) ends the
+    query, and its unused pages pass on as in a live run (``PageBudget``).
+    Logged FOUND counts already exclude jobs an earlier query claimed, so
+    overlap is not modelled in the replay.
+    """
+    history = QueryHistory(os.devnull)
+    totals = {"scheduled": [0, 0], "file_order": [0, 0], "unlimited": [0, 0]}
+
+    for run in runs:
+        names = [q for q in queries if q in run] + [q for q in run if q not in queries]
+
+        plan, skipped = plan_queries(names, history, max_pages, budget)
+        pages = PageBudget(plan, max_pages)
+        for q, _ in plan:
+            granted = pages.grant(q)
+            got = run[q][:granted]
+            pages.settle(q, granted, len(got))
+            history.observe(q, got, exhausted=len(run[q]) < granted)
+            totals["scheduled"][0] += len(got)
+            totals["scheduled"][1] += sum(got)
+        for q in skipped:
+            history.skipped(q)
+
+        left = budget
+        for q in names:
+            got = run[q][:min(max_pages, left)]
+            left -= len(got)
+            totals["file_order"][0] += len(got)
+            totals["file_order"][1] += sum(got)
+            if left <= 0:
+                break
+
+        for q in names:
+            totals["unlimited"][0] += len(run[q][:max_pages])
+            totals["unlimited"][1] += sum(run[q][:max_pages])
+
+    result = {
+        name: {"pages": pages, "found": found, "found_per_page": round(found / max(1, pages), 3)}
+        for name, (pages, found) in totals.items()
+    }
+    return {**result, "runs": len(runs), "budget": budget}
+
+# ── CLI ──────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["plan", "simulate"])
+    parser.add_argument("--config", default=SCRAPER_CONFIG)
+    parser.add_argument("--budget", type=int, help="pages per run (default: query_page_budget)")
+    parser.add_argument("--since", help="simulate: only logs started on or after YYYY-MM-DD")
+    args = parser.parse_args()
+
+    settings = load_settings(scraper_path=args.config)
+    with open(settings.paths.query_file, "r") as f:
+        queries = [q.strip() for q in f if q.strip()]
+    max_pages = settings.scrape.max_pages
+    budget = args.budget if args.budget is not None else settings.perf.query_page_budget
+
+    if args.command == "plan":
+        history = QueryHistory.load(settings.paths.query_history_file)
+        budget = page_budget(budget, settings.perf.query_time_budget, history)
+        plan, skipped = plan_queries(queries, history, max_pages, budget)
+        for q, pages in plan:
+            print(f"[SCHEDULE] {q:<40} {pages:>3} page(s)")
+        print(f"[SUMMARY] {sum(p for _, p in plan)} page(s) over {len(plan)} queries, "
+              f"skipped {len(skipped)}: {', '.join(skipped) or '-'}")
+        return
+
+    from log_report import _in_range, load_index, refresh_index, save_index
+
+    index_path = Path(settings.paths.log_index_file)
+    index = load_index(index_path)
+    if refresh_index(Path(settings.paths.log_dir), index)["parsed"]:
+        save_index(index_path, index)
+    runs = replay_runs([e["summary"] for name, e in sorted(index["files"].items())
+                        if _in_range(name, args.since)])
+    if not budget:
+        budget = max_pages * len(queries) // 4
+    result = simulate(runs, queries, max_pages, budget)
+    print(f"[SIMULATE] {result['runs']} logged scrape run(s), budget {budget} page(s) per run")
+    for name in ("unlimited", "file_order", "scheduled"):
+        r = result[name]
+        print(f"  {name:<11} pages {r['pages']:>6}  found {r['found']:>6}  per page {r['found_per_page']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import hashlib
+import json
+import re
+from typing import List
+
+import pandas as pd
+
+# a keyword counts only as a whole word (optionally plural): "ml" matches
+# "ML Engineer" and "AI/ML" but not "HTML", "rag" not "Storage"
+BOUNDARY = r"(?:^|[^a-z0-9])"
+TAIL = r"s?(?:$|[^a-z0-9])"
+
+
+class TitleMatcher:
+    """All relevant-title keywords compiled into one alternation regex.
+
+    Applied through vectorised ``str.contains`` / ``str.extract`` instead of a
+    per-row Python loop over every keyword.
+    """
+
+    def __init__(self, keywords: List[str]):
+        # dedupe, longest first so the reported match is the most specific one
+        self.keywords = sorted({k.strip().lower() for k in keywords if k.strip()}, key=lambda k: (-len(k), k))
+        alternation = "|".join(re.escape(k) for k in self.keywords)
+        self.pattern = re.compile(f"{BOUNDARY}(?:{alternation}){TAIL}")
+        self._capture = re.compile(f"{BOUNDARY}({alternation}){TAIL}")
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the keyword list; changes whenever relevant_titles.json does."""
+        return hashlib.sha256("\n".join(sorted(self.keywords)).encode()).hexdigest()[:16]
+
+    @classmethod
+    def from_file(cls, path: str = "relevant_titles.json") -> "TitleMatcher":
+        with open(path, "r") as f:
+            return cls(json.load(f)["titles"])
+
+    def _lower(self, titles: pd.Series) -> pd.Series:
+        return titles.fillna("").astype(str).str.lower()
+
+    def mask(self, titles: pd.Series) -> pd.Series:
+        """Boolean Series: does each title contain a relevant keyword?"""
+        return self._lower(titles).str.contains(self.pattern, regex=True)
+
+    def explain(self, titles: pd.Series) -> pd.Series:
+        """The keyword that made each title relevant (NaN when none matched)."""
+        return self._lower(titles).str.extract(self._capture, expand=False)
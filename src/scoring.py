@@ -0,0 +1,265 @@
+"""Relevance scores: hashed n-gram TF-IDF similarity of each posting to a profile.
+
+The filter stage only says whether a title contains a relevant keyword, so
+every Pending job looks equally good. Here each posting's text becomes a
+row of a sparse matrix: the title (counted twice), description, and the
+full description and skills when the enrich stage has fetched them. Its
+terms are word 1- and 2-grams, hashed into ``n_features`` columns with
+``HashingVectorizer``, so there is no vocabulary to fit.
+
+The rows are TF-IDF weighted and L2-normalised. The profile
+(``profile.txt``: a description of the job you want) gets the same
+treatment, and candidates are scored by sparse matrix-vector products,
+a batch of rows at a time. Scores are cosine similarities in [0, 1].
+
+Raw term weights are cached per job id in one ``.npz`` file together with
+a checksum of the text. A run only vectorises new postings and those whose
+text changed, such as rows the enrich stage has since filled in. IDF
+weights come from every cached row, so they are never refitted from
+scratch:
+
+    scorer = JobScorer.from_settings(settings)
+    scores = scorer.score(df)          # aligned with df
+    scorer.save()
+"""
+import heapq
+import logging
+import os
+import zlib
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from job_store import CANDIDATE_COLUMNS
+from near_dup import cluster_candidates
+from settings import Settings
+
+logger = logging.getLogger(__name__)
+
+TEXT_COLUMNS = ["title", "description", "full_description", "skills"]
+NGRAMS = (1, 2)
+TOKEN_PATTERN = r"(?u)\b\w[\w+#]*"  # keeps c++, c#, single letters (R, C)
+MAX_ROWS = 50_000  # cached postings kept: all those scored this run, then the newest
+SCORE_ROWS = 5_000  # cached rows weighted and normalised at a time
+
+
+def job_texts(df: pd.DataFrame) -> pd.Series:
+    """Title (twice, as the strongest signal) + whatever description text the row has."""
+    text = pd.Series("", index=df.index, dtype=object)
+    for col in TEXT_COLUMNS:
+        if col in df.columns:
+            part = df[col].fillna("").astype(str)
+            text = text + " " + part + (" " + part if col == "title" else "")
+    return text
+
+
+def read_profile(path: str) -> str:
+    """The profile text, without ``#`` comment lines; empty if the file is missing."""
+    if not os.path.exists(path):
+        return ""
+    with open(path, "r") as f:
+        return " ".join(line.strip() for line in f if not line.lstrip().startswith("#")).strip()
+
+
+class JobScorer:
+    """Hashed TF-IDF vectors per job id, cached on disk, scored against one profile.
+
+    Not thread-safe; the apply stages score once, before any worker starts.
+    """
+
+    def __init__(self, profile: str, cache_path: Optional[str] = None, n_features: int = 2**18):
+        self.profile = profile
+        self.cache_path = cache_path
+        self.n_features = n_features
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, ngram_range=NGRAMS, token_pattern=TOKEN_PATTERN,
+            stop_words="english", alternate_sign=False, norm=None, dtype=np.float32,
+        )
+        self.ids: List[str] = []
+        self.checksums = np.zeros(0, dtype=np.uint32)
+        self.matrix = sp.csr_matrix((0, n_features), dtype=np.float32)
+        self._rows = {}
+        self._seen = set()  # job ids scored by this instance, never evicted on save
+        self.vectorized = 0  # rows vectorised by this instance (the rest came from the cache)
+        if cache_path and os.path.exists(cache_path):
+            self._load(cache_path)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> Optional["JobScorer"]:
+        """The configured scorer, or None when ranking is off or there is no profile to rank by."""
+        if not settings.apply.rank_by_score:
+            return None
+        profile = read_profile(settings.paths.profile_file)
+        if not profile:
+            logger.warning(f"No relevance profile in {settings.paths.profile_file}; drawing jobs at random")
+            return None
+        return cls(profile, settings.paths.score_cache_file, settings.perf.score_features)
+
+    # ── Cache ────────────────────────────────────────────────────
+
+    def _load(self, path: str):
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                if int(npz["n_features"]) != self.n_features:
+                    logger.info(f"{path} was built with {int(npz['n_features'])} features; rebuilding")
+                    return
+                matrix = sp.csr_matrix((npz["data"], npz["indices"], npz["indptr"]),
+                                       shape=(len(npz["ids"]), self.n_features))
+                ids, checksums = npz["ids"].tolist(), npz["checksums"]
+        except (OSError, KeyError, ValueError) as exc:
+            logger.warning(f"Ignoring unreadable score cache {path}: {exc}")
+            return
+        self.ids, self.checksums, self.matrix = ids, checksums, matrix
+        self._rows = {job_id: i for i, job_id in enumerate(ids)}
+
+    def save(self) -> int:
+        """Write the cache (at most ``MAX_ROWS`` rows); returns the number of rows kept."""
+        if not self.cache_path:
+            return 0
+        if len(self.ids) > MAX_ROWS:
+            keep = np.array([job_id in self._seen for job_id in self.ids], dtype=bool)
+            room = MAX_ROWS - int(keep.sum())
+            if room > 0:
+                keep[np.flatnonzero(~keep)[-room:]] = True
+            self.ids = [job_id for job_id, k in zip(self.ids, keep) if k]
+            self.checksums, self.matrix = self.checksums[keep], self.matrix[keep]
+            self._rows = {job_id: i for i, job_id in enumerate(self.ids)}
+        Path(self.cache_path).parent.mkdir(parents=True, exist_ok=True)
+        tmp = f"{self.cache_path}.tmp.npz"
+        np.savez_compressed(
+            tmp, ids=np.array(self.ids, dtype=str), checksums=self.checksums,
+            data=self.matrix.data, indices=self.matrix.indices, indptr=self.matrix.indptr,
+            n_features=np.int64(self.n_features),
+        )
+        os.replace(tmp, self.cache_path)
+        return len(self.ids)
+
+    # ── Vectors ──────────────────────────────────────────────────
+
+    def _term_weights(self, texts) -> sp.csr_matrix:
+        """Sublinear term frequencies, 1 + log(count), of hashed 1-2 grams."""
+        matrix = self.vectorizer.transform(texts)
+        np.log(matrix.data, out=matrix.data)
+        matrix.data += 1
+        return matrix
+
+    def vectors(self, df: pd.DataFrame) -> sp.csr_matrix:
+        """Cached rows for ``df`` (aligned with it), vectorising only new or changed postings."""
+        texts = job_texts(df)
+        self._seen.update(df["job_id"])
+        checksums = np.fromiter((zlib.crc32(t.encode()) for t in texts), dtype=np.uint32, count=len(texts))
+        rows = np.array([self._rows.get(job_id, -1) for job_id in df["job_id"]], dtype=np.int64)
+        stale = rows < 0
+        stale[~stale] = self.checksums[rows[~stale]] != checksums[~stale]
+        if stale.any():
+            ids = df["job_id"].to_numpy()[stale].tolist()
+            new = self._term_weights(texts[stale])
+            # a changed posting's old row is dropped; its new one goes at the end
+            changed = {job_id for job_id, row in zip(ids, rows[stale]) if row >= 0}
+            if changed:
+                keep = np.array([job_id not in changed for job_id in self.ids], dtype=bool)
+                self.ids = [job_id for job_id, k in zip(self.ids, keep) if k]
+                self.checksums, self.matrix = self.checksums[keep], self.matrix[keep]
+            start = len(self.ids)
+            self.ids += ids
+            self.checksums = np.concatenate([self.checksums, checksums[stale]])
+            self.matrix = sp.vstack([self.matrix, new], format="csr")
+            self._rows = {job_id: i for i, job_id in enumerate(self.ids)}
+            self.vectorized += len(ids)
+            logger.info(f"Vectorised {len(ids)} posting(s) ({start} cached)")
+        return self.matrix[[self._rows[job_id] for job_id in df["job_id"]]]
+
+    def idf(self) -> np.ndarray:
+        """Smoothed inverse document frequency over every cached posting."""
+        df = np.bincount(self.matrix.indices, minlength=self.n_features)
+        return (np.log((1 + len(self.ids)) / (1 + df)) + 1).astype(np.float32)
+
+    def score(self, df: pd.DataFrame) -> np.ndarray:
+        """Cosine similarity of each row of ``df`` to the profile."""
+        if df.empty:
+            return np.zeros(0, dtype=np.float32)
+        self.vectors(df)
+        return self.score_ids(df["job_id"])
+
+    def score_ids(self, job_ids) -> np.ndarray:
+        """``score`` for postings ``vectors`` has already seen, without their text.
+
+        Rows are weighted ``SCORE_ROWS`` at a time, so scoring every
+        candidate never copies the whole cache.
+        """
+        job_ids = list(job_ids)
+        if not job_ids:
+            return np.zeros(0, dtype=np.float32)
+        idf = self.idf()
+        profile = normalize(self._term_weights([self.profile]).multiply(idf).tocsr())
+        scores = []
+        for start in range(0, len(job_ids), SCORE_ROWS):
+            matrix = self.matrix[[self._rows[job_id] for job_id in job_ids[start:start + SCORE_ROWS]]]
+            rows = normalize(matrix.multiply(idf).tocsr())
+            scores.append(np.asarray((rows @ profile.T).todense()).ravel())
+        return np.concatenate(scores)
+
+# ── Apply stage ──────────────────────────────────────────────────
+
+def text_columns(store) -> List[str]:
+    """The scoring columns ``filtered_jobs`` actually has (enrichment may not have run)."""
+    existing = set(store.columns("filtered_jobs"))
+    return [col for col in TEXT_COLUMNS if col in existing and col not in CANDIDATE_COLUMNS]
+
+
+def best_candidates(store, statuses: List[str], n: Optional[int], near_dup_index: Optional[str],
+                    scorer: Optional[JobScorer], columns: List[str] = ()) -> pd.DataFrame:
+    """The ``n`` jobs to apply to (None = all), best first: ``cluster_candidates`` ranked by score.
+
+    Without a scorer this is ``cluster_candidates``' random sample of ``n``.
+    Otherwise the candidates are streamed twice in ``CHUNK_ROWS`` chunks:
+    once to vectorise their text, then, with the IDF weights settled, for
+    the ``n`` best rows (with a ``score`` column). Neither the text nor
+    more than ``n`` rows are ever held at once. Extra ``columns`` are
+    passed through. ``df.attrs`` carries ``available`` and
+    ``near_duplicates`` either way.
+    """
+    keep = list(dict.fromkeys([*CANDIDATE_COLUMNS, *columns]))
+    if scorer is None:
+        return cluster_candidates(store, statuses, near_dup_index, sample=n, columns=keep)
+    allowed, attrs = None, {"near_duplicates": 0}
+    if near_dup_index and os.path.exists(near_dup_index):
+        winners = cluster_candidates(store, statuses, near_dup_index, columns=CANDIDATE_COLUMNS)
+        allowed, attrs = set(winners["job_id"]), dict(winners.attrs)
+
+    ids = []
+    texts = list(dict.fromkeys(["job_id", "title", *text_columns(store)]))
+    for chunk in store.iter_apply_candidates(statuses, texts):
+        if allowed is not None:
+            chunk = chunk[chunk["job_id"].isin(allowed)]
+        if chunk.empty:
+            continue
+        scorer.vectors(chunk)
+        ids.extend(chunk["job_id"])
+    scores = dict(zip(ids, scorer.score_ids(ids)))
+    attrs["available"] = len(scores)
+
+    best = []  # min-heap of (score, -position, row): the n best so far, earlier rows winning ties
+    position = 0
+    for chunk in store.iter_apply_candidates(statuses, keep):
+        for row in chunk.itertuples(index=False, name=None):
+            if row[0] not in scores:  # a near-duplicate
+                continue
+            item = (float(scores[row[0]]), -position, row)
+            position += 1
+            if n is None or len(best) < n:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+    best.sort(reverse=True)
+    df = pd.DataFrame([row for _, _, row in best], columns=keep)
+    df["score"] = [score for score, _, _ in best]
+    if ids:
+        scorer.save()
+    df.attrs.update(attrs)
+    return df
@@ -0,0 +1,194 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from card_parser import parse_job_cards
+from job_index import extract_job_id
+from metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+CARD_SELECTOR = "div[data-job-guid]"
+
+# ── Politeness ───────────────────────────────────────────────────
+
+class RateLimiter:
+    """Thread-safe cap on request rate: at most ``max_per_sec`` calls to ``wait``.
+
+    One instance can be shared by several backends so the budget is global.
+    ``max_per_sec <= 0`` disables the cap.
+    """
+
+    def __init__(self, max_per_sec: float):
+        self.interval = 1.0 / max_per_sec if max_per_sec > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+# ── Backends ─────────────────────────────────────────────────────
+
+class SearchBackend:
+    """Loads one search-result page and returns its job dicts.
+
+    ``fetch_jobs`` returns ``None`` when the page could not be loaded
+    (timeout / HTTP error) and ``[]`` when it loaded without job cards.
+    """
+
+    name = "base"
+
+    def fetch_jobs(self, url: str) -> Optional[List[dict]]:
+        raise NotImplementedError
+
+    def wiggle(self):
+        """Human-like activity between pages (browser backends only)."""
+
+    def close(self):
+        pass
+
+
+class SeleniumBackend(SearchBackend):
+    """Reads result pages through a live WebDriver session."""
+
+    name = "selenium"
+
+    def __init__(self, driver, wait_timeout: float, extraction: str = "html",
+                 wiggle: Optional[Callable] = None, limiter: Optional[RateLimiter] = None):
+        self.driver = driver
+        self.wait_timeout = wait_timeout
+        self.extraction = extraction
+        self._wiggle = wiggle
+        self.limiter = limiter
+
+    def fetch_jobs(self, url: str) -> Optional[List[dict]]:
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        if self.limiter:
+            with METRICS.timer("scrape.rate_limit_wait"):
+                self.limiter.wait()
+        try:
+            with METRICS.timer("scrape.driver_get"):
+                self.driver.get(url)
+            with METRICS.timer("scrape.wait_cards"):
+                WebDriverWait(self.driver, self.wait_timeout).until(
+                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, CARD_SELECTOR))
+                )
+        except TimeoutException:
+            METRICS.count("scrape.fetch_failure", "timeout")
+            return None
+
+        with METRICS.timer("scrape.parse_cards"):
+            if self.extraction == "webdriver":
+                jobs = []
+                for card in self.driver.find_elements(By.CSS_SELECTOR, CARD_SELECTOR):
+                    try:
+                        jobs.append(parse_card_element(card))
+                    except Exception as exc:
+                        logger.error(f"Error parsing card: {exc}")
+                return jobs
+            # one page_source round trip, parsed in-process
+            return parse_job_cards(self.driver.page_source, base_url=self.driver.current_url)
+
+    def wiggle(self):
+        if self._wiggle:
+            self._wiggle(self.driver)
+
+    def close(self):
+        self.driver.quit()
+
+
+class RequestsBackend(SearchBackend):
+    """Fetches result pages over a pooled keep-alive ``requests.Session``.
+
+    No browser is started; pages go straight into the same card parser.
+    """
+
+    name = "requests"
+
+    def __init__(self, timeout: float, user_agent: str, limiter: Optional[RateLimiter] = None,
+                 pool_size: int = 4, session: Optional[requests.Session] = None):
+        self.timeout = timeout
+        self.limiter = limiter or RateLimiter(0.5)
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=2, backoff_factor=1.0, status_forcelist=(429, 500, 502, 503, 504)),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Encoding": "gzip, deflate",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Connection": "keep-alive",
+        })
+
+    def fetch_jobs(self, url: str) -> Optional[List[dict]]:
+        with METRICS.timer("scrape.rate_limit_wait"):
+            self.limiter.wait()
+        try:
+            with METRICS.timer("scrape.http_get"):
+                resp = self.session.get(url, timeout=self.timeout)
+            resp.raise_for_status()
+        except requests.RequestException as exc:
+            logger.warning(f"Request failed for {url}: {exc}")
+            METRICS.count("scrape.fetch_failure", type(exc).__name__)
+            return None
+        with METRICS.timer("scrape.parse_cards"):
+            return parse_job_cards(resp.text, base_url=resp.url)
+
+    def close(self):
+        self.session.close()
+
+# ── WebDriver card extraction (legacy "webdriver" mode) ──────────
+
+def parse_card_element(card) -> dict:
+    """Per-card extraction through WebDriver: ~10 round trips per card."""
+    from selenium.common.exceptions import NoSuchElementException
+    from selenium.webdriver.common.by import By
+
+    job_link_el = card.find_element(By.CSS_SELECTOR, "a[data-testid='job-search-job-detail-link']")
+    job_link = job_link_el.get_attribute("href")
+    meta_elems = card.find_elements(By.CSS_SELECTOR, "p.text-sm.font-normal.text-zinc-600")
+    company_el = card.find_elements(By.CSS_SELECTOR, "p.line-clamp-2.text-sm")
+    desc_el = card.find_elements(By.CSS_SELECTOR, "div.mt-2 p")
+    apply_el = card.find_elements(By.XPATH, ".//div[contains(@class, 'gap-1.5')]/a")
+
+    def extract_tag(label_id: str) -> str:
+        try:
+            return card.find_element(By.CSS_SELECTOR, f"div[aria-labelledby='{label_id}']").text.strip()
+        except NoSuchElementException:
+            return ""
+
+    return {
+        "title": job_link_el.text.strip(),
+        "company": company_el[0].text.strip() if company_el else "N/A",
+        "link": job_link,
+        "description": desc_el[0].text.strip() if desc_el else "",
+        "location": meta_elems[0].text.strip() if meta_elems else "N/A",
+        "date_added": datetime.now().strftime("%m/%d/%Y"),
+        "date_posted": meta_elems[2].text.strip() if len(meta_elems) > 2 else "N/A",
+        "job_type": extract_tag("employmentType-label"),
+        "salary": extract_tag("salary-label"),
+        "apply_text": apply_el[0].text.strip() if apply_el else "",
+        "job_id": extract_job_id(job_link, card.get_attribute("data-job-guid")),
+    }
@@ -0,0 +1,99 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import List
+
+from cryptography.fernet import Fernet, InvalidToken
+
+logger = logging.getLogger(__name__)
+
+SALT_BYTES = 16
+KDF_ROUNDS = 200_000
+
+
+class SessionCache:
+    """Browser cookies persisted to an encrypted file between runs.
+
+    The file is ``salt || Fernet(token)``; the key is derived from ``secret``
+    with PBKDF2, so the cache is useless without the secret (in CI the
+    ``SESSION_CACHE_KEY`` / ``APPLY_PASSWORD`` secret).
+    """
+
+    def __init__(self, path: str, secret: str):
+        self.path = Path(path)
+        self.secret = secret.encode()
+
+    def _fernet(self, salt: bytes) -> Fernet:
+        key = hashlib.pbkdf2_hmac("sha256", self.secret, salt, KDF_ROUNDS)
+        return Fernet(base64.urlsafe_b64encode(key))
+
+    def load(self) -> List[dict]:
+        """Unexpired cookies from the cache, or ``[]`` if missing/unreadable."""
+        if not self.secret or not self.path.exists():
+            return []
+        blob = self.path.read_bytes()
+        try:
+            cookies = json.loads(self._fernet(blob[:SALT_BYTES]).decrypt(blob[SALT_BYTES:]))
+        except (InvalidToken, ValueError) as exc:
+            logger.warning(f"Ignoring unreadable session cache {self.path}: {exc!r}")
+            return []
+        now = time.time()
+        return [c for c in cookies if c.get("expiry", now + 1) > now]
+
+    def save(self, driver):
+        if not self.secret:
+            return
+        salt = os.urandom(SALT_BYTES)
+        token = self._fernet(salt).encrypt(json.dumps(driver.get_cookies()).encode())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_bytes(salt + token)
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, self.path)
+
+    def restore(self, driver, origin: str) -> bool:
+        """Load cached cookies into ``driver``; True if there was anything to load.
+
+        Uses CDP ``Network.setCookies`` so no page load is needed; drivers
+        without CDP fall back to visiting ``origin`` and ``add_cookie``.
+        """
+        cookies = self.load()
+        if not cookies:
+            return False
+        try:
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": [_to_cdp(c) for c in cookies]})
+        except AttributeError:
+            driver.get(origin)
+            for cookie in cookies:
+                cookie.pop("sameSite", None)
+                driver.add_cookie(cookie)
+        return True
+
+
+def _to_cdp(cookie: dict) -> dict:
+    """Selenium ``get_cookies`` dict → CDP ``CookieParam``."""
+    param = {k: cookie[k] for k in ("name", "value", "domain", "path", "secure", "httpOnly") if k in cookie}
+    if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+        param["sameSite"] = cookie["sameSite"]
+    if "expiry" in cookie:
+        param["expires"] = cookie["expiry"]
+    return param
+
+
+def session_is_valid(driver, dashboard_url: str, timeout: float) -> bool:
+    """One page load: a live session stays on the dashboard, a dead one is sent to login."""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    driver.get(dashboard_url)
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+    except TimeoutException:
+        return False
+    return "dashboard" in driver.current_url and "login" not in driver.current_url
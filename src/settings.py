@@ -0,0 +1,269 @@
+"""Typed settings for every stage, read once from the two YAML files.
+
+    from settings import get_settings
+    s = get_settings()
+    s.paths.store_path, s.scrape.max_pages, s.perf.apply_workers
+
+``config/scraper_config.yaml`` and ``config/apply_job_config.yaml`` keep
+their flat keys; each field below names the key(s) it is read from. Values
+may use ``${VAR}`` or ``${VAR:-default}``, expanded from the environment
+(and ``.env``). A value that refers to an unset variable with no default is
+treated as not set. Everything is coerced and validated in one pass, and
+all problems are reported together as a ``SettingsError``.
+"""
+import os
+import re
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+SCRAPER_CONFIG = "config/scraper_config.yaml"
+APPLY_CONFIG = "config/apply_job_config.yaml"
+ENV_RE = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)(?::-(.*?))?\}")
+TRUE, FALSE = {"1", "true", "yes", "y", "on"}, {"0", "false", "no", "n", "off", ""}
+
+
+class SettingsError(ValueError):
+    """The configuration is invalid (or lacks what a stage needs)."""
+
+
+def _key(*sources: str, default=None, required_for: Tuple[str, ...] = (), choices=None, minimum=None):
+    """A field read from ``"scraper:key"`` / ``"apply:key"``; several sources must agree."""
+    return field(default=default, metadata={
+        "sources": sources, "required_for": required_for, "choices": choices, "minimum": minimum,
+    })
+
+# ── Sections ─────────────────────────────────────────────────────
+
+@dataclass(frozen=True, slots=True)
+class PathSettings:
+    """Where state lives, and in which format."""
+    storage: str = _key("scraper:storage", "apply:storage", default="csv", choices=("csv", "sqlite", "parquet"))
+    store_path: str = _key("scraper:store_path", "apply:store_path", default="output/jobs.db")
+    jobs_csv: str = _key("scraper:main_csv_file", default="output/jobs.csv")
+    filtered_csv: str = _key("scraper:filtered_csv_file", "apply:main_csv_file", default="output/final_ml_jobs.csv")
+    query_file: str = _key("scraper:query_file", default="queries.txt")
+    job_index_file: str = _key("scraper:job_index_file", default="output/job_index.json")
+    filter_state_file: str = _key("scraper:filter_state_file", default="output/filter_state.json")
+    near_dup_index_file: str = _key("scraper:near_dup_index_file", default="output/near_dup.db")
+    profile_file: str = _key("apply:profile_file", default="profile.txt")
+    score_cache_file: str = _key("apply:score_cache_file", default="output/score_cache.npz")
+    query_history_file: str = _key("scraper:query_history_file", default="output/query_history.json")
+    log_dir: str = _key("scraper:log_dir", "apply:log_dir", default="output/logs")
+    log_index_file: str = _key("scraper:log_index_file", default="output/log_index.json")
+    detail_cache_dir: str = _key("scraper:detail_cache_dir", default="output/detail_cache")
+    metrics_dir: str = _key("scraper:metrics_dir", "apply:metrics_dir", default="output/metrics")
+    apply_journal_file: str = _key("apply:apply_journal_file", default="output/apply_journal.jsonl")
+    session_cache_file: str = _key("apply:session_cache_file", default="output/.dice_session")
+    browser_profile_dir: Optional[str] = _key("apply:browser_profile_dir")
+
+
+@dataclass(frozen=True, slots=True)
+class ScrapeSettings:
+    base_url: Optional[str] = _key("scraper:base_url", required_for=("scrape",))
+    max_pages: int = _key("scraper:max_pages", default=20, minimum=1)
+    delay: float = _key("scraper:delay", default=6, minimum=0)
+    driver_path: str = _key("scraper:driver_path", default="/usr/local/bin/chromedriver")
+    search_backend: str = _key("scraper:search_backend", default="selenium", choices=("requests", "selenium"))
+    card_extraction: str = _key("scraper:card_extraction", default="html", choices=("html", "webdriver"))
+    min_page_delay: float = _key("scraper:min_page_delay", default=2, minimum=0)
+    max_page_delay: float = _key("scraper:max_page_delay", default=4, minimum=0)
+    stop_after_stale_pages: int = _key("scraper:stop_after_stale_pages", default=2, minimum=0)
+    enrich_details: bool = _key("scraper:enrich_details", default=True)
+    near_dup_threshold: float = _key("scraper:near_dup_threshold", default=0.8, minimum=0)
+
+
+@dataclass(frozen=True, slots=True)
+class ApplySettings:
+    email: Optional[str] = _key("apply:email", required_for=("apply",))
+    password: Optional[str] = _key("apply:password", required_for=("apply",))
+    process_failed: bool = _key("apply:process_failed", default=False)
+    one_per_cluster: bool = _key("apply:one_per_cluster", default=True)
+    rank_by_score: bool = _key("apply:rank_by_score", default=True)
+    delay: float = _key("apply:delay", default=5, minimum=0)
+    driver_path: str = _key("apply:driver_path", default="/usr/local/bin/chromedriver")
+    site_url: str = _key("apply:site_url", default="https://www.dice.com")
+    session_cache_key: Optional[str] = _key("apply:session_cache_key")  # falls back to the password
+    applied_jobs_path: str = _key("apply:applied_jobs_path", default="/dashboard/jobs?tab=applied&page={page}")
+    applied_jobs_max_pages: int = _key("apply:applied_jobs_max_pages", default=50, minimum=0)
+
+
+@dataclass(frozen=True, slots=True)
+class PerfSettings:
+    """Concurrency, budgets and timeouts, for every engine to read from one place."""
+    scrape_workers: int = _key("scraper:workers", default=1, minimum=1)
+    max_requests_per_sec: float = _key("scraper:max_requests_per_sec", default=0.5, minimum=0)
+    http_timeout: float = _key("scraper:http_timeout", default=15, minimum=0)
+    query_page_budget: int = _key("scraper:query_page_budget", default=0, minimum=0)
+    query_time_budget: float = _key("scraper:query_time_budget", default=0, minimum=0)
+    detail_concurrency: int = _key("scraper:detail_concurrency", default=4, minimum=1)
+    detail_requests_per_sec: float = _key("scraper:detail_requests_per_sec", default=2, minimum=0)
+    detail_cache_ttl_days: float = _key("scraper:detail_cache_ttl_days", default=7, minimum=0)
+    detail_cache_max_idle_days: float = _key("scraper:detail_cache_max_idle_days", default=30, minimum=0)
+    detail_cache_max_entries: int = _key("scraper:detail_cache_max_entries", default=5000, minimum=1)
+    score_features: int = _key("apply:score_features", default=2**18, minimum=1024)
+    apply_workers: int = _key("apply:apply_workers", default=1, minimum=1)
+    max_applies_per_min: float = _key("apply:max_applies_per_min", default=0, minimum=0)
+    apply_time_budget: float = _key("apply:apply_time_budget", default=0, minimum=0)
+    wait_timeouts: Optional[Dict[str, float]] = _key("apply:wait_timeouts")
+    step_pause: Tuple[float, float] = _key("apply:step_pause", default=(0.0, 0.0))
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    paths: PathSettings
+    scrape: ScrapeSettings
+    apply: ApplySettings
+    perf: PerfSettings
+
+    def require(self, stage: str) -> "Settings":
+        """Raise unless every field ``stage`` needs is set; returns self for chaining."""
+        missing = [
+            f"{name}.{f.name} ({', '.join(f.metadata['sources'])})"
+            for name in SECTIONS
+            for f in fields(getattr(self, name))
+            if stage in f.metadata["required_for"] and getattr(getattr(self, name), f.name) in (None, "")
+        ]
+        if missing:
+            raise SettingsError(f"{stage} needs: " + "; ".join(missing))
+        return self
+
+    @property
+    def session_key(self) -> Optional[str]:
+        return self.apply.session_cache_key or self.apply.password
+
+
+SECTIONS = {"paths": PathSettings, "scrape": ScrapeSettings, "apply": ApplySettings, "perf": PerfSettings}
+
+# ── Loading ──────────────────────────────────────────────────────
+
+class _UniqueKeyLoader(yaml.SafeLoader):
+    """SafeLoader that rejects a key defined twice in one mapping (YAML keeps the last silently)."""
+
+    def construct_mapping(self, node, deep=False):
+        seen = set()
+        for key_node, _ in node.value:
+            key = self.construct_object(key_node, deep=deep)
+            if key in seen:
+                raise SettingsError(f"{node.start_mark.name}: '{key}' is defined more than once "
+                                    f"(line {key_node.start_mark.line + 1})")
+            seen.add(key)
+        return super().construct_mapping(node, deep=deep)
+
+
+def read_yaml(path: str) -> dict:
+    if not Path(path).exists():
+        return {}
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=_UniqueKeyLoader) or {}
+
+
+def expand_env(value):
+    """Expand ``${VAR}`` / ``${VAR:-default}`` in strings (recursively); None if a variable is unset."""
+    if isinstance(value, dict):
+        return {k: expand_env(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [expand_env(v) for v in value]
+    if not isinstance(value, str) or "${" not in value:
+        return value
+    unset = []
+
+    def sub(match):
+        var, default = match.group(1), match.group(2)
+        if var in os.environ:
+            return os.environ[var]
+        if default is not None:
+            return default
+        unset.append(var)
+        return ""
+
+    expanded = ENV_RE.sub(sub, value)
+    return None if unset else expanded
+
+
+def _coerce(value, kind, name: str):
+    if kind is bool:
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in TRUE | FALSE:
+            return text in TRUE
+        raise SettingsError(f"{name}: expected a boolean, got {value!r}")
+    if kind in (int, float):
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise SettingsError(f"{name}: expected a number, got {value!r}") from None
+        if kind is int and not number.is_integer():
+            raise SettingsError(f"{name}: expected an integer, got {value!r}")
+        return kind(number)
+    if kind == Tuple[float, float]:  # a [min, max] range, or one number for both
+        pair = value if isinstance(value, (list, tuple)) else [value, value]
+        if len(pair) != 2:
+            raise SettingsError(f"{name}: expected [min, max], got {value!r}")
+        low, high = (_coerce(v, float, name) for v in pair)
+        return low, max(low, high)
+    if kind == Optional[Dict[str, float]]:
+        if not isinstance(value, dict):
+            raise SettingsError(f"{name}: expected a mapping, got {value!r}")
+        return {str(k): _coerce(v, float, f"{name}.{k}") for k, v in value.items()}
+    return str(value)
+
+
+def _build(cls, files: Dict[str, dict], errors: List[str]):
+    values = {}
+    for f in fields(cls):
+        found = {}
+        for source in f.metadata["sources"]:
+            file, key = source.split(":", 1)
+            value = expand_env(files[file].get(key))
+            if value not in (None, ""):
+                found[source] = value
+        if len(set(map(str, found.values()))) > 1:
+            errors.append(f"{f.name}: {' vs '.join(f'{s}={v!r}' for s, v in found.items())} must agree")
+            continue
+        if not found:
+            values[f.name] = f.default
+            continue
+        try:
+            value = _coerce(next(iter(found.values())), f.type, ", ".join(found))
+        except SettingsError as exc:
+            errors.append(str(exc))
+            continue
+        meta = f.metadata
+        if meta["choices"] and value not in meta["choices"]:
+            errors.append(f"{f.name}: {value!r} is not one of {', '.join(meta['choices'])}")
+        if meta["minimum"] is not None and value < meta["minimum"]:
+            errors.append(f"{f.name}: {value} is below {meta['minimum']}")
+        values[f.name] = value
+    return cls(**values)
+
+
+def load_settings(scraper_path: str = SCRAPER_CONFIG, apply_path: str = APPLY_CONFIG) -> Settings:
+    """Read, expand, coerce and validate both config files."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    files = {"scraper": read_yaml(scraper_path), "apply": read_yaml(apply_path)}
+    errors: List[str] = []
+    settings = Settings(**{name: _build(cls, files, errors) for name, cls in SECTIONS.items()})
+    if settings.scrape.min_page_delay > settings.scrape.max_page_delay:
+        errors.append("min_page_delay must not exceed max_page_delay")
+    if settings.scrape.near_dup_threshold > 1:
+        errors.append("near_dup_threshold is a similarity, at most 1")
+    if errors:
+        raise SettingsError("invalid configuration:\n  " + "\n  ".join(errors))
+    return settings
+
+
+_SETTINGS: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    """The process-wide settings, loaded from the default paths on first use."""
+    global _SETTINGS
+    if _SETTINGS is None:
+        _SETTINGS = load_settings()
+    return _SETTINGS
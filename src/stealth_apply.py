@@ -1,47 +1,103 @@
-import os
 import sys
 import random
+import signal
+import statistics
+import threading
 import time
+import argparse
 import logging
-import yaml
-import pandas as pd
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, wait as wait_for
+from typing import List, Optional
 from pathlib import Path
 from datetime import datetime
 
-# Selenium / stealth ---------------------------------------------
-from undetected_chromedriver import Chrome, ChromeOptions
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, ElementNotInteractableException
+import pandas as pd
 
-# --- CONFIG ------------------------------------------------------
-def load_config(path="config/apply_job_config.yaml"):
-    with open(path, "r") as f:
-        return yaml.safe_load(f)
+from apply_journal import ApplyJournal
+from apply_scheduler import POOL_PER_JOB, ApplyScheduler, CostModel, schedule_columns
+from applied_jobs import fetch_applied_job_ids
+from job_store import open_store
+from metrics import METRICS
+from scoring import JobScorer, best_candidates
+from search_backend import RateLimiter
+from apply_waits import ApplyWaits, ThrottlePolicy
+from session_cache import SessionCache, session_is_valid
+from settings import Settings, get_settings
 
-config = load_config()
+logger = logging.getLogger()
 
-DELAY = config["delay"]
-CSV_FILE = config["main_csv_file"]
-EMAIL = os.getenv("APPLY_EMAIL") or config["email"]
-PASSWORD = os.getenv("APPLY_PASSWORD") or config["password"]
-DRIVER_PATH = config.get("driver_path", "/usr/local/bin/chromedriver")
-LOG_DIR = Path(config.get("log_dir", "output/logs"))
-PROCESS_FAILED = os.getenv("APPLY_PROCESS_FAILED") or config.get("process_failed", False)
-SKIPPED = 0
+# --- CONFIG ------------------------------------------------------
+# Filled in from the shared Settings by configure() (main() calls it):
+# importing this module reads no files, opens no log and loads no browser
+# libraries.
+
+SETTINGS: Optional[Settings] = None
+DELAY = 5
+CSV_FILE = ""
+EMAIL = PASSWORD = ""
+DRIVER_PATH = ""
+LOG_DIR = Path("output/logs")
+STORAGE = "csv"
+STORE_PATH = JOURNAL_FILE = SITE_URL = SESSION_FILE = SESSION_KEY = ""
+PROFILE_DIR = None
+APPLIED_JOBS_URL = ""
+APPLIED_JOBS_MAX_PAGES = 50
+METRICS_DIR = ""
+WAIT_TIMEOUTS: dict = {}
+THROTTLE = ThrottlePolicy()
+APPLY_WORKERS = 1
+MAX_APPLIES_PER_MIN = 0
+TIME_BUDGET = 0.0  # seconds per run; 0 = none
+PROCESS_FAILED = False
+NEAR_DUP_INDEX: Optional[str] = None  # set when applying to one job per near-duplicate cluster
+SKIPPED = 0  # already applied, found on the job page (workers share it)
+SKIPPED_LOCK = threading.Lock()
+
+
+def configure(settings: Optional[Settings] = None) -> Settings:
+    """Copy the apply stage's settings into the module constants."""
+    global SETTINGS, DELAY, CSV_FILE, EMAIL, PASSWORD, DRIVER_PATH, LOG_DIR, STORAGE, STORE_PATH, JOURNAL_FILE
+    global SITE_URL, SESSION_FILE, SESSION_KEY, PROFILE_DIR, APPLIED_JOBS_URL, APPLIED_JOBS_MAX_PAGES
+    global METRICS_DIR, WAIT_TIMEOUTS, THROTTLE, APPLY_WORKERS, MAX_APPLIES_PER_MIN, PROCESS_FAILED, NEAR_DUP_INDEX
+    global TIME_BUDGET
+
+    SETTINGS = (settings or get_settings()).require("apply")
+    paths, apply, perf = SETTINGS.paths, SETTINGS.apply, SETTINGS.perf
+    DELAY = apply.delay
+    CSV_FILE = paths.filtered_csv
+    EMAIL = apply.email
+    PASSWORD = apply.password
+    DRIVER_PATH = apply.driver_path
+    LOG_DIR = Path(paths.log_dir)
+    STORAGE = paths.storage
+    STORE_PATH = paths.store_path
+    JOURNAL_FILE = paths.apply_journal_file
+    SITE_URL = apply.site_url.rstrip("/")
+    SESSION_FILE = paths.session_cache_file
+    SESSION_KEY = SETTINGS.session_key
+    PROFILE_DIR = paths.browser_profile_dir
+    APPLIED_JOBS_URL = SITE_URL + apply.applied_jobs_path
+    APPLIED_JOBS_MAX_PAGES = apply.applied_jobs_max_pages
+    METRICS_DIR = paths.metrics_dir
+    WAIT_TIMEOUTS = perf.wait_timeouts or {}
+    THROTTLE = ThrottlePolicy(*perf.step_pause)
+    APPLY_WORKERS = perf.apply_workers
+    MAX_APPLIES_PER_MIN = perf.max_applies_per_min  # across all workers; 0 = no cap
+    TIME_BUDGET = perf.apply_time_budget
+    PROCESS_FAILED = apply.process_failed
+    NEAR_DUP_INDEX = paths.near_dup_index_file if apply.one_per_cluster else None
+    return SETTINGS
 
 # ====== Logging ======
-LOG_DIR.mkdir(parents=True, exist_ok=True)
-log_filename = LOG_DIR / f"stealth_apply_job_bot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-logging.basicConfig(
-    filename=str(log_filename),
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger()
+def setup_logging() -> Path:
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    log_filename = LOG_DIR / f"stealth_apply_job_bot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    logging.basicConfig(
+        filename=str(log_filename),
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    return log_filename
 
 
 USER_AGENTS: List[str] = [
@@ -55,10 +111,14 @@ USER_AGENTS: List[str] = [
 
 def human_delay(base: float = 2.0, jitter: float = 0.6):
     """Sleep for N( base, jitter^2 ) seconds – never negative."""
-    time.sleep(max(0.05, random.normalvariate(base, jitter)))
+    with METRICS.timer("apply.human_delay"):
+        time.sleep(max(0.05, random.normalvariate(base, jitter)))
 
 
 def wiggle_mouse(driver):
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.common.by import By
+
     try:
         body = driver.find_element(By.TAG_NAME, "body")
         actions = ActionChains(driver)
@@ -69,6 +129,8 @@ def wiggle_mouse(driver):
         # don’t re-raise
 
 def get_stealth_driver(headless: bool = True):
+    from undetected_chromedriver import Chrome, ChromeOptions
+
     opts = ChromeOptions()
     if headless:
         # new headless mode mimics full Chrome better
@@ -76,15 +138,23 @@ def get_stealth_driver(headless: bool = True):
     opts.add_argument("--disable-blink-features=AutomationControlled")
     opts.add_argument("--window-size=1280,900")
     opts.add_argument(f"--user-agent={random.choice(USER_AGENTS)}")
+    if PROFILE_DIR:
+        # persistent profile keeps cookies/local storage across runs on the same machine
+        opts.add_argument(f"--user-data-dir={Path(PROFILE_DIR).resolve()}")
     # match GitHub runner Chrome version (136)
     return Chrome(options=opts, version_main=136)
 
 
+@METRICS.timed("apply.login")
 def login_to_dice(driver, EMAIL, PASSWORD, DELAY_WAIT):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
     logger.info("Logging into Dice...")
     print("Logging into Dice...")
 
-    driver.get("https://www.dice.com/dashboard/login")
+    driver.get(f"{SITE_URL}/dashboard/login")
     
     WebDriverWait(driver, DELAY_WAIT).until(
         EC.presence_of_element_located((By.NAME, "email"))
@@ -102,10 +172,44 @@ def login_to_dice(driver, EMAIL, PASSWORD, DELAY_WAIT):
     logger.info("Login successful.")
     print("Login successful.")
 
-def easy_apply(driver, job_link, job_title):
+
+def start_session(driver, cache: SessionCache):
+    """Reuse the cached Dice session if it is still live, otherwise log in and cache the new one."""
+    if cache.restore(driver, SITE_URL) and session_is_valid(driver, f"{SITE_URL}/dashboard", DELAY):
+        logger.info("Reused cached Dice session.")
+        print("Reused cached Dice session.")
+        METRICS.count("apply.session", "restored")
+        return
+    METRICS.count("apply.session", "login")
+    login_to_dice(driver, EMAIL, PASSWORD, DELAY)
+    cache.save(driver)
+
+
+def preflight_applied(driver, store) -> int:
+    """Mark everything on the account's applied list Applied before any job page is opened."""
+    try:
+        with METRICS.timer("apply.preflight"):
+            applied_ids = fetch_applied_job_ids(driver, APPLIED_JOBS_URL, APPLIED_JOBS_MAX_PAGES, DELAY)
+    except Exception as e:
+        logger.warning(f"[PRE-FLIGHT] Could not read the applied-jobs list, skipping: {e}")
+        return 0
+    marked = store.mark_status("filtered_jobs", applied_ids, "Applied")
+    logger.info(f"[PRE-FLIGHT] {len(applied_ids)} job(s) on the applied list, {marked} marked Applied")
+    print(f"[PRE-FLIGHT] {len(applied_ids)} job(s) on the applied list, {marked} marked Applied")
+    return marked
+
+def easy_apply(driver, job_link, job_title, waits: ApplyWaits, throttle: ThrottlePolicy):
+    global SKIPPED
+    from selenium.common.exceptions import ElementNotInteractableException, TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    waits.reset()
     try:
         driver.get(job_link)
-        time.sleep(DELAY)
+        with waits.step("page_ready", job_title):
+            waits.page_ready()
 
         '''
         # Save the job
@@ -129,68 +233,66 @@ def easy_apply(driver, job_link, job_title):
                 button.click()
                 logger.info(f"SAVED: {job_title}")
                 print(f"SAVED: {job_title}")
-                time.sleep(DELAY - 1)
+                throttle.pause()
         except Exception as e:
             logger.warning(f"Save logic failed for {job_title} — {e}")
             print(f"Save logic failed for {job_title}")
         '''
-        
-        # Check if already applied
+
+        # Check if already applied (waits for the button's shadow DOM to render)
         try:
-            apply_component = driver.find_element(By.TAG_NAME, "apply-button-wc")
-            shadow_root = driver.execute_script("return arguments[0].shadowRoot", apply_component)
-            submitted_tag = shadow_root.find_elements(By.CSS_SELECTOR, ".application-submitted")
-            if submitted_tag:
+            with waits.step("apply_state", job_title):
+                state = waits.apply_state()
+            if state == "applied":
                 logger.info(f"SKIPPED (already applied): {job_title} - {job_link}")
                 print(f"SKIPPED (already applied): {job_title} - {job_link}")
-                SKIPPED += 1
+                with SKIPPED_LOCK:
+                    SKIPPED += 1
                 return "Applied"
         except Exception as e:
             logger.warning(f"Could not check application status for {job_title} — {e}")
+            METRICS.count("apply.warning", "apply_state")
 
         # Remove modal if blocking
         try:
             modal = driver.find_element(By.TAG_NAME, "login-dhi-modal")
             if modal.is_displayed():
                 driver.execute_script("arguments[0].remove();", modal)
-                time.sleep(1)
         except Exception:
             pass
 
         # Apply to the job
         try:
-            apply_button = WebDriverWait(driver, DELAY).until(
+            apply_button = WebDriverWait(driver, waits.timeouts["apply_state"]).until(
                 EC.presence_of_element_located((By.TAG_NAME, "apply-button-wc"))
             )
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", apply_button)
-            time.sleep(2)
+            throttle.pause()
             apply_button.click()
         except (TimeoutException, ElementNotInteractableException) as e:
             logger.error(f"Cannot click apply-button-wc for {job_title}: {e}")
+            METRICS.count("apply.failure", "apply_button")
             return "Failed"
 
-        # Click NEXT button
-        try:
-            next_btn = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(@class, 'btn-next')]"))
-            )
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_btn)
-            time.sleep(1.5)
-            next_btn.click()
-        except Exception as e:
-            logger.error(f"[ERROR] Cannot click first NEXT button for {job_title}: {e}")
-            return "Failed"
+        # Click NEXT, then the final NEXT (submit)
+        for which in ("first", "final"):
+            try:
+                with waits.step("next_button", job_title):
+                    next_btn = waits.next_button()
+                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_btn)
+                throttle.pause()
+                next_btn.click()
+            except Exception as e:
+                logger.error(f"[ERROR] Cannot click {which} NEXT button for {job_title}: {e}")
+                METRICS.count("apply.failure", f"{which}_next_button")
+                return "Failed"
 
         try:
-            final_btn = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(@class, 'btn-next')]"))
-            )
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", final_btn)
-            time.sleep(1.5)
-            final_btn.click()
-        except Exception as e:
-            logger.error(f"[ERROR] Cannot click final NEXT button for {job_title}: {e}")
-            return "Failed"
+            with waits.step("submitted", job_title):
+                waits.submitted()
+        except TimeoutException:
+            logger.warning(f"No confirmation after final NEXT for {job_title}")
+            METRICS.count("apply.warning", "no_confirmation")
 
         logger.info(f"APPLIED: {job_title} - {job_link}")
         print(f"APPLIED: {job_title} - {job_link}")
@@ -198,89 +300,193 @@ def easy_apply(driver, job_link, job_title):
 
     except Exception as e:
         logger.error(f"FAILED to apply for {job_title} - {job_link}: {e}")
+        METRICS.count("apply.failure", f"exception:{type(e).__name__}")
         print(f"FAILED to apply for {job_title} - {job_link}")
         return "Failed"
 
 # ----------------------------------------------------------------
 
-def main(process_failed: bool = False):
-    # --- Get driver ------------------------------------------------
-    driver = get_stealth_driver(headless=True)
-
-    df = pd.read_csv(CSV_FILE)
-
-    # 1. Filter only Easy Apply jobs
-    easy_apply_df = df[df["apply_text"].str.strip().str.lower() == "easy apply"].copy()
-
-    # 2. Further filter to only Pending (or Failed if specified)
-    status_to_process = ["pending"]
-    if process_failed:
-        status_to_process.append("failed")
-
-    pending_df = easy_apply_df[easy_apply_df["status"].str.lower().isin(status_to_process)].copy()
-    pending = len(pending_df)
-
-    if pending_df.empty:
-        logger.info("✅ No new jobs to apply. Exiting early.")
-        print("✅ No new jobs to apply. Exiting early.")
-        return
-
+def apply_worker(driver, jobs: ApplyScheduler, limiter: RateLimiter, record, stop: threading.Event,
+                 timings: dict) -> List[str]:
+    """Take the best job left with one authenticated driver until the scheduler runs dry or ``stop`` is set."""
+    waits = ApplyWaits(driver, WAIT_TIMEOUTS, timings)
+    results = []
+    while not stop.is_set():
+        row = jobs.next()
+        if row is None:
+            break
+        started = time.perf_counter()
+        human_delay(random.uniform(4, 8))
+        wiggle_mouse(driver)
+        with METRICS.timer("apply.rate_limit_wait"):
+            limiter.wait()
+        try:
+            with METRICS.timer("apply.easy_apply"):
+                result = easy_apply(driver, row["link"], row["title"], waits, THROTTLE)
+        except Exception as exc:
+            logger.exception(exc)
+            result = "Failed"
+        METRICS.count("apply.result", result)
+        results.append(result)
+        record(row, result)
+        human_delay(random.uniform(2, 4))
+        elapsed = time.perf_counter() - started
+        METRICS.observe("apply.job", elapsed)
+        jobs.finished(elapsed)
+    return results
+
+
+def main(process_failed: Optional[bool] = None, workers: Optional[int] = None,
+         one_per_cluster: Optional[bool] = None, time_budget: Optional[float] = None):
+    started = time.monotonic()
+    if SETTINGS is None:
+        configure()
+    setup_logging()
+    time_budget = TIME_BUDGET if time_budget is None else time_budget
+    process_failed = PROCESS_FAILED if process_failed is None else process_failed
+    workers = workers or APPLY_WORKERS
+    near_dup_index = NEAR_DUP_INDEX
+    if one_per_cluster is not None:
+        near_dup_index = SETTINGS.paths.near_dup_index_file if one_per_cluster else None
+
+    store = open_store(STORAGE, STORE_PATH, {"filtered_jobs": CSV_FILE})
+    journal = ApplyJournal(JOURNAL_FILE)
+    replayed = False  # the journal is only cleared once it has reached the store
+    tried = {}  # job_id -> attempts so far, written back when the run ends
+    drivers = []
     try:
-        login_to_dice(driver, EMAIL, PASSWORD, DELAY)
-        human_delay(3)
+        # merge results a crashed / timed-out previous run never got to save
+        journal.replay(store)
+        replayed = True
 
-        # 3. Decide how many to apply this run (50‑100 random)
+        # 1-2. Easy Apply jobs that are Pending (or Failed if specified)
+        status_to_process = ["pending"]
+        if process_failed:
+            status_to_process.append("failed")
+
+        # 3. Decide how many to apply this run (50‑100 random); the scheduler hands
+        #    them out most valuable first while the time budget lasts
         target = random.randint(50, 100)
-        n_to_apply = min(target, len(pending_df))
-        if n_to_apply < len(pending_df):
-            pending_df = pending_df.sample(n=n_to_apply, random_state=None)
-        logger.info(f"[INFO] Will attempt {n_to_apply} job(s) this run (target {target}, available {len(pending_df)})")
-
-        # 4. Iterate applications
-        results = []
-        for _, row in pending_df.iterrows():
-            human_delay(random.uniform(4, 8))
-            wiggle_mouse(driver)
+        pool_size = POOL_PER_JOB * target  # best-scored candidates it picks from
+        scorer = JobScorer.from_settings(SETTINGS)
+        columns = schedule_columns(store)
+        pending_df = best_candidates(store, status_to_process, pool_size, near_dup_index, scorer, columns)
+        pending = pending_df.attrs["available"]
+
+        if pending_df.empty:
+            logger.info("✅ No new jobs to apply. Exiting early.")
+            print("✅ No new jobs to apply. Exiting early.")
+            return
+
+        # Jobs only leave Pending when their result is written, so anything still
+        # queued (or never reached) when we stop simply stays Pending for next run.
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        write_lock = threading.Lock()
+
+        def record(row, result):
+            with write_lock:
+                tried[row["job_id"]] = row["attempts"] + 1
+                journal.record(row["job_id"], result, title=row["title"], attempts=tried[row["job_id"]])
+                store.update_status("filtered_jobs", row["job_id"], result)
+
+        # --- Get a driver and session, then skip everything already applied
+        drivers.append(get_stealth_driver(headless=True))
+        start_session(drivers[0], SessionCache(SESSION_FILE, SESSION_KEY))
+        human_delay(3)
+        preflighted = preflight_applied(drivers[0], store)
+        if preflighted:
+            pending_df = best_candidates(store, status_to_process, pool_size, near_dup_index, scorer, columns)
+            pending = pending_df.attrs["available"]
+        if pending_df.empty:
+            logger.info("✅ Everything pending was already applied. Exiting early.")
+            print("✅ Everything pending was already applied. Exiting early.")
+            return
+
+        cost = CostModel.from_reports(METRICS_DIR)
+        jobs = ApplyScheduler(pending_df, limit=target, cost=cost,
+                              deadline=started + time_budget if time_budget else None)
+        n_to_apply = jobs.limit
+        logger.info(f"[INFO] Will attempt {n_to_apply} job(s) this run (target {target}, available {pending})")
+        if time_budget:
+            logger.info(f"[INFO] Time budget {time_budget:.0f}s, {jobs.remaining():.0f}s left; "
+                        f"budgeting {cost.reserve():.0f}s per job until measured")
+
+        # --- More drivers as needed; they reuse the first one's cached session
+        for _ in range(min(workers, n_to_apply) - 1):
+            driver = get_stealth_driver(headless=True)
+            drivers.append(driver)
+            start_session(driver, SessionCache(SESSION_FILE, SESSION_KEY))
+            human_delay(3)
+        logger.info(f"[INFO] {len(drivers)} apply worker(s), at most {MAX_APPLIES_PER_MIN or 'unlimited'} applies/min")
+
+        # 4. Workers drain the queue, writing each status as it lands
+        limiter = RateLimiter(MAX_APPLIES_PER_MIN / 60)
+        timings = {}
+        with ThreadPoolExecutor(max_workers=len(drivers)) as pool:
+            futures = [pool.submit(apply_worker, d, jobs, limiter, record, stop, timings) for d in drivers]
             try:
-                result = easy_apply(driver, row["link"], row["title"])
-            except Exception as exc:
-                logger.exception(exc)
-                result = "Failed"
-            results.append(result)
-            human_delay(random.uniform(2, 4))
+                wait_for(futures)
+            except KeyboardInterrupt:
+                logger.warning("Interrupted: finishing jobs in flight, leaving the rest Pending")
+                stop.set()
+                wait_for(futures)
+        results = [r for f in futures for r in f.result()]
 
         applied = results.count("Applied")
+        for step, samples in timings.items():
+            logger.info(f"[SUMMARY] {step}: median {statistics.median(samples):.2f}s")
 
-        # 5. Update DataFrame in bulk
-        easy_apply_df.loc[pending_df.index, "status"] = results
-
-        # 6. Re‑merge & sort
-        df_remaining = df.drop(easy_apply_df.index)
-        df_combined = pd.concat([df_remaining, easy_apply_df], ignore_index=True)
-        df_combined = df_combined.sort_values("date_added", ascending=True)
-        df_combined = df_combined.drop_duplicates(subset=["link", "apply_text"], keep="first")
-        df_combined["status"] = pd.Categorical(df_combined["status"], categories=["Pending", "Applied", "Failed"], ordered=True)
-        df_combined = df_combined.sort_values(by="status").reset_index(drop=True)
-
-        # 7. Atomic CSV write
-        df_combined.to_csv(CSV_FILE, index=False)
-
+        logger.info(f"[SUMMARY] Marked Applied in pre-flight: {preflighted}")
+        logger.info(f"[SUMMARY] Near-duplicates skipped: {pending_df.attrs['near_duplicates']}")
         logger.info(f"[SUMMARY] Skipped already applied: {SKIPPED}")
         logger.info(f"[SUMMARY] Newly applied: {max(0, applied - SKIPPED)}")
-        logger.info(f"[SUMMARY] Total processed this run: {len(pending_df)}")
+        logger.info(f"[SUMMARY] Total processed this run: {len(results)}")
+        logger.info(f"[SUMMARY] Left Pending (not reached): {jobs.pending()}")
+        logger.info(f"[SUMMARY] Stopped for time budget: {jobs.out_of_time}")
+        if cost.mean() is not None:
+            logger.info(f"[SUMMARY] Seconds per job: mean {cost.mean():.1f}, p95 {cost.reserve():.1f}")
         logger.info(f"[SUMMARY] Total to Apply: {pending}")
+        print(f"[SUMMARY] Marked Applied in pre-flight: {preflighted}")
+        print(f"[SUMMARY] Near-duplicates skipped:  {pending_df.attrs['near_duplicates']}")
         print(f"[SUMMARY] Skipped already applied:  {SKIPPED}")
         print(f"[SUMMARY] Newly applied:            {max(0, applied - SKIPPED)}")
-        print(f"[SUMMARY] Total processed this run: {len(pending_df)}")
+        print(f"[SUMMARY] Total processed this run: {len(results)}")
+        print(f"[SUMMARY] Left Pending:             {jobs.pending()}"
+              + (" (time budget reached)" if jobs.out_of_time else ""))
         print(f"[SUMMARY] Total to Apply:           {pending}")
 
     finally:
-        driver.quit()
+        if tried:
+            store.upsert("filtered_jobs", pd.DataFrame({"job_id": list(tried), "attempts": list(tried.values())}),
+                         update_columns=["attempts"])
+        store.close()
+        if replayed:
+            journal.clear()  # everything journaled is now in the store
+        METRICS.write_report(METRICS_DIR, "apply")
+        for driver in drivers:
+            driver.quit()
 
     # propagate success/failure to CI if needed
     if applied == 0:
         sys.exit(1)
 
 
+def cli(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Easy-apply to pending Dice jobs")
+    parser.add_argument("--workers", type=int,
+                        help="parallel browser workers, each with its own session (default: config apply_workers)")
+    parser.add_argument("--process-failed", action="store_true", default=None,
+                        help="also retry Failed jobs (default: config process_failed)")
+    parser.add_argument("--time-budget", type=float,
+                        help="seconds this run may take; stops starting jobs that would not finish "
+                             "(default: config apply_time_budget)")
+    parser.add_argument("--all-duplicates", dest="one_per_cluster", action="store_false", default=None,
+                        help="apply to every copy of a near-duplicate posting (default: config one_per_cluster)")
+    args = parser.parse_args(argv)
+    main(process_failed=args.process_failed, workers=args.workers, one_per_cluster=args.one_per_cluster,
+         time_budget=args.time_budget)
+
+
 if __name__ == "__main__":
-    main(process_failed=PROCESS_FAILED)
+    cli()
@@ -1,40 +1,24 @@
 import os
+import queue
 import random
 import time
+import argparse
 import logging
-import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Set, Tuple
+from typing import List, Optional, Tuple
 
 import pandas as pd
 
-# ── Selenium / Stealth ───────────────────────────────────────────
-from undetected_chromedriver import Chrome, ChromeOptions
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from job_index import JobIndex, normalize_posted_date
+from job_store import open_store
+from metrics import METRICS
+from query_scheduler import PageBudget, QueryHistory, page_budget, plan_queries
+from search_backend import RateLimiter, RequestsBackend, SearchBackend, SeleniumBackend
+from settings import Settings, get_settings
 
-# ── CONFIG & CONSTANTS ───────────────────────────────────────────
-
-def load_config(path: str = "config.yaml") -> dict:
-    with open(path, "r") as f:
-        return yaml.safe_load(f)
-
-config = load_config("config/scraper_config.yaml")
-BASE_URL: str = os.getenv("BASE_URL") or config["base_url"]
-CSV_FILE: str = config["main_csv_file"]
-QUERY_FILE: str = config["query_file"]
-MAX_PAGES: int = config.get("max_pages", 20)
-DELAY_WAIT: int = config.get("delay", 6)
-
-print(f"Base URL: {BASE_URL}")
-
-# Human‑style pacing
-MIN_PAGE_DELAY = float(config.get("min_page_delay", 2))
-MAX_PAGE_DELAY = float(config.get("max_page_delay", 4))
+logger = logging.getLogger("dice_scraper")
 
 USER_AGENTS: List[str] = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
@@ -42,18 +26,91 @@ USER_AGENTS: List[str] = [
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
 ]
 
+# ── CONFIG & CONSTANTS ───────────────────────────────────────────
+# Filled in from the shared Settings by configure() (main() calls it), so
+# importing this module reads no files and opens no log.
+
+SETTINGS: Optional[Settings] = None
+BASE_URL: str = ""
+CSV_FILE: str = ""
+FILTERED_CSV_FILE: str = ""
+JOB_INDEX_FILE: str = ""
+STORAGE: str = "csv"
+STORE_PATH: str = ""
+LOG_DIR: str = ""
+METRICS_DIR: str = ""
+QUERY_FILE: str = ""
+MAX_PAGES: int = 20
+DELAY_WAIT: float = 6
+DRIVER_PATH: str = ""
+CARD_EXTRACTION: str = "html"
+SEARCH_BACKEND: str = "selenium"
+MAX_REQUESTS_PER_SEC: float = 0.5
+HTTP_TIMEOUT: float = 15
+WORKERS: int = 1
+STOP_AFTER_STALE_PAGES: int = 2
+QUERY_HISTORY_FILE: str = ""
+QUERY_PAGE_BUDGET: int = 0
+QUERY_TIME_BUDGET: float = 0
+MIN_PAGE_DELAY: float = 2
+MAX_PAGE_DELAY: float = 4
+
+
+def configure(settings: Optional[Settings] = None) -> Settings:
+    """Copy the scraper's settings into the module constants."""
+    global SETTINGS, BASE_URL, CSV_FILE, FILTERED_CSV_FILE, JOB_INDEX_FILE, STORAGE, STORE_PATH, LOG_DIR
+    global METRICS_DIR, QUERY_FILE, MAX_PAGES, DELAY_WAIT, DRIVER_PATH, CARD_EXTRACTION, SEARCH_BACKEND
+    global MAX_REQUESTS_PER_SEC, HTTP_TIMEOUT, WORKERS, STOP_AFTER_STALE_PAGES, QUERY_HISTORY_FILE
+    global QUERY_PAGE_BUDGET, QUERY_TIME_BUDGET, MIN_PAGE_DELAY, MAX_PAGE_DELAY
+
+    SETTINGS = (settings or get_settings()).require("scrape")
+    paths, scrape, perf = SETTINGS.paths, SETTINGS.scrape, SETTINGS.perf
+    BASE_URL = scrape.base_url
+    CSV_FILE = paths.jobs_csv
+    FILTERED_CSV_FILE = paths.filtered_csv
+    JOB_INDEX_FILE = paths.job_index_file
+    # "sqlite" keeps jobs in STORE_PATH (CSV files become exports), "csv" rewrites the CSVs
+    STORAGE = paths.storage
+    STORE_PATH = paths.store_path
+    LOG_DIR = paths.log_dir
+    METRICS_DIR = paths.metrics_dir
+    QUERY_FILE = paths.query_file
+    MAX_PAGES = scrape.max_pages
+    DELAY_WAIT = scrape.delay
+    DRIVER_PATH = scrape.driver_path
+    # "html" parses one page_source snapshot per page, "webdriver" queries each card
+    CARD_EXTRACTION = scrape.card_extraction
+    # "requests" fetches result pages over HTTP, "selenium" drives Chrome
+    SEARCH_BACKEND = scrape.search_backend
+    MAX_REQUESTS_PER_SEC = perf.max_requests_per_sec
+    HTTP_TIMEOUT = perf.http_timeout
+    WORKERS = perf.scrape_workers
+    # stop a query after this many consecutive pages without new jobs (0 = never)
+    STOP_AFTER_STALE_PAGES = scrape.stop_after_stale_pages
+    # yield-aware scheduling: spread a page budget over the queries (0 and 0 = every query, MAX_PAGES each)
+    QUERY_HISTORY_FILE = paths.query_history_file
+    QUERY_PAGE_BUDGET = perf.query_page_budget
+    QUERY_TIME_BUDGET = perf.query_time_budget
+    # Human‑style pacing
+    MIN_PAGE_DELAY = scrape.min_page_delay
+    MAX_PAGE_DELAY = scrape.max_page_delay
+    return SETTINGS
+
 # ── Logging ──────────────────────────────────────────────────────
-log_dir = Path(config.get("log_dir", "output/logs"))
-log_dir.mkdir(parents=True, exist_ok=True)
-log_path = log_dir / f"dice_scraper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-
-logging.basicConfig(
-    filename=str(log_path),
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-)
-logger = logging.getLogger("dice_scraper")
-logger.addHandler(logging.StreamHandler())  # echo to console
+
+def setup_logging() -> Path:
+    """Start this run's timestamped log file (and echo to the console)."""
+    log_dir = Path(LOG_DIR)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    log_path = log_dir / f"dice_scraper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+
+    logging.basicConfig(
+        filename=str(log_path),
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+    )
+    logger.addHandler(logging.StreamHandler())  # echo to console
+    return log_path
 
 # ── Stealth helpers ──────────────────────────────────────────────
 
@@ -62,6 +119,9 @@ def human_delay(base: float = 2.0, jitter: float = 0.7):
     time.sleep(max(0.1, random.normalvariate(base, jitter)))
 
 def wiggle_mouse(driver):
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.common.by import By
+
     try:
         body = driver.find_element(By.TAG_NAME, "body")
         actions = ActionChains(driver)
@@ -72,6 +132,8 @@ def wiggle_mouse(driver):
         # don’t re-raise
 
 def get_stealth_driver(headless: bool = True):
+    from undetected_chromedriver import Chrome, ChromeOptions
+
     opts = ChromeOptions()
     if headless:
         opts.add_argument("--headless=new")
@@ -82,147 +144,238 @@ def get_stealth_driver(headless: bool = True):
     # Use the manually installed Chrome 136 in the GitHub runner
     opts.binary_location = "/opt/chrome/chrome"
 
-    driver_path = config.get("driver_path", "/usr/local/bin/chromedriver")
-    driver = Chrome(options=opts, driver_executable_path=driver_path, version_main=136)
+    driver = Chrome(options=opts, driver_executable_path=DRIVER_PATH, version_main=136)
     driver.implicitly_wait(3)
     return driver
 
+def open_search_backend(limiter: RateLimiter) -> SearchBackend:
+    """Build the configured result-page backend ("requests" needs no browser)."""
+    if SEARCH_BACKEND == "requests":
+        return RequestsBackend(
+            timeout=HTTP_TIMEOUT,
+            user_agent=random.choice(USER_AGENTS),
+            limiter=limiter,
+        )
+    return SeleniumBackend(
+        get_stealth_driver(headless=True),
+        wait_timeout=DELAY_WAIT,
+        extraction=CARD_EXTRACTION,
+        wiggle=wiggle_mouse,
+        limiter=limiter,
+    )
+
 # ── Scraper core ────────────────────────────────────────────────
 
-def scrape_query(driver,query: str,seen_links: Set[Tuple[str, str]]) -> list:
-    
-    """Scrape all pages for a single search query and return job dicts."""
-    new_jobs = []
-    total_pages_scraped = 0
-    for page in range(1, MAX_PAGES + 1):
+def scrape_query(backend: SearchBackend, query: str, index: JobIndex,
+                 max_pages: Optional[int] = None, sightings: Optional[JobIndex] = None) -> Tuple[List[list], dict]:
+    """Fetch up to ``max_pages`` (default ``MAX_PAGES``) pages for a single search query.
+
+    Returns the job dicts on each page and a stats dict for the query
+    (``page_ids`` lists the job ids on each page, for the query history).
+    ``sightings`` holds the ids any worker has fetched so far this run: a
+    job that is in neither it nor ``index`` is logged as FOUND as soon as
+    its page arrives, and paging stops early once ``STOP_AFTER_STALE_PAGES``
+    consecutive pages bring none (results are sorted newest first). Nothing
+    is claimed in ``index`` here: ``merge_results`` does that in query order
+    once every worker is done.
+    """
+    max_pages = max_pages or MAX_PAGES
+    sightings = JobIndex(os.devnull) if sightings is None else sightings
+    started = time.perf_counter()
+    pages = []
+    stale_pages = 0
+    stats = {"query": query, "max_pages": max_pages, "pages_scanned": 0, "new_jobs": 0, "pages_saved": 0,
+             "stop_reason": "max_pages", "page_ids": []}
+    for page in range(1, max_pages + 1):
         url = BASE_URL.format(query=query.replace(" ", "+"), page=page)
         logger.info(f"Query: {query} | Page: {page}")
         print(f"Query: {query} | Page: {page}")
 
-        try:
-            driver.get(url)
-            WebDriverWait(driver, DELAY_WAIT).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div[data-job-guid]"))
-            )
-            job_cards = driver.find_elements(By.CSS_SELECTOR, "div[data-job-guid]")
-            if not job_cards:
-                logger.info("No job cards found — breaking pagination.")
-                print("No job cards found — breaking pagination.")
-                break
-            total_pages_scraped += 1
-        except TimeoutException:
+        page_jobs = backend.fetch_jobs(url)
+        if page_jobs is None:
             logger.warning(f"Timeout on: {url}")
             print(f"Timeout on: {url}")
+            stats["stop_reason"] = "timeout"
+            break
+        if not page_jobs:
+            logger.info("No job cards found — breaking pagination.")
+            print("No job cards found — breaking pagination.")
+            stats["stop_reason"] = "no_cards"
+            break
+        pages.append(page_jobs)
+        stats["page_ids"].append([job["job_id"] for job in page_jobs])
+
+        found_on_page = 0
+        for job in page_jobs:
+            if job["job_id"] in index or not sightings.claim(job["job_id"]):
+                continue
+            found_on_page += 1
+            job_title, job_link, apply_text = job["title"], job["link"], job["apply_text"]
+            logger.info(f"[+] FOUND — {job_title} — {apply_text} — {job_link}")
+            print(f"[+] FOUND — {job_title} — {apply_text }— {job_link}")
+
+        stale_pages = 0 if found_on_page else stale_pages + 1
+        if STOP_AFTER_STALE_PAGES and stale_pages >= STOP_AFTER_STALE_PAGES:
+            stats["stop_reason"] = "stale"
+            stats["pages_saved"] = max_pages - page
+            logger.info(f"No new jobs on {stale_pages} consecutive page(s) — stopping '{query}' "
+                        f"({stats['pages_saved']} page(s) skipped).")
+            print(f"No new jobs on {stale_pages} consecutive page(s) — stopping '{query}'.")
             break
-
-        # ── Process each card ────────────────────────────────────
-        for card in job_cards:
-            try:
-                job_link_el = card.find_element(By.CSS_SELECTOR, "a[data-testid='job-search-job-detail-link']")
-                job_link = job_link_el.get_attribute("href")
-                meta_elems = card.find_elements(By.CSS_SELECTOR, "p.text-sm.font-normal.text-zinc-600")
-                location = meta_elems[0].text.strip() if meta_elems else "N/A"
-                posted_date = meta_elems[2].text.strip() if len(meta_elems) > 2 else "N/A"
-
-                # dedup on link + date
-                if (job_link, posted_date) in seen_links:
-                    continue
-                seen_links.add((job_link, posted_date))
-
-                # core fields
-                job_title = job_link_el.text.strip()
-                company_el = card.find_elements(By.CSS_SELECTOR, "p.line-clamp-2.text-sm")
-                company = company_el[0].text.strip() if company_el else "N/A"
-                
-                desc = (
-                    card.find_element(By.CSS_SELECTOR, "div.mt-2 p").text.strip()
-                    if card.find_elements(By.CSS_SELECTOR, "div.mt-2 p")
-                    else ""
-                )
-
-                def extract_tag(label_id: str) -> str:
-                    try:
-                        return card.find_element(By.CSS_SELECTOR, f"div[aria-labelledby='{label_id}']").text.strip()
-                    except NoSuchElementException:
-                        return ""
-
-                job_type = extract_tag("employmentType-label")
-                salary = extract_tag("salary-label")
-
-                apply_text = (
-                    card.find_element(By.XPATH, ".//div[contains(@class, 'gap-1.5')]/a").text.strip()
-                    if card.find_elements(By.XPATH, ".//div[contains(@class, 'gap-1.5')]/a")
-                    else ""
-                )
-
-                new_jobs.append(
-                    {
-                        "title": job_title,
-                        "company": company,
-                        "link": job_link,
-                        "description": desc,
-                        "location": location,
-                        "date_added": datetime.now().strftime("%m/%d/%Y"),
-                        "date_posted": posted_date,
-                        "job_type": job_type,
-                        "salary": salary,
-                        "apply_text": apply_text,
-                    }
-                )
-
-                logger.info(f"[+] FOUND — {job_title} — {apply_text} — {job_link}")
-                print(f"[+] FOUND — {job_title} — {apply_text }— {job_link}")
-                
-            except Exception as exc:
-                logger.error(f"Error parsing card: {exc}")
 
         # human‑like behaviour between pages
-        wiggle_mouse(driver)
-        human_delay(random.uniform(MIN_PAGE_DELAY, MAX_PAGE_DELAY))
-        
-    logger.info(f"Total pages scanned for query '{query}': {total_pages_scraped}")
-    print(f"Total pages scanned for query '{query}': {total_pages_scraped}")
-    logger.info(f"Total new jobs found for query '{query}': {len(new_jobs)}")
-    print(f"Total new jobs found for query '{query}': {len(new_jobs)}")
-
-    return new_jobs
+        with METRICS.timer("scrape.page_delay"):
+            backend.wiggle()
+            human_delay(random.uniform(MIN_PAGE_DELAY, MAX_PAGE_DELAY))
+
+    stats["pages_scanned"] = len(pages)
+    stats["seconds"] = time.perf_counter() - started
+    METRICS.observe("scrape.query", stats["seconds"])
+    METRICS.count("scrape.stop_reason", stats["stop_reason"])
+    return pages, stats
+
+
+def merge_results(results: List[Tuple[List[list], dict]], index: JobIndex) -> list:
+    """Claim the scraped jobs in query order, then page order: a job goes to the first query that listed it.
+
+    ``results`` are ``scrape_query`` outputs, aligned with the queries; their
+    stats get ``new_jobs``. Given the pages fetched, the rows returned and
+    the per-query counts don't depend on which worker finished first. The
+    FOUND lines were logged at fetch time, so with several workers a job
+    may be logged under a different query than the one it is credited to.
+    """
+    all_jobs = []
+    for pages, stats in results:
+        query = stats["query"]
+        new_jobs = []
+        for page_jobs in pages:
+            for job in page_jobs:
+                # dedup on the canonical job GUID
+                if not index.claim(job["job_id"]):
+                    continue
+                job["date_posted"] = normalize_posted_date(job["date_posted"])
+                new_jobs.append(job)
+
+        stats["new_jobs"] = len(new_jobs)
+        METRICS.record("queries", {**{k: v for k, v in stats.items() if k != "page_ids"},
+                                   "new_per_page": round(len(new_jobs) / max(1, stats["pages_scanned"]), 2)})
+        logger.info(f"Total pages scanned for query '{query}': {stats['pages_scanned']}")
+        print(f"Total pages scanned for query '{query}': {stats['pages_scanned']}")
+        logger.info(f"Total new jobs found for query '{query}': {len(new_jobs)}")
+        print(f"Total new jobs found for query '{query}': {len(new_jobs)}")
+        all_jobs.extend(new_jobs)
+    return all_jobs
 
 # ── Main entrypoint ─────────────────────────────────────────────
 
-def main():
-    driver = get_stealth_driver(headless=True)
+def scrape_all(queries: List[str], index: JobIndex, workers: int = 1,
+               budget: Optional[PageBudget] = None) -> Tuple[list, List[dict]]:
+    """Run every query on a pool of ``workers`` backends.
+
+    All backends share one RateLimiter, so ``max_requests_per_sec`` is a
+    budget for the whole pool, not per worker. With a ``budget`` each query
+    gets its planned pages (plus any an earlier query left unused) instead
+    of ``MAX_PAGES``. Workers fetch pages and share the run's sightings,
+    so a query stops early on jobs another query already fetched;
+    ``merge_results`` then claims the jobs in ``queries`` order.
+    """
+    limiter = RateLimiter(MAX_REQUESTS_PER_SEC)
+    sightings = JobIndex(os.devnull)  # ids fetched by any worker this run; never saved
+    workers = max(1, min(workers, len(queries)))
+    pool: "queue.Queue[SearchBackend]" = queue.Queue()
+    backends = []
     try:
-        # load existing
-        if os.path.exists(CSV_FILE):
-            df_existing = pd.read_csv(CSV_FILE)
-            seen_links: Set[Tuple[str, str]] = set(
-                zip(df_existing["link"], df_existing.get("date_posted", pd.Series(["" for _ in range(len(df_existing))])))
-            )
-        else:
-            df_existing = pd.DataFrame()
-            seen_links = set()
-
-        with open(QUERY_FILE, "r") as f:
-            queries = [q.strip() for q in f if q.strip()]
-
-        all_jobs = []
-        for q in queries:
-            all_jobs.extend(scrape_query(driver, q, seen_links))
-
-        df_new = pd.DataFrame(all_jobs)
-        if not df_new.empty:
-            df_new["status"] = "Pending"
-            df_new["date_added"] = pd.to_datetime(df_new["date_added"], format="%m/%d/%Y")
-
-        df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-        df_combined.drop_duplicates(subset=["link", "date_posted"], keep="first", inplace=True)
-        df_combined.to_csv(CSV_FILE, index=False)
-
-        logger.info(f"✅ Scrape done. New: {len(df_new)} | Total rows: {len(df_combined)}")
-        print(f"✅ Scrape done. New: {len(df_new)} | Total rows: {len(df_combined)}")
+        for _ in range(workers):
+            backends.append(open_search_backend(limiter))
+            pool.put(backends[-1])
+
+        def run(query: str) -> Tuple[List[list], dict]:
+            backend = pool.get()
+            try:
+                if budget is None:
+                    return scrape_query(backend, query, index, sightings=sightings)
+                granted, used = budget.grant(query), 0
+                try:
+                    pages, stats = scrape_query(backend, query, index, max_pages=granted, sightings=sightings)
+                    used = stats["pages_scanned"]
+                    return pages, stats
+                finally:
+                    budget.settle(query, granted, used)  # even on failure, or later queries wait forever
+            finally:
+                pool.put(backend)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run, queries))
     finally:
-        driver.quit()
+        for backend in backends:
+            backend.close()
+
+    all_jobs = merge_results(results, index)
+    return all_jobs, [stats for _, stats in results]
+
+
+def main(workers: Optional[int] = None):
+    if SETTINGS is None:
+        configure()
+    setup_logging()
+    print(f"Base URL: {BASE_URL}")
+    workers = workers or WORKERS
+
+    # load existing
+    store = open_store(STORAGE, STORE_PATH, {"jobs": CSV_FILE, "filtered_jobs": FILTERED_CSV_FILE})
+    index = JobIndex.load(JOB_INDEX_FILE)
+    if len(index) < store.count("jobs"):
+        with METRICS.timer("merge.index_seed"):
+            seeded = index.seed(store.read_frame("jobs", ["job_id", "date_added"]))
+        logger.info(f"Seeded job index with {seeded} id(s) from the job store")
+
+    with open(QUERY_FILE, "r") as f:
+        queries = [q.strip() for q in f if q.strip()]
+
+    history = QueryHistory.load(QUERY_HISTORY_FILE)
+    pages = page_budget(QUERY_PAGE_BUDGET, QUERY_TIME_BUDGET, history)
+    to_run, budget = queries, None
+    if pages:
+        plan, skipped = plan_queries(queries, history, MAX_PAGES, pages)
+        to_run, budget = [q for q, _ in plan], PageBudget(plan, MAX_PAGES, workers)
+        for q, n in plan:
+            logger.info(f"[SCHEDULE] {q}: {n} page(s)")
+        logger.info(f"[SCHEDULE] {pages} page(s) over {len(plan)} queries, resting {len(skipped)}: {skipped}")
+        print(f"[SCHEDULE] {pages} page(s) over {len(plan)} queries, resting {len(skipped)}")
+
+    logger.info(f"Scraping {len(to_run)} queries with {workers} worker(s)")
+    all_jobs, query_stats = scrape_all(to_run, index, workers, budget)
+    history.record_run(queries, query_stats, {job["job_id"] for job in all_jobs})
+    history.save()
+    pages_saved = sum(stats["pages_saved"] for stats in query_stats)
+    stopped = sum(stats["stop_reason"] == "stale" for stats in query_stats)
+    logger.info(f"[SUMMARY] Early-stopped {stopped}/{len(to_run)} queries, skipped {pages_saved} page(s)")
+    print(f"[SUMMARY] Early-stopped {stopped}/{len(to_run)} queries, skipped {pages_saved} page(s)")
+
+    df_new = pd.DataFrame(all_jobs)
+    if not df_new.empty:
+        df_new["status"] = "Pending"
+        df_new["date_added"] = pd.to_datetime(df_new["date_added"], format="%m/%d/%Y")
+
+    with METRICS.timer("merge.store_upsert"):
+        inserted = store.upsert("jobs", df_new)
+    total = store.count("jobs")
+    with METRICS.timer("merge.store_close"):
+        store.close()
+    index.save()
+    METRICS.count("scrape.jobs", "new", inserted)
+    METRICS.write_report(METRICS_DIR, "scrape")
+
+    logger.info(f"✅ Scrape done. New: {inserted} | Total rows: {total}")
+    print(f"✅ Scrape done. New: {inserted} | Total rows: {total}")
+
+
+def cli(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Scrape Dice search results into the jobs CSV.")
+    parser.add_argument("--workers", type=int,
+                        help="queries scraped concurrently (shared max_requests_per_sec budget; default: config workers)")
+    main(workers=parser.parse_args(argv).workers)
 
 
 if __name__ == "__main__":
-    main()
+    cli()